@@ -0,0 +1,71 @@
+import time
+
+import streamlit as st
+
+from qpcr.jobs import CANCELLED, DONE, FAILED, FINAL_STATUSES, default_job_queue
+
+# Seconds between automatic reruns while a job is running
+REFRESH_SECONDS = 1
+
+
+def job_owner():
+    """Jobs belong to the logged-in user, so a new browser session finds them again"""
+    return st.session_state.get("username") or "anonymous"
+
+
+def submit_job(kind, func, *args, label="", **kwargs):
+    """Run ``func`` in the background job queue as this session's job of ``kind``"""
+    job_id = default_job_queue().submit(kind, func, *args, owner=job_owner(), label=label, **kwargs)
+    st.session_state[f"job_{kind}"] = job_id
+    st.session_state.pop(f"job_{kind}_collected", None)
+    return job_id
+
+
+def job_panel(kind):
+    """Progress, cancel and refresh controls for the current job of ``kind``; returns its result once, when done"""
+    queue = default_job_queue()
+    job_id = st.session_state.get(f"job_{kind}")
+    adopted = False
+    if job_id is None:
+        # ✅ After a refresh or reconnect, pick up the user's latest job of this kind
+        job = queue.latest(job_owner(), kind)
+        if job is None:
+            return None
+        job_id, adopted = job["job_id"], True
+    else:
+        job = queue.job(job_id)
+        if job is None:
+            st.session_state.pop(f"job_{kind}", None)
+            return None
+    if st.session_state.get(f"job_{kind}_collected") == job_id:
+        return None
+
+    # ✅ Still running: show progress and offer cancel / refresh
+    if job["status"] not in FINAL_STATUSES:
+        st.session_state[f"job_{kind}"] = job_id
+        fraction = job["done"] / job["total"] if job["total"] else 0.0
+        text = f"⏳ {job['label']}: {job['status']}" + (f" ({job['done']}/{job['total']})" if job["total"] else "")
+        st.progress(fraction, text=text)
+        col1, col2, col3 = st.columns(3)
+        if col1.button("🔄 Refresh", key=f"job_{kind}_refresh"):
+            st.rerun()
+        if col2.button("⛔ Cancel", key=f"job_{kind}_cancel"):
+            queue.cancel(job_id)
+            st.rerun()
+        if col3.checkbox("Auto-refresh", value=True, key=f"job_{kind}_auto"):
+            time.sleep(REFRESH_SECONDS)
+            st.rerun()
+        return None
+
+    # ✅ Finished: failures stay reported until the next submit, the result is handed over once
+    if job["status"] == FAILED:
+        st.error(f"❌ {job['label']} failed:\n\n```\n{job['error']}\n```")
+    elif job["status"] == CANCELLED:
+        st.warning(f"⚠️ {job['label']} was cancelled.")
+    elif job["status"] == DONE:
+        if adopted and not st.button(f"📥 Load result of {job['label']}", key=f"job_{kind}_load"):
+            return None
+        st.session_state[f"job_{kind}"] = job_id
+        st.session_state[f"job_{kind}_collected"] = job_id
+        return queue.result(job_id)
+    return None
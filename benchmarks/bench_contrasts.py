@@ -0,0 +1,54 @@
+"""Every group against every other: one delta_delta_ct call per contrast vs contrast_table.
+
+    python benchmarks/bench_contrasts.py --samples 2000 --genes 200 --groups 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_matrix import HOUSEKEEPING, make_mean_cq  # noqa: E402
+from qpcr.contrasts import all_contrasts, contrast_name, contrast_table  # noqa: E402
+from qpcr.normalization import delta_ct, delta_delta_ct  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=2000)
+    parser.add_argument("--genes", type=int, default=200)
+    parser.add_argument("--groups", type=int, default=8)
+    args = parser.parse_args()
+
+    normalized_df = delta_ct(make_mean_cq(args.samples, args.genes, args.groups), HOUSEKEEPING)
+    contrasts = all_contrasts(normalized_df["Group"].cat.categories.tolist())
+    print(f"{args.samples} samples × {args.genes} genes, {len(contrasts)} contrasts")
+
+    start = time.perf_counter()
+    per_contrast = {
+        contrast_name(treatment, control): delta_delta_ct(normalized_df, control, [treatment])
+        for treatment, control in contrasts
+    }
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    table = contrast_table(normalized_df, contrasts)
+    table_time = time.perf_counter() - start
+
+    treatment, control = contrasts[-1]
+    name = contrast_name(treatment, control)
+    diff = np.nanmax(np.abs(table.loc[table["Contrast"] == name, "Fold_Change"].to_numpy()
+                            - per_contrast[name]["Fold_Change"].to_numpy()))
+    print(f"one call per contrast  {loop_time:>8.3f}s")
+    print(f"contrast_table         {table_time:>8.3f}s  ({loop_time / table_time:.1f}x, {len(table)} rows)")
+    print(f"max |Δ fold change| ({name}): {diff:.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Standard curves at scale: one np.polyfit per (Plate, Gene) vs fit_standard_curves.
+
+    python benchmarks/bench_efficiency.py --plates 50 --genes 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from qpcr.efficiency import fit_standard_curves  # noqa: E402
+
+
+def make_standards(n_plates: int, n_genes: int, n_points: int = 5, n_reps: int = 3) -> pd.DataFrame:
+    """Serial 10-fold dilutions of every gene on every plate, with per-gene efficiencies."""
+    rng = np.random.default_rng(0)
+    per_plate = n_genes * n_points * n_reps
+    gene = np.tile(np.repeat(np.arange(n_genes), n_points * n_reps), n_plates)
+    point = np.tile(np.repeat(np.arange(n_points), n_reps), n_plates * n_genes)
+    amplification = rng.uniform(1.8, 2.05, n_genes)
+    sq = 10.0 ** (n_points - 1 - point)
+    cq = 35 - np.log10(sq) / np.log10(amplification[gene]) + rng.normal(0, 0.1, len(gene))
+    return pd.DataFrame({
+        "Plate": pd.Categorical.from_codes(np.repeat(np.arange(n_plates), per_plate),
+                                           [f"plate{i}" for i in range(n_plates)]),
+        "Gene": pd.Categorical.from_codes(gene, [f"Gene{i}" for i in range(n_genes)]),
+        "Cq": cq.astype(np.float32),
+        "SQ": sq.astype(np.float32),
+    })
+
+
+def polyfit_curves(df: pd.DataFrame) -> pd.DataFrame:
+    """One ``np.polyfit`` per curve, the way a per-gene loop would fit them."""
+    rows = []
+    for (plate, gene), curve in df.groupby(["Plate", "Gene"], observed=True):
+        slope, intercept = np.polyfit(np.log10(curve["SQ"].to_numpy(dtype=float)),
+                                      curve["Cq"].to_numpy(dtype=float), 1)
+        rows.append((plate, gene, slope, intercept, 10 ** (-1 / slope)))
+    return pd.DataFrame(rows, columns=["Plate", "Gene", "Slope", "Intercept", "Amplification"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--plates", type=int, default=50)
+    parser.add_argument("--genes", type=int, default=500)
+    args = parser.parse_args()
+
+    standards = make_standards(args.plates, args.genes)
+    print(f"{args.plates} plates × {args.genes} genes ({len(standards)} standard wells)")
+
+    start = time.perf_counter()
+    looped = polyfit_curves(standards)
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = fit_standard_curves(standards)
+    batch_time = time.perf_counter() - start
+
+    diff = np.max(np.abs(looped["Slope"].to_numpy() - batched["Slope"].to_numpy()))
+    print(f"np.polyfit per curve   {loop_time:>8.3f}s")
+    print(f"fit_standard_curves    {batch_time:>8.3f}s  ({loop_time / batch_time:.1f}x, {len(batched)} curves)")
+    print(f"max |Δ slope|: {diff:.2e}")
+
+
+if __name__ == "__main__":
+    main()
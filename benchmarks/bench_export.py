@@ -0,0 +1,64 @@
+"""Bulk figure export: every PNG read into memory (one download button each) vs the streamed ZIP.
+
+    python benchmarks/bench_export.py --genes 200 --dpi 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_matrix import HOUSEKEEPING, make_mean_cq  # noqa: E402
+from qpcr.export import export_bundle  # noqa: E402
+from qpcr.normalization import delta_ct  # noqa: E402
+from qpcr.plot_cache import PlotCache  # noqa: E402
+from qpcr.plotting import delta_ct_plot_data, iter_render_genes  # noqa: E402
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 1024 ** 2
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--genes", type=int, default=200)
+    parser.add_argument("--dpi", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    plot_df = delta_ct_plot_data(delta_ct(make_mean_cq(24, args.genes, 4, missing=0.0), HOUSEKEEPING))
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = PlotCache(os.path.join(tmp, "cache"))
+        # Warm the cache so both paths only measure export, not drawing
+        paths = dict(iter_render_genes("delta_ct", plot_df, dpi=args.dpi, workers=args.workers, cache=cache))
+        print(f"{len(paths)} figures at {args.dpi} dpi ({cache.info()['bytes'] / 1024 ** 2:.1f} MB of PNGs)")
+
+        def read_all():
+            images = []
+            for path in paths.values():
+                with open(path, "rb") as file:
+                    images.append(file.read())
+
+        def stream_zip():
+            export_bundle(os.path.join(tmp, "export.zip"), {"delta_ct": plot_df}, {"normalized": plot_df},
+                          dpi=args.dpi, workers=args.workers, cache=cache)
+
+        for label, func in (("read every PNG", read_all), ("streamed ZIP", stream_zip)):
+            elapsed, peak = measure(func)
+            print(f"{label:<16} {elapsed:>7.3f}s   peak Python memory {peak:>8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Whole panel: one unclosed pyplot figure per gene vs faceted figures of 24 genes each.
+
+    python benchmarks/bench_facets.py --genes 96 --dpi 150
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_matrix import HOUSEKEEPING, make_mean_cq  # noqa: E402
+from benchmarks.bench_plotting import pyplot_loop  # noqa: E402
+from qpcr.facets import render_facets  # noqa: E402
+from qpcr.normalization import delta_ct  # noqa: E402
+from qpcr.plotting import delta_ct_plot_data  # noqa: E402
+
+PANEL_SIZE = 24
+
+
+def rss_mb() -> float:
+    """Resident memory of this process (Linux)."""
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--genes", type=int, default=96)
+    parser.add_argument("--dpi", type=int, default=150)
+    args = parser.parse_args()
+
+    plot_df = delta_ct_plot_data(delta_ct(make_mean_cq(24, args.genes, 4, missing=0.0), HOUSEKEEPING))
+    genes = plot_df["Gene"].unique().tolist()
+    print(f"{len(genes)} genes, {args.dpi} dpi")
+
+    gc.collect()
+    before = rss_mb()
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as plots_dir:
+        pyplot_loop(plot_df, plots_dir, args.dpi)
+    loop_time = time.perf_counter() - start
+    loop_growth = rss_mb() - before
+    open_figures = len(plt.get_fignums())
+    plt.close("all")
+    gc.collect()
+
+    before = rss_mb()
+    start = time.perf_counter()
+    for first in range(0, len(genes), PANEL_SIZE):
+        render_facets("delta_ct", plot_df, genes[first:first + PANEL_SIZE], dpi=args.dpi)
+    facet_time = time.perf_counter() - start
+    gc.collect()
+    facet_growth = rss_mb() - before
+
+    print(f"pyplot figure per gene {loop_time:>8.3f}s   RSS +{loop_growth:>7.1f} MB  ({open_figures} figures left open)")
+    print(f"faceted panels of {PANEL_SIZE:<4} {facet_time:>8.3f}s   RSS +{facet_growth:>7.1f} MB  "
+          f"({loop_time / facet_time:.1f}x, {len(plt.get_fignums())} figures left open)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Replacing one plate in a study: incremental update vs full recompute.
+
+    python benchmarks/bench_incremental.py --plates 40
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from qpcr.incremental import IncrementalPipeline  # noqa: E402
+from qpcr.pipeline import run_pipeline  # noqa: E402
+from qpcr.testing import make_groups, make_plate, make_plates  # noqa: E402
+
+HOUSEKEEPING = ["Gene1", "Gene2"]
+CONTROL = "Group0"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--plates", type=int, default=40)
+    parser.add_argument("--wells", type=int, choices=[96, 384], default=384)
+    args = parser.parse_args()
+
+    plate_data = make_plates(args.plates, args.wells)
+    groups_df = make_groups(plate_data)
+
+    pipeline = IncrementalPipeline(groups_df, HOUSEKEEPING, CONTROL)
+    for plate, frames in plate_data.items():
+        pipeline.set_plate(plate, frames["Cq"], frames["genes"], frames["samples"])
+
+    # Re-run of one plate: same layout, new Cq values
+    rerun = make_plate(args.wells, seed=args.plates // 2)
+    rerun["Cq"]["Cq"] += 0.25
+    plate_data[f"plate{args.plates // 2}"] = rerun
+
+    start = time.perf_counter()
+    full = run_pipeline(plate_data, groups_df, HOUSEKEEPING, CONTROL)["fold_change_qPCR_df"]
+    full_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    update = pipeline.set_plate(f"plate{args.plates // 2}", rerun["Cq"], rerun["genes"], rerun["samples"])
+    incremental = pipeline.fold_change_df()
+    incremental_time = time.perf_counter() - start
+
+    diff = np.nanmax(np.abs(full["Fold_Change"].to_numpy() - incremental["Fold_Change"].to_numpy()))
+    print(f"{args.plates} × {args.wells}-well plates, one plate replaced")
+    print(f"full recompute  {full_time:>8.3f}s")
+    print(f"incremental     {incremental_time:>8.3f}s  ({full_time / incremental_time:.1f}x; "
+          f"{update['pairs']} pairs, {update['samples']} samples, {update['genes']} genes refreshed)")
+    print(f"max |Δ fold change| vs full: {diff:.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Parallel plate ingestion scaling: plates/s for 1..N workers.
+
+    python benchmarks/bench_ingest.py --plates 500 --workers 1,8,16,32
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from qpcr.ingest import default_workers, ingest_plates  # noqa: E402
+from qpcr.testing import make_groups, make_plates, write_plates  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--plates", type=int, default=500)
+    parser.add_argument("--wells", type=int, choices=[96, 384], default=384)
+    parser.add_argument("--workers", default=None, help="comma-separated worker counts (default: 1,2,4,.. up to CPUs)")
+    args = parser.parse_args()
+
+    if args.workers:
+        worker_counts = [int(w) for w in args.workers.split(",")]
+    else:
+        worker_counts = [1]
+        while worker_counts[-1] * 2 <= default_workers():
+            worker_counts.append(worker_counts[-1] * 2)
+
+    plate_data = make_plates(args.plates, args.wells)
+    groups_df = make_groups(plate_data)
+
+    with tempfile.TemporaryDirectory() as directory:
+        plate_files = write_plates(directory, plate_data)
+        del plate_data
+
+        print(f"{args.plates} × {args.wells}-well plates, {default_workers()} CPUs available")
+        print(f"{'workers':>8} {'seconds':>9} {'plates/s':>9} {'speedup':>8} {'efficiency':>10}")
+        baseline = None
+        for workers in worker_counts:
+            start = time.perf_counter()
+            ingest_plates(plate_files, groups_df, workers=workers)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            speedup = baseline / elapsed
+            print(f"{workers:>8} {elapsed:>9.2f} {args.plates / elapsed:>9.1f} {speedup:>7.2f}x {speedup / workers:>9.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Well-ID parsing and single-plate merge: regex/string-merge path vs well index.
+
+    python benchmarks/bench_layout.py --repeat 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from qpcr.layout import well_index  # noqa: E402
+from qpcr.plates import merge_plate  # noqa: E402
+from qpcr.testing import legacy_merge_plate, legacy_parse_wells, make_groups, make_plate  # noqa: E402
+
+
+def report(label: str, legacy: float, current: float, repeat: int) -> None:
+    print(f"{label:<22} {legacy / repeat * 1e3:>10.3f} {current / repeat * 1e3:>10.3f} {legacy / current:>8.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'':<22} {'legacy ms':>10} {'index ms':>10} {'speedup':>9}")
+    for n_wells in (96, 384):
+        plate = make_plate(n_wells)
+        groups_df = make_groups({"plate": plate})
+        cq_df = plate["Cq"]
+
+        legacy = timeit.timeit(lambda: legacy_parse_wells(cq_df), number=args.repeat)
+        current = timeit.timeit(lambda: well_index(cq_df["Well"], n_wells), number=args.repeat)
+        report(f"parse wells ({n_wells})", legacy, current, args.repeat)
+
+        legacy = timeit.timeit(
+            lambda: legacy_merge_plate(cq_df, plate["genes"], plate["samples"], groups_df, "p"), number=args.repeat
+        )
+        current = timeit.timeit(
+            lambda: merge_plate(cq_df, plate["genes"], plate["samples"], groups_df, "p"), number=args.repeat
+        )
+        report(f"merge plate ({n_wells})", legacy, current, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
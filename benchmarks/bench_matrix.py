@@ -0,0 +1,94 @@
+"""ΔCt and ΔΔCt at scale: groupby/merge chains vs the Sample × Gene matrix engine.
+
+    python benchmarks/bench_matrix.py --samples 10000 --genes 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from qpcr.normalization import delta_ct, delta_delta_ct  # noqa: E402
+
+HOUSEKEEPING = ["Gene0", "Gene1", "Gene2"]
+CONTROL = "Group0"
+
+
+def legacy_delta_ct(mean_cq_df, housekeeping_genes):
+    """ΔCt as ``deltact_normalization.app`` computed it: groupby → reset_index → rename → merge."""
+    hk_mean_per_sample = (
+        mean_cq_df[mean_cq_df["Gene"].isin(housekeeping_genes)]
+        .groupby("Sample", observed=True)["Mean_Cq"]
+        .mean()
+        .reset_index()
+        .rename(columns={"Mean_Cq": "Housekeeping_Mean_Cq"})
+    )
+    normalized_df = mean_cq_df.merge(hk_mean_per_sample, on="Sample", how="left")
+    normalized_df["Normalized_Cq"] = normalized_df["Mean_Cq"] - normalized_df["Housekeeping_Mean_Cq"]
+    return normalized_df
+
+
+def legacy_delta_delta_ct(normalized_df, control_group):
+    """ΔΔCt as ``fold_change_analysis.app`` computed it."""
+    df_filtered = normalized_df.copy()
+    df_filtered.replace([np.inf, -np.inf], pd.NA, inplace=True)
+    reference_ct = (
+        df_filtered[df_filtered["Group"] == control_group]
+        .groupby("Gene", observed=True)["Normalized_Cq"]
+        .mean()
+        .reset_index()
+        .rename(columns={"Normalized_Cq": "Reference_Ct"})
+    )
+    df_filtered = df_filtered.merge(reference_ct, on="Gene", how="left")
+    df_filtered["Delta_Delta_Ct"] = df_filtered["Normalized_Cq"] - df_filtered["Reference_Ct"]
+    df_filtered["Fold_Change"] = 2 ** (-df_filtered["Delta_Delta_Ct"])
+    return df_filtered
+
+
+def make_mean_cq(n_samples: int, n_genes: int, n_groups: int = 8, missing: float = 0.02) -> pd.DataFrame:
+    """Long-format mean Cq table as ``mean_cq`` returns it, with a few pairs missing."""
+    rng = np.random.default_rng(0)
+    samples = pd.Categorical.from_codes(np.repeat(np.arange(n_samples), n_genes),
+                                        [f"S{i:05d}" for i in range(n_samples)])
+    genes = pd.Categorical.from_codes(np.tile(np.arange(n_genes), n_samples), [f"Gene{i}" for i in range(n_genes)])
+    groups = pd.Categorical.from_codes(np.repeat(np.arange(n_samples) % n_groups, n_genes),
+                                       [f"Group{i}" for i in range(n_groups)])
+    df = pd.DataFrame({"Sample": samples, "Gene": genes, "Mean_Cq": rng.normal(26, 3, n_samples * n_genes),
+                       "Group": groups})
+    return df[rng.random(len(df)) >= missing].reset_index(drop=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=10_000)
+    parser.add_argument("--genes", type=int, default=500)
+    args = parser.parse_args()
+
+    mean_cq_df = make_mean_cq(args.samples, args.genes)
+    print(f"{args.samples} samples × {args.genes} genes ({len(mean_cq_df)} pairs)")
+
+    results = {}
+    for label, ct, ddct in (("groupby/merge", legacy_delta_ct, legacy_delta_delta_ct),
+                            ("matrix", delta_ct, delta_delta_ct)):
+        start = time.perf_counter()
+        normalized_df = ct(mean_cq_df, HOUSEKEEPING)
+        normalized = time.perf_counter()
+        results[label] = ddct(normalized_df, CONTROL)
+        finished = time.perf_counter()
+        print(f"{label:<14} ΔCt {normalized - start:>7.3f}s   ΔΔCt {finished - normalized:>7.3f}s   "
+              f"total {finished - start:>7.3f}s")
+
+    diff = np.nanmax(np.abs(results["groupby/merge"]["Fold_Change"].to_numpy(dtype=float)
+                            - results["matrix"]["Fold_Change"].to_numpy(dtype=float)))
+    print(f"max |Δ fold change|: {diff:.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Merged-data memory: legacy object-string frame vs the canonical compact schema.
+
+    python benchmarks/bench_memory.py --plates 520
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from qpcr.dataset import memory_per_million_wells  # noqa: E402
+from qpcr.plates import merge_plates  # noqa: E402
+from qpcr.replicates import replicate_stats  # noqa: E402
+from qpcr.testing import legacy_merge_plate, make_groups, make_plates  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--plates", type=int, default=520, help="384-well plates (520 ≈ 200k wells)")
+    args = parser.parse_args()
+
+    plate_data = make_plates(args.plates)
+    groups_df = make_groups(plate_data)
+
+    legacy = pd.concat(
+        [legacy_merge_plate(p["Cq"], p["genes"], p["samples"], groups_df, plate) for plate, p in plate_data.items()],
+        ignore_index=True,
+    )
+    compact, _ = merge_plates(plate_data, groups_df)
+
+    print(f"{len(compact)} wells from {args.plates} × 384-well plates")
+    print(f"{'':<10}{'columns':>8}{'MB / 1M wells':>16}{'replicate QC (s)':>18}")
+    for label, df in (("legacy", legacy), ("compact", compact)):
+        start = time.perf_counter()
+        replicate_stats(df)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<10}{df.shape[1]:>8}{memory_per_million_wells(df):>16.1f}{elapsed:>18.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Per-gene figures: the serial pyplot loop the pages used vs the process-pool renderer and plot cache.
+
+    python benchmarks/bench_plotting.py --genes 60 --workers 4 --dpi 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+import seaborn as sns  # noqa: E402
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_matrix import HOUSEKEEPING, make_mean_cq  # noqa: E402
+from qpcr.ingest import default_workers  # noqa: E402
+from qpcr.normalization import delta_ct  # noqa: E402
+from qpcr.plot_cache import PlotCache  # noqa: E402
+from qpcr.plotting import delta_ct_plot_data, iter_render_genes  # noqa: E402
+
+
+def pyplot_loop(df_filtered, plots_dir: str, dpi: int) -> None:
+    """-ΔCt box plots as ``visualization_delta_ct.app`` drew them: one unclosed pyplot figure per gene."""
+    group_order = df_filtered["Group"].unique()
+    group_colors = sns.color_palette("husl", n_colors=len(group_order))
+    for gene in df_filtered["Gene"].unique():
+        plt.figure(figsize=(1.3 * len(group_order), 5))
+        gene_df = df_filtered[df_filtered["Gene"] == gene]
+        sns.boxplot(x="Group", y="Neg_Delta_Ct", hue="Group", data=gene_df, palette=group_colors, legend=False,
+                    width=0.18 * len(group_order), order=group_order, hue_order=group_order)
+        sns.stripplot(x="Group", y="Neg_Delta_Ct", data=gene_df, color="black", size=9, jitter=True,
+                      order=group_order)
+        plt.title(gene)
+        plt.savefig(os.path.join(plots_dir, f"{gene}_deltaCT_expression.png"), dpi=dpi, bbox_inches="tight")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=24)
+    parser.add_argument("--genes", type=int, default=60)
+    parser.add_argument("--dpi", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=default_workers())
+    args = parser.parse_args()
+
+    df_filtered = delta_ct_plot_data(delta_ct(make_mean_cq(args.samples, args.genes, 4, missing=0.0), HOUSEKEEPING))
+    print(f"{args.genes} genes, {args.dpi} dpi, {args.workers} workers ({default_workers()} CPUs)")
+
+    with tempfile.TemporaryDirectory() as plots_dir:
+        start = time.perf_counter()
+        pyplot_loop(df_filtered, plots_dir, args.dpi)
+        loop_time = time.perf_counter() - start
+        open_figures = len(plt.get_fignums())
+        plt.close("all")
+
+        start = time.perf_counter()
+        first = None
+        for _ in iter_render_genes("delta_ct", df_filtered, plots_dir=plots_dir, dpi=args.dpi,
+                                   workers=args.workers):
+            first = first or time.perf_counter() - start
+        pool_time = time.perf_counter() - start
+
+        # A rerun with one gene's data changed: only that gene is redrawn
+        cache = PlotCache(os.path.join(plots_dir, "cache"))
+        list(iter_render_genes("delta_ct", df_filtered, dpi=args.dpi, workers=args.workers, cache=cache))
+        changed = df_filtered["Gene"] == df_filtered["Gene"].iloc[0]
+        rerun_df = df_filtered.assign(Neg_Delta_Ct=df_filtered["Neg_Delta_Ct"] + changed)
+        cache.hits = cache.misses = 0
+        start = time.perf_counter()
+        list(iter_render_genes("delta_ct", rerun_df, dpi=args.dpi, workers=args.workers, cache=cache))
+        cached_time = time.perf_counter() - start
+
+    print(f"serial pyplot loop     {loop_time:>8.3f}s  ({open_figures} figures left open)")
+    print(f"process-pool renderer  {pool_time:>8.3f}s  ({loop_time / pool_time:.1f}x, first plot after {first:.3f}s)")
+    print(f"rerun, 1 gene changed  {cached_time:>8.3f}s  ({loop_time / cached_time:.1f}x, "
+          f"{cache.hits} cached, {cache.misses} drawn)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Project store: reopen a study vs re-merging its CSVs, and one gene across all studies vs loading every study.
+
+    python benchmarks/bench_project.py --studies 20 --plates 24
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from qpcr.ingest import ingest_plates  # noqa: E402
+from qpcr.project import ProjectStore  # noqa: E402
+from qpcr.testing import make_groups, make_plate, write_plates  # noqa: E402
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--studies", type=int, default=20)
+    parser.add_argument("--plates", type=int, default=24, help="384-well plates per study")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = ProjectStore(os.path.join(directory, "project.sqlite"))
+        study_files = {}
+        save_time = 0.0
+        for study in range(args.studies):
+            plate_data = {f"plate{plate}": make_plate(seed=study * args.plates + plate)
+                          for plate in range(1, args.plates + 1)}
+            groups_df = make_groups(plate_data)
+            plate_files = write_plates(os.path.join(directory, f"study{study}"), plate_data)
+            study_files[f"study{study}"] = (plate_files, groups_df)
+            merged, summary = ingest_plates(plate_files, groups_df, workers=1)
+            save_time += timed(lambda: store.save_plates(f"study{study}", merged, summary))[1]
+        n_wells = int(store.studies()["Wells"].sum())
+        print(f"{args.studies} studies × {args.plates} plates, {n_wells} wells "
+              f"(saved in {save_time:.2f}s, {os.path.getsize(store.path) / 1024 ** 2:.1f} MB)")
+
+        plate_files, groups_df = study_files["study0"]
+        merged, remerge_time = timed(lambda: ingest_plates(plate_files, groups_df, workers=1)[0])
+        loaded, reopen_time = timed(lambda: store.load_study("study0")[0])
+        pd.testing.assert_frame_equal(merged, loaded)
+
+        def scan_all():
+            wells = pd.concat([store.load_study(study)[0] for study in study_files], ignore_index=True)
+            return wells[wells["Gene"] == "Gene1"]
+
+        scanned, scan_time = timed(scan_all)
+        queried, query_time = timed(lambda: store.query_wells(genes=["Gene1"]))
+        assert len(scanned) == len(queried)
+
+        print(f"{'re-merge one study from CSV':<34}{remerge_time:>8.3f}s")
+        print(f"{'reopen one study from the store':<34}{reopen_time:>8.3f}s  ({remerge_time / reopen_time:.1f}x)")
+        print(f"{'one gene: load every study':<34}{scan_time:>8.3f}s")
+        print(f"{'one gene: indexed query':<34}{query_time:>8.3f}s  ({scan_time / query_time:.1f}x, "
+              f"{len(queried)} wells)")
+
+
+if __name__ == "__main__":
+    main()
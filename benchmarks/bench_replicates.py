@@ -0,0 +1,68 @@
+"""Replicate QC on a large dataset: per-pair scans vs one grouped pass + anti-join.
+
+    python benchmarks/bench_replicates.py --plates 130
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from qpcr.plates import merge_plates  # noqa: E402
+from qpcr.replicates import apply_decisions, decision_key, flag_replicates, index_replicates, replicate_stats  # noqa: E402
+from qpcr.testing import make_groups, make_plates  # noqa: E402
+
+
+def legacy_review(df, threshold, user_decisions):
+    """What ``review_replicates.app`` did per rerun: row-wise apply, per-pair scans, per-decision filters."""
+    variation = df.groupby(["Sample", "Gene"]).agg(min_Cq=("Cq", "min"), max_Cq=("Cq", "max")).reset_index()
+    variation["Cq_diff"] = variation["max_Cq"] - variation["min_Cq"]
+    flagged = variation[variation["Cq_diff"] > threshold]
+    flagged[~flagged.apply(lambda row: f"{row['Sample']}__{row['Gene']}" in user_decisions, axis=1)]
+    for row in flagged.itertuples():
+        df[(df["Sample"] == row.Sample) & (df["Gene"] == row.Gene)]
+
+    for key, decision in user_decisions.items():
+        sample, gene = key.split("__")
+        df = df[~((df["Sample"] == sample) & (df["Gene"] == gene))]
+    return df
+
+
+def current_review(df, threshold, user_decisions):
+    stats = replicate_stats(df)
+    flagged = flag_replicates(df, threshold, user_decisions, stats=stats)
+    rows = index_replicates(df)
+    for sample, gene in zip(flagged["Sample"], flagged["Gene"]):
+        df.iloc[rows[(sample, gene)]]
+    return apply_decisions(df, user_decisions)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--plates", type=int, default=130, help="384-well plates (130 ≈ 50k wells)")
+    parser.add_argument("--threshold", type=float, default=6.0)
+    args = parser.parse_args()
+
+    plate_data = make_plates(args.plates)
+    df, _ = merge_plates(plate_data, make_groups(plate_data))
+    flagged = flag_replicates(df, args.threshold)
+    user_decisions = {
+        decision_key(sample, gene): {"action": "Remove All", "well": None}
+        for sample, gene in zip(flagged["Sample"], flagged["Gene"])
+    }
+    print(f"{len(df)} wells, {len(flagged)} flagged pairs")
+
+    # The legacy code ran on object-dtype keys
+    legacy_df = df.astype({"Sample": object, "Gene": object})
+    for label, review, data in (("legacy", legacy_review, legacy_df), ("grouped", current_review, df)):
+        start = time.perf_counter()
+        result = review(data, args.threshold, user_decisions)
+        print(f"{label:<8} {time.perf_counter() - start:>8.3f}s  ({len(result)} wells kept)")
+
+
+if __name__ == "__main__":
+    main()
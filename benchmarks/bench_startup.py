@@ -0,0 +1,102 @@
+"""App startup: import time of every page module in a fresh interpreter, cold (no bytecode cache) vs warm.
+
+    python benchmarks/bench_startup.py --repeat 5 --target 3.0
+
+Each measurement runs in its own process. "cold" compiles every module from
+source (an empty ``PYTHONPYCACHEPREFIX``), like the first start of a fresh
+container; "warm" uses the bytecode cache and reports the best of
+``--repeat`` runs. Times are split into importing streamlit (paid once per
+server) and importing the page on top of it (the first visit to a page).
+The heavy plotting and statistics libraries a page pulls in at import are
+listed; they should only load once a plot or test is requested. Exits with
+status 1 if a cold start (streamlit + page) exceeds ``--target`` seconds.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Page modules in navigation order (main.py itself needs the login secrets)
+PAGES = [
+    "upload_data",
+    "project_store",
+    "review_replicates",
+    "mean_cq_computation",
+    "deltact_normalization",
+    "fold_change_analysis",
+    "statistical_analysis",
+    "visualization_delta_ct",
+    "visualization_fold_change",
+]
+
+# Libraries that pages should defer until they are needed
+HEAVY_MODULES = ["matplotlib", "seaborn", "scipy.stats"]
+
+_CHILD = """
+import importlib, json, sys, time
+start = time.perf_counter()
+import streamlit
+loaded = time.perf_counter()
+importlib.import_module(sys.argv[1])
+done = time.perf_counter()
+print(json.dumps({"streamlit": loaded - start, "page": done - loaded,
+                  "heavy": [name for name in json.loads(sys.argv[2]) if name in sys.modules]}))
+"""
+
+
+def measure(page: str, cold: bool) -> dict:
+    """Import ``page`` in a new interpreter and return its timings."""
+    env = dict(os.environ)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        if cold:
+            env["PYTHONPYCACHEPREFIX"] = cache_dir
+        output = subprocess.run([sys.executable, "-c", _CHILD, page, json.dumps(HEAVY_MODULES)], cwd=ROOT, env=env,
+                                capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def deferred_import_time() -> float:
+    """What the first plot pays: importing the deferred libraries after streamlit."""
+    code = ("import time, streamlit; start = time.perf_counter(); "
+            "import matplotlib.figure, matplotlib.backends.backend_agg, seaborn, scipy.stats; "
+            "print(time.perf_counter() - start)")
+    return float(subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True,
+                                check=True).stdout)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", nargs="+", default=PAGES, choices=PAGES)
+    parser.add_argument("--repeat", type=int, default=5, help="warm runs per page (best is reported)")
+    parser.add_argument("--target", type=float, default=None, help="maximum cold start in seconds")
+    args = parser.parse_args()
+
+    measure(args.pages[0], cold=False)  # populate the bytecode cache and the OS file cache
+    print(f"{'page':<28}{'cold':>9}{'warm':>9}{'cold start':>12}  heavy imports")
+    slowest = 0.0
+    for page in args.pages:
+        cold = measure(page, cold=True)
+        warm = min((measure(page, cold=False) for _ in range(args.repeat)), key=lambda run: run["page"])
+        cold_start = cold["streamlit"] + cold["page"]
+        slowest = max(slowest, cold_start)
+        print(f"{page:<28}{cold['page']:>8.3f}s{warm['page']:>8.3f}s{cold_start:>11.3f}s  "
+              f"{', '.join(warm['heavy']) or '-'}")
+    print(f"{'streamlit itself (warm)':<28}{'':>9}{warm['streamlit']:>8.3f}s")
+    print(f"{'deferred libraries (warm)':<28}{'':>9}{deferred_import_time():>8.3f}s  paid by the first plot or test")
+
+    if args.target is not None:
+        verdict = "within" if slowest <= args.target else "over"
+        print(f"slowest cold start {slowest:.3f}s: {verdict} the {args.target:.3f}s target")
+        if slowest > args.target:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
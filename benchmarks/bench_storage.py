@@ -0,0 +1,71 @@
+"""Merged-data archive on disk: CSV vs compact Parquet (size, full load, projected/filtered load).
+
+    python benchmarks/bench_storage.py --plates 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from qpcr.plates import merge_plates  # noqa: E402
+from qpcr.storage import read_table, write_table  # noqa: E402
+from qpcr.testing import make_groups, make_plates  # noqa: E402
+
+
+def timed(func, repeat: int) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--plates", type=int, default=200)
+    parser.add_argument("--wells", type=int, choices=[96, 384], default=384)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    plate_data = make_plates(args.plates, args.wells)
+    merged_data, _ = merge_plates(plate_data, make_groups(plate_data))
+    genes = list(merged_data["Gene"].unique()[:2])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "merged.csv")
+        parquet_path = os.path.join(tmp, "merged.parquet")
+        csv_write, _ = timed(lambda: merged_data.to_csv(csv_path, index=False), 1)
+        parquet_write, _ = timed(lambda: write_table(merged_data, parquet_path), 1)
+
+        csv_full, _ = timed(lambda: pd.read_csv(csv_path), args.repeat)
+        parquet_full, _ = timed(lambda: read_table(parquet_path), args.repeat)
+
+        def csv_subset_read() -> pd.DataFrame:
+            df = pd.read_csv(csv_path, usecols=["Sample", "Gene", "Cq"])
+            return df[df["Gene"].isin(genes)]
+
+        csv_subset, expected = timed(csv_subset_read, args.repeat)
+        parquet_subset, subset = timed(
+            lambda: read_table(parquet_path, columns=["Sample", "Gene", "Cq"], genes=genes), args.repeat
+        )
+
+        print(f"{len(merged_data)} wells from {args.plates} × {args.wells}-well plates")
+        print(f"{'':<28}{'CSV':>10}{'Parquet':>10}")
+        print(f"{'size (MB)':<28}{os.path.getsize(csv_path) / 1e6:>10.2f}{os.path.getsize(parquet_path) / 1e6:>10.2f}")
+        print(f"{'write (s)':<28}{csv_write:>10.3f}{parquet_write:>10.3f}")
+        print(f"{'full load (s)':<28}{csv_full:>10.3f}{parquet_full:>10.3f}")
+        print(f"{'3 columns, 2 genes (s)':<28}{csv_subset:>10.3f}{parquet_subset:>10.3f}")
+        print(f"rows matched: {len(subset) == len(expected)}")
+
+
+if __name__ == "__main__":
+    main()
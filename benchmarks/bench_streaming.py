@@ -0,0 +1,85 @@
+"""Plate ingestion peak memory: whole exports and plates in memory vs streamed chunks into a Parquet store.
+
+    python benchmarks/bench_streaming.py --plates 300 --chunk-rows 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from qpcr.ingest import ingest_plates  # noqa: E402
+from qpcr.streaming import read_store, stream_ingest  # noqa: E402
+from qpcr.testing import make_groups, make_plates, write_plates  # noqa: E402
+
+# Columns of templates/Cq_template.csv, in order
+TEMPLATE_COLUMNS = ["", "Well", "Fluor", "Target", "Content", "Sample", "Biological Set Name", "Cq", "Cq Mean",
+                    "Cq Std. Dev", "Starting Quantity (SQ)", "Log Starting Quantity", "SQ Mean", "SQ Std. Dev",
+                    "Set Point", "Well Note"]
+
+
+def full_width(cq_df: pd.DataFrame) -> pd.DataFrame:
+    """A synthetic Cq export padded to all 16 instrument columns, like a real export."""
+    padded = cq_df.reindex(columns=TEMPLATE_COLUMNS)
+    padded["Target"] = "Gene"
+    padded["Sample"] = "Sample"
+    padded["Cq Mean"] = padded["Cq"]
+    padded["Cq Std. Dev"] = 0.0
+    padded["Set Point"] = 72.0
+    return padded
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak / 1024 ** 2
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--plates", type=int, default=300)
+    parser.add_argument("--chunk-rows", type=int, default=10_000)
+    args = parser.parse_args()
+
+    plate_data = make_plates(args.plates)
+    groups_df = make_groups(plate_data)
+    for position, frames in enumerate(plate_data.values()):
+        frames["Cq"] = full_width(frames["Cq"])
+        if position % 10 == 0:
+            # Every tenth plate carries standard-curve quantities
+            frames["Cq"]["Starting Quantity (SQ)"] = np.resize([1000.0, 100.0, 10.0, np.nan], len(frames["Cq"]))
+
+    with tempfile.TemporaryDirectory() as directory:
+        plate_files = write_plates(os.path.join(directory, "plates"), plate_data)
+        del plate_data
+        store_path = os.path.join(directory, "store")
+
+        (merged, _), full_time, full_peak = measure(lambda: ingest_plates(plate_files, groups_df, workers=1))
+        _, stream_time, stream_peak = measure(
+            lambda: stream_ingest(plate_files, groups_df, store_path, chunk_rows=args.chunk_rows)
+        )
+        streamed, read_time, read_peak = measure(lambda: read_store(store_path, list(plate_files)))
+        pd.testing.assert_frame_equal(merged, streamed)
+
+        print(f"{args.plates} × 384-well plates, {len(merged)} wells, chunks of {args.chunk_rows} rows")
+        print(f"{'':<28}{'seconds':>9}{'peak MB':>10}")
+        print(f"{'read + merge in memory':<28}{full_time:>9.2f}{full_peak:>10.1f}")
+        print(f"{'stream to Parquet store':<28}{stream_time:>9.2f}{stream_peak:>10.1f}")
+        print(f"{'load store (compact frame)':<28}{read_time:>9.2f}{read_peak:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
 import streamlit as st
-import pandas as pd
+
+from qpcr import check_housekeeping_genes, delta_ct
+from qpcr.cache import cached_stage
+from qpcr.storage import to_csv_bytes
 
 def app():
     """Normalize ΔCt Values Using Housekeeping Genes"""
@@ -20,8 +23,7 @@ def app():
         housekeeping_genes = [gene.strip() for gene in housekeeping_genes_input.split(",")]
 
         # ✅ Identify missing & found housekeeping genes
-        missing_genes = [gene for gene in housekeeping_genes if gene not in mean_cq_df["Gene"].unique()]
-        found_genes = list(set(housekeeping_genes) - set(missing_genes))
+        found_genes, missing_genes = check_housekeeping_genes(mean_cq_df, housekeeping_genes)
 
         # ✅ Store housekeeping genes in session state for later use
         st.session_state["found_genes"] = found_genes
@@ -40,20 +42,8 @@ def app():
         if "found_genes" in st.session_state and st.session_state["found_genes"]:
             found_genes = st.session_state["found_genes"]  # ✅ Retrieve stored housekeeping genes
 
-            # ✅ Calculate the Mean Cq of housekeeping genes per sample
-            hk_mean_per_sample = (
-                mean_cq_df[mean_cq_df["Gene"].isin(found_genes)]
-                .groupby("Sample")["Mean_Cq"]
-                .mean()
-                .reset_index()
-                .rename(columns={"Mean_Cq": "Housekeeping_Mean_Cq"})
-            )
-
-            # ✅ Merge housekeeping Mean Cq with main dataset
-            normalized_df = mean_cq_df.merge(hk_mean_per_sample, on="Sample", how="left")
-
-            # ✅ Compute Normalized ΔCt values
-            normalized_df["Normalized_Cq"] = normalized_df["Mean_Cq"] - normalized_df["Housekeeping_Mean_Cq"]
+            # ✅ Compute Normalized ΔCt against the per-sample housekeeping Mean Cq
+            normalized_df = cached_stage("delta_ct", delta_ct, mean_cq_df, found_genes)
 
             # ✅ Store in session state persistently
             st.session_state["normalized_qPCR_df"] = normalized_df
@@ -71,7 +61,7 @@ def app():
         # ✅ **Download Button**
         st.download_button(
             label="📥 Download Full Normalized qPCR Data",
-            data=normalized_df.to_csv(index=False),
+            data=cached_stage("export_csv", to_csv_bytes, normalized_df),
             file_name="Normalized_qPCR_Data.csv",
             mime="text/csv"
         )
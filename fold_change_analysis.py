@@ -1,7 +1,11 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import re  # To sanitize filenames
+
+from qpcr import delta_delta_ct, safe_group_name
+from qpcr.cache import cached_stage
+from qpcr.contrasts import all_contrasts, contrast_name, contrast_table
+from qpcr.efficiency import fit_standard_curves, gene_amplification, pfaffl_ratio
+from qpcr.storage import to_csv_bytes, write_table
+from session_workspace import results_path
 
 def app():
     """Compute ΔΔCt and Fold Change"""
@@ -12,7 +16,7 @@ def app():
         st.error("❌ No normalized qPCR data available. Please compute ΔCt first.")
         st.stop()
 
-    df = st.session_state["normalized_qPCR_df"].copy()
+    df = st.session_state["normalized_qPCR_df"]
 
     # ✅ Step 1: User Selects Control Group
     st.subheader("📌 Select Control Group & Groups for Analysis")
@@ -24,7 +28,7 @@ def app():
     control_group = st.selectbox("🔹 Select the control group:", unique_groups)
 
     # Ensure Control Group is Safe for Filenames
-    safe_control_group = re.sub(r"[^\w\-_]", "_", control_group)
+    safe_control_group = safe_group_name(control_group)
 
     # Multi-select for which groups to analyze
     selected_groups = st.multiselect(
@@ -39,39 +43,20 @@ def app():
 
     # ✅ Step 2: Compute ΔΔCt and Fold Change
     if st.button("🚀 Compute ΔΔCt & Fold Change"):
-        # Filter data to only include selected groups
-        df_filtered = df[df["Group"].isin(selected_groups)].copy()
-
-        # ✅ Handle Infinite Values
-        df_filtered.replace([np.inf, -np.inf], pd.NA, inplace=True)
-
-        # ✅ Compute Mean ΔCt for the Control Group
-        reference_ct = (
-            df_filtered[df_filtered["Group"] == control_group]
-            .groupby("Gene")["Normalized_Cq"]
-            .mean()
-            .reset_index()
-            .rename(columns={"Normalized_Cq": "Reference_Ct"})
-        )
-
-        # ✅ Merge Reference ΔCt Values
-        df_filtered = df_filtered.merge(reference_ct, on="Gene", how="left")
-
-        # ✅ Compute ΔΔCt for Each Sample
-        df_filtered["Delta_Delta_Ct"] = df_filtered["Normalized_Cq"] - df_filtered["Reference_Ct"]
-
-        # ✅ Compute Fold Change
-        df_filtered["Fold_Change"] = 2 ** (-df_filtered["Delta_Delta_Ct"])
+        # ✅ Compute ΔΔCt against the control group's mean ΔCt and Fold Change
+        df_filtered = cached_stage("delta_delta_ct", delta_delta_ct, df, control_group, selected_groups)
 
-        # ✅ Store Data in Session State
+        # ✅ Store Data in Session State (settings are reused when plates are re-merged)
         st.session_state["fold_change_qPCR_df"] = df_filtered
+        st.session_state["control_group"] = control_group
+        st.session_state["selected_groups"] = selected_groups
 
         # ✅ Save File Path
-        output_file = f"./results/DeltaDeltaCt_qPCR_relative_to_{safe_control_group}.csv"
+        output_file = results_path(f"DeltaDeltaCt_qPCR_relative_to_{safe_control_group}.parquet")
         st.session_state["fold_change_output_file"] = output_file
 
-        # ✅ Save to CSV
-        df_filtered.to_csv(output_file, index=False)
+        # ✅ Save as Parquet (CSV is download-only)
+        write_table(df_filtered, output_file)
 
         st.success(f"✅ ΔΔCt and Fold Change calculations completed using '{control_group}' as control!")
 
@@ -85,7 +70,70 @@ def app():
         st.subheader("📥 Download ΔΔCt & Fold Change Data")
         st.download_button(
             label="📥 Download CSV",
-            data=df_filtered.to_csv(index=False),
+            data=cached_stage("export_csv", to_csv_bytes, df_filtered),
             file_name=f"DeltaDeltaCt_qPCR_{safe_control_group}.csv",
             mime="text/csv"
         )
+
+    # ✅ Step 4: Compare Several Groups at Once (every contrast in one table)
+    st.subheader("🔀 Multi-Contrast ΔΔCt")
+    all_pairs = all_contrasts(list(unique_groups))
+    contrast_labels = {contrast_name(treatment, control): (treatment, control) for treatment, control in all_pairs}
+    compare_all = st.checkbox("Compare every group against every other group", key="contrast_all")
+    chosen_labels = list(contrast_labels) if compare_all else st.multiselect(
+        "🔹 Select contrasts (treatment vs control):", list(contrast_labels), key="contrast_selection"
+    )
+
+    if st.button("🚀 Compute Selected Contrasts", disabled=not chosen_labels):
+        contrasts = [contrast_labels[label] for label in chosen_labels]
+        contrast_df = cached_stage("contrast_table", contrast_table, df, contrasts)
+        st.session_state["contrast_qPCR_df"] = contrast_df
+        st.session_state["contrasts"] = contrasts
+
+        # ✅ One Parquet table for all contrasts instead of one file per control group
+        write_table(contrast_df, results_path("DeltaDeltaCt_qPCR_contrasts.parquet"))
+        st.success(f"✅ Computed **{len(contrasts)}** contrasts in one pass!")
+
+    if st.session_state.get("contrast_qPCR_df") is not None:
+        contrast_df = st.session_state["contrast_qPCR_df"]
+        st.write(f"📌 **{contrast_df['Contrast'].nunique()}** contrasts, **{len(contrast_df)}** rows.")
+        st.dataframe(contrast_df.head(10))
+        st.download_button(
+            label="📥 Download Contrasts CSV",
+            data=cached_stage("export_csv", to_csv_bytes, contrast_df),
+            file_name="DeltaDeltaCt_qPCR_contrasts.csv",
+            mime="text/csv"
+        )
+
+    # ✅ Step 5: Efficiency-Corrected Fold Change from Standard Curves (Pfaffl)
+    st.subheader("⚗️ Efficiency-Corrected Fold Change (Pfaffl)")
+    merged_data = st.session_state.get("filtered_merged_data")
+    if merged_data is None or "SQ" not in merged_data.columns:
+        st.info("ℹ️ No standard-curve wells (Starting Quantity) in the uploaded Cq files; 100% efficiency is assumed above.")
+    elif not st.session_state.get("found_genes"):
+        st.info("ℹ️ Check housekeeping genes on the ΔCt page first.")
+    else:
+        curves = cached_stage("standard_curves", fit_standard_curves, merged_data)
+        st.write(f"📌 Fitted **{len(curves)}** standard curves (per plate and gene).")
+        st.dataframe(curves)
+
+        min_r2 = st.number_input("Minimum R² for a usable curve:", min_value=0.5, max_value=1.0, value=0.98,
+                                 step=0.01, key="efficiency_min_r2")
+        if st.button("⚗️ Compute Pfaffl Ratios"):
+            amplification = gene_amplification(curves, min_r2)
+            pfaffl_df = cached_stage("pfaffl_ratio", pfaffl_ratio, st.session_state["mean_cq_df"],
+                                     st.session_state["found_genes"], control_group, amplification, selected_groups)
+            st.session_state["pfaffl_qPCR_df"] = pfaffl_df
+            write_table(pfaffl_df, results_path(f"Pfaffl_qPCR_relative_to_{safe_control_group}.parquet"))
+            st.success(f"✅ Efficiency-corrected ratios computed for **{amplification.size}** genes with standard curves; "
+                       "others assume 100% efficiency.")
+
+    if st.session_state.get("pfaffl_qPCR_df") is not None:
+        pfaffl_df = st.session_state["pfaffl_qPCR_df"]
+        st.dataframe(pfaffl_df.head(10))
+        st.download_button(
+            label="📥 Download Pfaffl Ratios CSV",
+            data=cached_stage("export_csv", to_csv_bytes, pfaffl_df),
+            file_name=f"Pfaffl_qPCR_{safe_control_group}.csv",
+            mime="text/csv"
+        )
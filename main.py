@@ -29,8 +29,8 @@ if not st.session_state["authenticated"]:
 st.sidebar.title("Navigation")
 page = st.sidebar.radio(
     "Go to",
-    ["Main", "Upload Data", "Review Replicates", "Mean Cq Computation", "Delta Cq Normalization",
-     "Fold Change Analysis", "ΔCt Visualization", "Fold Change Visualization"]
+    ["Main", "Upload Data", "Project Store", "Review Replicates", "Mean Cq Computation", "Delta Cq Normalization",
+     "Fold Change Analysis", "Statistical Analysis", "ΔCt Visualization", "Fold Change Visualization"]
 )
 
 # Load different pages
@@ -63,6 +63,9 @@ if page == "Main":
 elif page == "Upload Data":
     import upload_data
     upload_data.app()
+elif page == "Project Store":
+    import project_store
+    project_store.app()
 elif page == "Review Replicates":
     import review_replicates
     review_replicates.app()
@@ -75,6 +78,9 @@ elif page == "Delta Cq Normalization":
 elif page == "Fold Change Analysis":
     import fold_change_analysis
     fold_change_analysis.app()
+elif page == "Statistical Analysis":
+    import statistical_analysis
+    statistical_analysis.app()
 elif page == "ΔCt Visualization":
     import visualization_delta_ct
     visualization_delta_ct.app()
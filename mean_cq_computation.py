@@ -1,5 +1,8 @@
 import streamlit as st
-import pandas as pd
+
+from qpcr import mean_cq
+from qpcr.cache import cached_stage
+from qpcr.storage import to_csv_bytes
 
 def app():
     """Compute Mean Cq for Each Sample-Gene Pair"""
@@ -13,18 +16,8 @@ def app():
     filtered_merged_df = st.session_state["filtered_merged_data"]
 
     if st.button("🔄 Compute Mean Cq Values"):
-        # ✅ Compute Mean Cq per Sample-Gene pair (ignoring Plate)
-        mean_cq_df = (
-            filtered_merged_df.groupby(["Sample", "Gene"], as_index=False)
-            .agg(Mean_Cq=("Cq", "mean"))  # Calculate mean Cq for each Sample-Gene pair
-        )
-
-        # ✅ Merge with Group metadata
-        mean_cq_df = mean_cq_df.merge(
-            filtered_merged_df[["Sample", "Gene", "Group"]].drop_duplicates(),
-            on=["Sample", "Gene"],
-            how="left"
-        )
+        # ✅ Compute Mean Cq per Sample-Gene pair (ignoring Plate) with Group metadata
+        mean_cq_df = cached_stage("mean_cq", mean_cq, filtered_merged_df)
 
         # ✅ Store in session state persistently
         st.session_state["mean_cq_df"] = mean_cq_df
@@ -37,7 +30,7 @@ def app():
         # ✅ Provide a download button for Mean Cq Data
         st.download_button(
             label="📥 Download Mean Cq Data",
-            data=st.session_state["mean_cq_df"].to_csv(index=False),
+            data=cached_stage("export_csv", to_csv_bytes, st.session_state["mean_cq_df"]),
             file_name="Mean_Cq_Data.csv",
             mime="text/csv"
         )
@@ -0,0 +1,159 @@
+import streamlit as st
+import pandas as pd
+import os
+
+from qpcr.export import export_bundle
+from qpcr.facets import DEFAULT_FACET_COLUMNS, render_facets
+from qpcr.ingest import default_workers
+from qpcr.plot_cache import default_plot_cache
+from qpcr.plotting import DEFAULT_DPI, delta_ct_plot_data, fold_change_plot_data, iter_render_genes, plot_filename
+from qpcr.replicates import page_count, paginate
+from background_jobs import job_panel, submit_job
+from session_workspace import results_path
+
+THUMBNAIL_DPI = 60
+GALLERY_COLUMNS = 4
+
+# Session results included in the bulk export, with their file names
+EXPORT_TABLES = {
+    "merged_data": "Merged_qPCR_Data",
+    "mean_cq_df": "Mean_Cq",
+    "normalized_qPCR_df": "Normalized_qPCR",
+    "fold_change_qPCR_df": "DeltaDeltaCt_qPCR",
+    "contrast_qPCR_df": "DeltaDeltaCt_qPCR_contrasts",
+    "pfaffl_qPCR_df": "Pfaffl_qPCR",
+    "statistics_qPCR_df": "Statistics_qPCR_contrasts",
+    "anova_qPCR_df": "ANOVA_qPCR",
+}
+EXPORT_FORMAT_LABELS = {"PNG (one file per gene)": "png", "SVG (one file per gene)": "svg",
+                        "PDF (one multi-page file per plot type)": "pdf"}
+
+
+def _open_gene(key, gene):
+    st.session_state[f"{key}_opened"] = gene
+
+
+def _download_button(kind, gene, plot_path, label, key):
+    with open(plot_path, "rb") as file:
+        st.download_button(
+            label=f"📥 Download {gene} {label}",
+            data=file,
+            file_name=plot_filename(kind, gene),
+            mime="image/png",
+            key=f"{key}_download_{gene}"
+        )
+
+
+def gene_gallery(kind, plot_df, key, label):
+    """Per-gene plots of ``plot_df``: a paged thumbnail gallery, a faceted panel, or every gene at full resolution"""
+    genes = plot_df["Gene"].unique().tolist()
+    cache = default_plot_cache()
+
+    # ✅ Rendering Settings
+    view = st.radio("View:", ["🖼️ Gallery", "🧩 Faceted Panel", "📜 All Genes (full resolution)"], horizontal=True,
+                    key=f"{key}_view")
+    col1, col2 = st.columns(2)
+    dpi = col1.number_input("🖼️ Figure DPI:", min_value=50, max_value=600, value=DEFAULT_DPI, step=50,
+                            key=f"{key}_dpi")
+    workers = col2.number_input("⚙️ Rendering processes:", min_value=1, max_value=default_workers(),
+                                value=default_workers(), step=1, key=f"{key}_workers")
+
+    if view.startswith("📜"):
+        # ✅ Every gene at full resolution; unchanged genes come from the plot cache
+        progress = st.progress(0.0, text=f"Rendering {len(genes)} plots...")
+        for done, (gene, plot_path) in enumerate(
+            iter_render_genes(kind, plot_df, dpi=int(dpi), workers=int(workers), cache=cache), start=1
+        ):
+            st.image(plot_path)
+            _download_button(kind, gene, plot_path, label, key)
+            progress.progress(done / len(genes), text=f"Rendered {done}/{len(genes)} plots")
+        return
+
+    # ✅ Search, then only the visible page of genes is rendered
+    search = st.text_input("🔍 Search genes:", key=f"{key}_search").strip().lower()
+    matches = pd.Series([gene for gene in genes if search in str(gene).lower()], dtype=object)
+    col1, col2 = st.columns(2)
+    page_size = col1.selectbox("Genes per page:", [12, 24, 48], key=f"{key}_page_size")
+    n_pages = page_count(len(matches), page_size)
+    if st.session_state.get(f"{key}_page", 1) > n_pages:
+        st.session_state[f"{key}_page"] = n_pages
+    page = col2.number_input(f"Page (of {n_pages}):", min_value=1, max_value=n_pages, step=1, key=f"{key}_page")
+    page_genes = paginate(matches, page, page_size).tolist()
+    st.caption(f"Showing {len(page_genes)} of {len(matches)} matching genes ({len(genes)} total)")
+
+    if view.startswith("🧩"):
+        # ✅ The whole page as one figure of facets (shared groups and colors, own y scale each)
+        n_columns = st.slider("Facet columns:", min_value=1, max_value=8, value=DEFAULT_FACET_COLUMNS,
+                              key=f"{key}_facet_columns")
+        panel_path = render_facets(kind, plot_df, page_genes, n_columns, dpi=int(dpi), cache=cache)
+        st.image(panel_path)
+        with open(panel_path, "rb") as file:
+            st.download_button(
+                label=f"📥 Download Panel (page {page})",
+                data=file,
+                file_name=f"{kind}_panel_page{page}.png",
+                mime="image/png",
+                key=f"{key}_download_panel"
+            )
+        return
+
+    # ✅ Thumbnails are low DPI and cached
+    thumbnails = dict(iter_render_genes(kind, plot_df, genes=page_genes, dpi=THUMBNAIL_DPI, workers=int(workers),
+                                        cache=cache))
+    columns = st.columns(GALLERY_COLUMNS)
+    for position, gene in enumerate(page_genes):
+        with columns[position % GALLERY_COLUMNS]:
+            st.image(thumbnails[gene], caption=str(gene), use_column_width=True)
+            st.button("🔍 Open", key=f"{key}_open_{gene}", on_click=_open_gene, args=(key, gene))
+
+    # ✅ Full resolution only for the opened gene
+    opened = st.session_state.get(f"{key}_opened")
+    if opened in genes:
+        st.subheader(f"🔍 {opened}")
+        full_resolution = iter_render_genes(kind, plot_df, genes=[opened], dpi=int(dpi), workers=1, cache=cache)
+        plot_path = dict(full_resolution)[opened]
+        st.image(plot_path)
+        _download_button(kind, opened, plot_path, label, key)
+
+
+def bulk_export(key):
+    """One ZIP with every -ΔCt and fold-change figure and the result tables in this session"""
+    st.subheader("📦 Bulk Export")
+    plots = {}
+    if st.session_state.get("normalized_qPCR_df") is not None:
+        plots["delta_ct"] = delta_ct_plot_data(st.session_state["normalized_qPCR_df"])
+    if st.session_state.get("fold_change_qPCR_df") is not None:
+        plots["fold_change"] = fold_change_plot_data(st.session_state["fold_change_qPCR_df"])
+
+    image_format = EXPORT_FORMAT_LABELS[st.radio("Figure format:", list(EXPORT_FORMAT_LABELS), horizontal=True,
+                                                 key=f"{key}_export_format")]
+    include_tables = st.checkbox("Include result tables (CSV)", value=True, key=f"{key}_export_tables")
+    tables = {name: st.session_state[state_key] for state_key, name in EXPORT_TABLES.items()
+              if include_tables and st.session_state.get(state_key) is not None}
+
+    if st.button("📦 Build Export", key=f"{key}_export"):
+        # ✅ Figures and tables are streamed into the archive on disk one at a time, in a background job
+        submit_job(
+            "export", export_bundle,
+            results_path("qPCR_export.zip"), plots, tables, image_format,
+            dpi=int(st.session_state.get(f"{key}_dpi", DEFAULT_DPI)),
+            workers=int(st.session_state.get(f"{key}_workers", default_workers())),
+            cache=default_plot_cache(),
+            label=f"Export of {sum(df['Gene'].nunique() for df in plots.values())} figures and {len(tables)} tables"
+        )
+
+    export_path = job_panel("export")
+    if export_path is not None:
+        st.session_state["export_path"] = export_path
+        st.success("✅ Export ready!")
+
+    export_path = st.session_state.get("export_path")
+    if export_path and os.path.exists(export_path):
+        with open(export_path, "rb") as file:
+            st.download_button(
+                label="📥 Download Export (ZIP)",
+                data=file,
+                file_name="qPCR_export.zip",
+                mime="application/zip",
+                key=f"{key}_export_download"
+            )
@@ -0,0 +1,91 @@
+import streamlit as st
+
+from qpcr.cache import cached_stage
+from qpcr.incremental import IncrementalPipeline
+from qpcr.project import RESULT_KEYS, SETTING_KEYS, default_project_store
+from qpcr.storage import to_csv_bytes
+
+
+def _open_study(store, study):
+    """Load a saved study into the session, including the incremental pipeline of its plates"""
+    analysis = store.load_analysis(study)
+    # ✅ Results the study doesn't have are cleared, so pages see them as missing rather than None
+    for key in ["merged_data", "summary"] + RESULT_KEYS + SETTING_KEYS:
+        if analysis[key] is None:
+            st.session_state.pop(key, None)
+        else:
+            st.session_state[key] = analysis[key]
+
+    # ✅ Re-uploading unchanged plate files later will not re-merge them
+    pipeline = None
+    if analysis["groups_df"] is not None:
+        pipeline = IncrementalPipeline(analysis["groups_df"], user_decisions=analysis["user_decisions"] or {})
+        for plate, merged_df in analysis["merged_data"].groupby("Plate", observed=True, sort=False):
+            pipeline.set_merged_plate(plate, merged_df.reset_index(drop=True), analysis["summary"].get(plate))
+    st.session_state["incremental_pipeline"] = pipeline
+    st.session_state["plate_hashes"] = dict(analysis["plate_hashes"]) if pipeline is not None else {}
+    st.session_state["study"] = study
+
+
+def app():
+    """Save, reopen and query studies in the persistent project store"""
+    st.title("🗄️ Project Store")
+    store = default_project_store()
+
+    # ✅ Step 1: Save the current analysis as a study
+    st.subheader("💾 Save Current Analysis")
+    if st.session_state.get("merged_data") is None:
+        st.info("ℹ️ Merge plates (or open a study) to save an analysis.")
+    else:
+        study = st.text_input("Study name:", value=st.session_state.get("study") or "", key="save_study_name").strip()
+        if st.button("💾 Save Study") and study:
+            pipeline = st.session_state.get("incremental_pipeline")
+            store.save_analysis(
+                study,
+                {key: st.session_state.get(key) for key in ["merged_data", "summary"] + RESULT_KEYS + SETTING_KEYS},
+                hashes=st.session_state.get("plate_hashes"),
+                groups_df=pipeline.groups_df if pipeline is not None else None,
+            )
+            st.session_state["study"] = study
+            st.success(f"✅ Saved {len(st.session_state['summary'])} plates and results as study `{study}`!")
+
+    # ✅ Step 2: Reopen a saved study without re-uploading or re-merging
+    st.subheader("📂 Open a Study")
+    studies = store.studies()
+    if studies.empty:
+        st.info("ℹ️ No studies saved yet.")
+    else:
+        st.dataframe(studies, hide_index=True)
+        col1, col2 = st.columns([3, 1])
+        selected = col1.selectbox("Study:", studies["Study"].tolist(), key="open_study_name")
+        if col2.button("📂 Open Study"):
+            _open_study(store, selected)
+            st.success(f"✅ Study `{selected}` loaded: {len(st.session_state['merged_data'])} wells "
+                       f"from {len(st.session_state['summary'])} plates.")
+        if col2.button("🗑️ Delete Study"):
+            store.delete_study(selected)
+            st.warning(f"⚠️ Study `{selected}` deleted.")
+            st.rerun()
+
+    # ✅ Step 3: Look up wells across every saved study and plate (indexed)
+    st.subheader("🔎 Query Wells Across Studies")
+    genes = st.multiselect("Genes:", store.distinct("Gene"), key="query_genes")
+    col1, col2 = st.columns(2)
+    groups = col1.multiselect("Groups (optional):", store.distinct("Group"), key="query_groups")
+    query_studies = col2.multiselect("Studies (optional):", studies["Study"].tolist(), key="query_studies")
+    if genes:
+        wells = store.query_wells(genes=genes, groups=groups or None, studies=query_studies or None)
+        st.write(f"📌 **{len(wells)}** wells from **{wells['Study'].nunique()}** studies "
+                 f"and **{wells[['Study', 'Plate']].drop_duplicates().shape[0]}** plates")
+        st.dataframe(wells, hide_index=True)
+
+        summary = wells.groupby(["Study", "Gene", "Group"], observed=True)["Cq"].agg(["count", "mean", "std"])
+        st.dataframe(summary.reset_index().rename(columns={"count": "Wells", "mean": "Mean_Cq", "std": "SD_Cq"}),
+                     hide_index=True)
+
+        st.download_button(
+            label="📥 Download Query Results as CSV",
+            data=cached_stage("export_csv", to_csv_bytes, wells),
+            file_name="qPCR_query_wells.csv",
+            mime="text/csv"
+        )
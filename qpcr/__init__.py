@@ -0,0 +1,71 @@
+"""Streamlit-free qPCR analysis core shared by the app pages and scripts.
+
+Public names are imported from their submodule on first access, so
+``import qpcr`` (or ``from qpcr import mean_cq``) only loads the submodules
+that are actually used.
+"""
+
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "all_contrasts": "qpcr.contrasts",
+    "contrast_table": "qpcr.contrasts",
+    "group_reference_ct": "qpcr.contrasts",
+    "canonical_frame": "qpcr.dataset",
+    "concat_frames": "qpcr.dataset",
+    "fit_standard_curves": "qpcr.efficiency",
+    "gene_amplification": "qpcr.efficiency",
+    "pfaffl_ratio": "qpcr.efficiency",
+    "IncrementalPipeline": "qpcr.incremental",
+    "ingest_plates": "qpcr.ingest",
+    "iter_ingest_plates": "qpcr.ingest",
+    "JobQueue": "qpcr.jobs",
+    "check_housekeeping_genes": "qpcr.normalization",
+    "delta_ct": "qpcr.normalization",
+    "delta_delta_ct": "qpcr.normalization",
+    "mean_cq": "qpcr.normalization",
+    "safe_group_name": "qpcr.normalization",
+    "auto_curate": "qpcr.outliers",
+    "detect_outliers": "qpcr.outliers",
+    "merge_plate": "qpcr.plates",
+    "merge_plates": "qpcr.plates",
+    "ProjectStore": "qpcr.project",
+    "ACTIONS": "qpcr.replicates",
+    "apply_decisions": "qpcr.replicates",
+    "decision_key": "qpcr.replicates",
+    "flag_replicates": "qpcr.replicates",
+    "index_replicates": "qpcr.replicates",
+    "invalid_decision_keys": "qpcr.replicates",
+    "next_unreviewed_page": "qpcr.replicates",
+    "page_count": "qpcr.replicates",
+    "paginate": "qpcr.replicates",
+    "parse_decision_key": "qpcr.replicates",
+    "replicate_stats": "qpcr.replicates",
+    "review_queue": "qpcr.replicates",
+    "anova": "qpcr.stats",
+    "benjamini_hochberg": "qpcr.stats",
+    "bootstrap_fold_change": "qpcr.stats",
+    "contrast_statistics": "qpcr.stats",
+    "welch_tests": "qpcr.stats",
+    "read_table": "qpcr.storage",
+    "write_table": "qpcr.storage",
+    "read_store": "qpcr.streaming",
+    "stream_ingest": "qpcr.streaming",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    try:
+        module = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
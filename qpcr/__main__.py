@@ -0,0 +1,5 @@
+import sys
+
+from qpcr.cli import main
+
+sys.exit(main())
@@ -0,0 +1,149 @@
+"""Content-hash memoization of pipeline stages with LRU eviction and a memory budget.
+
+Streamlit reruns every page script on each widget interaction. Stages run
+through a ``StageCache`` are keyed by a hash of their input data and
+parameters, so a rerun with unchanged inputs returns the stored result instead
+of recomputing it. Cached results are shared: callers must not mutate them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CACHE_MB = 512
+
+
+def _update(h, obj) -> None:
+    if isinstance(obj, pd.DataFrame):
+        h.update(b"D" + repr((list(obj.columns), [str(t) for t in obj.dtypes], obj.shape)).encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, pd.Series):
+        h.update(b"S" + repr((obj.name, str(obj.dtype), len(obj))).encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, np.ndarray):
+        h.update(b"A" + repr((str(obj.dtype), obj.shape)).encode())
+        if obj.dtype == object:
+            h.update(pd.util.hash_array(obj.ravel()).tobytes())
+        else:
+            h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, (bytes, bytearray, memoryview)):
+        h.update(b"B" + str(len(obj)).encode())
+        h.update(bytes(obj))
+    elif isinstance(obj, dict):
+        h.update(b"{")
+        for key in sorted(obj, key=repr):
+            _update(h, key)
+            _update(h, obj[key])
+        h.update(b"}")
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        items = sorted(obj, key=repr) if isinstance(obj, (set, frozenset)) else obj
+        h.update(b"[")
+        for item in items:
+            _update(h, item)
+        h.update(b"]")
+    else:
+        h.update(b"R" + repr(obj).encode())
+
+
+def content_hash(*parts) -> str:
+    """Stable hex digest of DataFrames, arrays, bytes and plain parameters."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        _update(h, part)
+    return h.hexdigest()
+
+
+def estimate_size(obj) -> int:
+    """Approximate memory footprint of a cached result in bytes."""
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(index=True, deep=True))
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, (bytes, bytearray)):
+        return len(obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(estimate_size(k) + estimate_size(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(estimate_size(item) for item in obj)
+    return sys.getsizeof(obj)
+
+
+class StageCache:
+    """Thread-safe LRU cache of stage results bounded by ``max_bytes``."""
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_MB * 1024 ** 2):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[str, str], tuple[object, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_compute(self, stage: str, func, *args, **kwargs):
+        """Return ``func(*args, **kwargs)``, reusing the stored result for identical inputs."""
+        key = (stage, content_hash(args, kwargs))
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+
+        result = func(*args, **kwargs)
+        self.put(key, result)
+        return result
+
+    def put(self, key: tuple[str, str], result) -> None:
+        size = estimate_size(result)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self.size -= self._entries.pop(key)[1]
+            self._entries[key] = (result, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.size -= evicted
+
+    def invalidate(self, stage: str | None = None) -> None:
+        """Drop every entry, or only those of ``stage``."""
+        with self._lock:
+            for key in [key for key in self._entries if stage is None or key[0] == stage]:
+                self.size -= self._entries.pop(key)[1]
+
+    def info(self) -> dict:
+        return {"entries": len(self._entries), "bytes": self.size, "max_bytes": self.max_bytes,
+                "hits": self.hits, "misses": self.misses}
+
+
+_default_cache: StageCache | None = None
+_default_lock = threading.Lock()
+
+
+def default_cache() -> StageCache:
+    """Process-wide cache shared by the app pages (``QPCR_CACHE_MB`` sets the budget)."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = StageCache(int(float(os.environ.get("QPCR_CACHE_MB", DEFAULT_CACHE_MB)) * 1024 ** 2))
+        return _default_cache
+
+
+def cached_stage(stage: str, func, *args, **kwargs):
+    """Run ``func`` through the ``default_cache`` under ``stage``."""
+    return default_cache().get_or_compute(stage, func, *args, **kwargs)
@@ -0,0 +1,190 @@
+"""``qpcr-run``: batch analysis of many plates without the web UI."""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+from qpcr.contrasts import contrast_table
+from qpcr.efficiency import fit_standard_curves, gene_amplification, pfaffl_ratio
+from qpcr.ingest import default_workers, ingest_plates
+from qpcr.io import discover_plates, read_groups, read_manifest
+from qpcr.normalization import safe_group_name
+from qpcr.outliers import METHODS
+from qpcr.pipeline import analyze
+from qpcr.project import DEFAULT_PROJECT_PATH, ProjectStore
+from qpcr.stats import DEFAULT_RESAMPLES, anova, contrast_statistics
+from qpcr.storage import write_table
+from qpcr.streaming import DEFAULT_CHUNK_ROWS, read_store, stream_ingest
+
+
+def _split_list(value: str) -> list[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _contrast_list(value: str) -> list[tuple[str, str]] | str:
+    if value.strip().lower() == "all":
+        return "all"
+    pairs = [item.split(":") for item in _split_list(value)]
+    if any(len(pair) != 2 or not all(name.strip() for name in pair) for pair in pairs):
+        raise argparse.ArgumentTypeError("expected 'all' or TREATMENT:CONTROL pairs separated by commas")
+    return [(treatment.strip(), control.strip()) for treatment, control in pairs]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="qpcr-run",
+        description="Merge plates and compute mean Cq, ΔCt and ΔΔCt / fold change end to end.",
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--plates", metavar="DIR",
+                        help="directory of <plate>_Cq.csv, <plate>_Genes.csv and <plate>_Samples.csv files")
+    source.add_argument("--manifest", metavar="CSV",
+                        help="CSV with Plate, Cq, Genes, Samples columns (paths relative to the manifest)")
+    parser.add_argument("--groups", required=True, metavar="CSV", help="groups.csv mapping Sample to Group")
+    parser.add_argument("--housekeeping", required=True, type=_split_list, metavar="GENES",
+                        help="comma-separated housekeeping genes")
+    parser.add_argument("--control", required=True, metavar="GROUP", help="control group for ΔΔCt")
+    parser.add_argument("--analyze-groups", type=_split_list, default=None, metavar="GROUPS",
+                        help="comma-separated groups to keep in the ΔΔCt table (default: all)")
+    parser.add_argument("--contrasts", type=_contrast_list, default=None, metavar="SPEC",
+                        help="also write one ΔΔCt table for several contrasts: 'all', or TREATMENT:CONTROL,...")
+    parser.add_argument("--stats", action="store_true",
+                        help="write Welch t-tests with FDR and bootstrap fold-change intervals for the contrasts "
+                             "(default: every group vs --control), plus one-way ANOVA per gene")
+    parser.add_argument("--resamples", type=int, default=DEFAULT_RESAMPLES,
+                        help=f"with --stats, bootstrap resamples; 0 skips the intervals (default: {DEFAULT_RESAMPLES})")
+    parser.add_argument("--seed", type=int, default=0, help="with --stats, bootstrap random seed (default: 0)")
+    parser.add_argument("--efficiency", action="store_true",
+                        help="fit standard curves from wells with a starting quantity (SQ) and write Pfaffl ratios")
+    parser.add_argument("--min-r2", type=float, default=0.98,
+                        help="with --efficiency, ignore standard curves with a lower R² (default: 0.98)")
+    parser.add_argument("--threshold", type=float, default=None,
+                        help="remove Sample-Gene pairs whose replicate Cq spread exceeds this value")
+    parser.add_argument("--auto-curate", choices=METHODS, default=None, metavar="METHOD",
+                        help=f"with --threshold, remove only the outlier well where {'/'.join(METHODS)} identifies one")
+    parser.add_argument("--no-amp-cq", type=float, default=None,
+                        help="with --auto-curate, treat Cq at or above this value as no amplification")
+    parser.add_argument("--workers", type=int, default=None,
+                        help=f"processes used to read and merge plates (default: {default_workers()})")
+    parser.add_argument("--stream", action="store_true",
+                        help="read Cq exports in chunks and write merged plates one at a time to a Parquet store "
+                             "(<output-dir>/Merged_qPCR_Data/), keeping memory bounded for very large studies")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS,
+                        help=f"with --stream, Cq export rows parsed at a time (default: {DEFAULT_CHUNK_ROWS})")
+    parser.add_argument("--study", metavar="NAME",
+                        help="also save the merged wells, results and settings as this study in the project store")
+    parser.add_argument("--project", default=DEFAULT_PROJECT_PATH, metavar="DB",
+                        help=f"with --study, project store database (default: {DEFAULT_PROJECT_PATH})")
+    parser.add_argument("--output-dir", default="./results", help="where result tables are written")
+    parser.add_argument("--csv", action="store_true", help="also export the result tables as CSV")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    try:
+        plate_files = discover_plates(args.plates) if args.plates else read_manifest(args.manifest)
+        groups_df = read_groups(args.groups)
+    except (OSError, ValueError) as exc:
+        print(f"❌ {exc}", file=sys.stderr)
+        return 1
+    if not plate_files:
+        print("❌ No plate files found.", file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    merged_path = os.path.join(args.output_dir, "Merged_qPCR_Data")
+    if args.stream:
+        try:
+            summary = stream_ingest(plate_files, groups_df, merged_path, chunk_rows=args.chunk_rows)
+        except (OSError, ValueError) as exc:
+            print(f"❌ {exc}", file=sys.stderr)
+            return 1
+        merged_data = read_store(merged_path, list(plate_files))
+    else:
+        merged_data, summary = ingest_plates(plate_files, groups_df, workers=args.workers)
+    loaded = time.perf_counter()
+
+    try:
+        results = analyze(
+            merged_data,
+            summary,
+            housekeeping_genes=args.housekeeping,
+            control_group=args.control,
+            threshold=args.threshold,
+            selected_groups=args.analyze_groups,
+            outlier_method=args.auto_curate,
+            no_amp_cq=args.no_amp_cq,
+        )
+        if args.contrasts is not None:
+            contrasts = None if args.contrasts == "all" else args.contrasts
+            contrast_df = contrast_table(results["normalized_qPCR_df"], contrasts)
+        if args.stats:
+            normalized_df = results["normalized_qPCR_df"]
+            if args.contrasts is None:
+                contrasts = [(group, args.control) for group in normalized_df["Group"].dropna().unique()
+                             if group != args.control]
+            statistics_df = contrast_statistics(normalized_df, contrasts, n_resamples=args.resamples,
+                                                seed=args.seed, workers=args.workers or 1)
+            anova_df = anova(normalized_df)
+        if args.efficiency:
+            curves_df = fit_standard_curves(results["filtered_merged_data"])
+            pfaffl_df = pfaffl_ratio(results["mean_cq_df"], args.housekeeping, args.control,
+                                     amplification=gene_amplification(curves_df, args.min_r2),
+                                     selected_groups=args.analyze_groups)
+    except ValueError as exc:
+        print(f"❌ {exc}", file=sys.stderr)
+        return 1
+    analyzed = time.perf_counter()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    fold_change_path = os.path.join(
+        args.output_dir, f"DeltaDeltaCt_qPCR_relative_to_{safe_group_name(args.control)}"
+    )
+    tables = [(merged_path, results["merged_data"]), (fold_change_path, results["fold_change_qPCR_df"])]
+    if args.contrasts is not None:
+        tables.append((os.path.join(args.output_dir, "DeltaDeltaCt_qPCR_contrasts"), contrast_df))
+    if args.stats:
+        tables.append((os.path.join(args.output_dir, "Statistics_qPCR_contrasts"), statistics_df))
+        tables.append((os.path.join(args.output_dir, "ANOVA_qPCR"), anova_df))
+    if args.efficiency:
+        tables.append((os.path.join(args.output_dir, "Standard_Curves"), curves_df))
+        tables.append((os.path.join(args.output_dir, f"Pfaffl_qPCR_relative_to_{safe_group_name(args.control)}"),
+                       pfaffl_df))
+    written = [merged_path] if args.stream else []
+    for path, df in tables:
+        # With --stream the merged wells are already in the Parquet store
+        if not (args.stream and path == merged_path):
+            written.append(write_table(df, f"{path}.parquet"))
+        if args.csv:
+            df.to_csv(f"{path}.csv", index=False)
+            written.append(f"{path}.csv")
+
+    if args.study:
+        # Same keys as the app's session state, so the study can be reopened in the app
+        analysis = {**results, "control_group": args.control, "selected_groups": args.analyze_groups}
+        if args.contrasts is not None:
+            analysis.update(contrast_qPCR_df=contrast_df, contrasts=contrasts)
+        if args.stats:
+            analysis.update(statistics_qPCR_df=statistics_df, anova_qPCR_df=anova_df)
+        if args.efficiency:
+            analysis["pfaffl_qPCR_df"] = pfaffl_df
+        ProjectStore(args.project).save_analysis(args.study, analysis, groups_df=groups_df)
+        written.append(f"{args.project} (study '{args.study}')")
+    finished = time.perf_counter()
+
+    n_plates = len(plate_files)
+    elapsed = finished - start
+    if results["missing_genes"]:
+        print(f"⚠️ Missing housekeeping genes: {', '.join(results['missing_genes'])}")
+    actions = [decision["action"] for decision in results["user_decisions"].values()]
+    print(f"📌 Plates: {n_plates}, wells: {len(results['merged_data'])}, "
+          f"outlier wells removed: {actions.count('Remove Specific')}, pairs removed: {actions.count('Remove All')}")
+    print(f"⏱ load & merge {loaded - start:.2f}s, analyze {analyzed - loaded:.2f}s, write {finished - analyzed:.2f}s")
+    print(f"🚀 Throughput: {n_plates / elapsed:.1f} plates/s")
+    print(f"✅ Wrote {', '.join(written)}")
+    return 0
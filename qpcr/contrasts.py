@@ -0,0 +1,102 @@
+"""ΔΔCt / fold change for many (treatment, control) contrasts in one pass.
+
+The mean ΔCt of every group and gene is computed once, as a
+``(n_groups, n_genes)`` reference matrix. Each contrast then only needs a
+lookup: a treatment or control pair's ΔΔCt is its ΔCt minus the control
+group's reference for that gene. All contrasts are returned as a single
+table with a categorical ``Contrast`` column.
+"""
+
+from __future__ import annotations
+
+from itertools import permutations
+
+import numpy as np
+import pandas as pd
+
+from qpcr.matrix import key_codes
+from qpcr.normalization import replace_infinite
+
+def contrast_name(treatment: str, control: str) -> str:
+    """Label of a contrast in the ``Contrast`` column."""
+    return f"{treatment} vs {control}"
+
+
+def all_contrasts(groups: list[str]) -> list[tuple[str, str]]:
+    """Every ordered ``(treatment, control)`` pair of distinct groups."""
+    return list(permutations(list(dict.fromkeys(groups)), 2))
+
+
+def group_reference_ct(normalized_df: pd.DataFrame) -> pd.DataFrame:
+    """Mean ΔCt (``Normalized_Cq``) of every group for every gene, as a Group × Gene frame."""
+    reference, groups, genes = _reference_matrix(replace_infinite(normalized_df))
+    return pd.DataFrame(reference, index=pd.Index(groups, name="Group"), columns=pd.Index(genes, name="Gene"))
+
+
+def _reference_matrix(df: pd.DataFrame) -> tuple[np.ndarray, pd.Index, pd.Index]:
+    group_codes, groups = key_codes(df["Group"])
+    gene_codes, genes = key_codes(df["Gene"])
+    delta = df["Normalized_Cq"].to_numpy(dtype=float)
+
+    valid = (group_codes >= 0) & (gene_codes >= 0) & np.isfinite(delta)
+    cells = group_codes[valid] * len(genes) + gene_codes[valid]
+    size = len(groups) * len(genes)
+    sums = np.bincount(cells, weights=delta[valid], minlength=size)
+    counts = np.bincount(cells, minlength=size)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        reference = np.where(counts > 0, sums / counts, np.nan).reshape(len(groups), len(genes))
+    return reference, groups, genes
+
+
+def contrast_table(
+    normalized_df: pd.DataFrame,
+    contrasts: list[tuple[str, str]] | None = None,
+) -> pd.DataFrame:
+    """ΔΔCt and fold change for every ``(treatment, control)`` contrast at once.
+
+    Each contrast holds the treatment and control groups' rows of
+    ``normalized_df``, in their original order, with ``Reference_Ct`` (the
+    control group's mean ΔCt for the gene), ``Delta_Delta_Ct`` and
+    ``Fold_Change``; so a contrast's rows match
+    ``delta_delta_ct(normalized_df, control, [treatment])``. ``contrasts``
+    defaults to ``all_contrasts`` of the groups present. Raises ``ValueError``
+    for a contrast naming an unknown group.
+    """
+    df = replace_infinite(normalized_df).reset_index(drop=True)
+    reference, groups, _ = _reference_matrix(df)
+    group_codes, _ = key_codes(df["Group"])
+    gene_codes, _ = key_codes(df["Gene"])
+    if contrasts is None:
+        contrasts = all_contrasts(groups[np.unique(group_codes[group_codes >= 0])].tolist())
+    contrasts = list(dict.fromkeys((treatment, control) for treatment, control in contrasts))
+
+    treatment_codes = groups.get_indexer([treatment for treatment, _ in contrasts])
+    control_codes = groups.get_indexer([control for _, control in contrasts])
+    unknown = [name for pair in contrasts for name in pair if name not in groups]
+    if unknown:
+        raise ValueError(f"Unknown groups in contrasts: {', '.join(map(str, dict.fromkeys(unknown)))}")
+
+    # Rows of each group, in original order
+    order = np.argsort(group_codes, kind="stable")
+    bounds = np.searchsorted(group_codes[order], np.arange(len(groups) + 1))
+    group_rows = [order[bounds[code]:bounds[code + 1]] for code in range(len(groups))]
+
+    # One row index per (contrast, row); contrast k uses the reference of its control group
+    rows = [np.sort(np.concatenate([group_rows[t], group_rows[c]])) if t != c else group_rows[c]
+            for t, c in zip(treatment_codes, control_codes)]
+    contrast_ids = np.repeat(np.arange(len(contrasts)), [len(r) for r in rows])
+    rows = np.concatenate(rows) if rows else np.array([], dtype=int)
+
+    reference_ct = reference[control_codes[contrast_ids], gene_codes[rows]]
+    delta_delta = df["Normalized_Cq"].to_numpy(dtype=float)[rows] - reference_ct
+
+    # ``take`` already returns a new frame, so columns are added in place rather than via more copies
+    table = df.take(rows)
+    table.index = pd.RangeIndex(len(table))
+    table.insert(0, "Contrast", pd.Categorical.from_codes(contrast_ids, [contrast_name(t, c) for t, c in contrasts]))
+    table.insert(1, "Treatment", pd.Categorical.from_codes(treatment_codes[contrast_ids], groups))
+    table.insert(2, "Control", pd.Categorical.from_codes(control_codes[contrast_ids], groups))
+    table["Reference_Ct"] = reference_ct
+    table["Delta_Delta_Ct"] = delta_delta
+    table["Fold_Change"] = 2 ** (-delta_delta)
+    return table
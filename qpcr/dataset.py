@@ -0,0 +1,106 @@
+"""Canonical compact schema for merged well-level data.
+
+One row per non-empty well::
+
+    Plate       category   plate name
+    Well_Index  uint16     row * n_cols + (col - 1), see ``qpcr.layout``
+    Well        category   ``A1``-style label
+    Sample      category
+    Gene        category
+    Group       category   NaN if the sample has no group
+    Cq          float32    NaN if the well did not amplify
+    SQ          float32    optional: starting quantity of standard-curve wells
+
+Keys are dictionary-encoded, so a million wells cost a few bytes per key
+instead of a Python string each. Stages read this frame without copying it;
+anything that needs a different layout builds a new frame.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from qpcr.layout import PLATE_FORMATS, well_index
+
+CANONICAL_COLUMNS = ["Plate", "Well_Index", "Well", "Sample", "Gene", "Group", "Cq"]
+CATEGORY_COLUMNS = ["Plate", "Well", "Sample", "Gene", "Group"]
+CANONICAL_DTYPES = {
+    **{column: "category" for column in CATEGORY_COLUMNS},
+    "Well_Index": np.uint16,
+    "Cq": np.float32,
+}
+OPTIONAL_DTYPES = {"SQ": np.float32}
+
+# Names of the starting quantity column in Cq exports
+SQ_COLUMNS = ["Starting Quantity (SQ)", "SQ"]
+
+
+def _infer_n_wells(wells) -> int:
+    for n_wells in sorted(PLATE_FORMATS):
+        if (well_index(wells, n_wells) >= 0).all():
+            return n_wells
+    raise ValueError("Well labels do not fit a 384-well plate")
+
+
+def canonical_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """``df`` in the canonical schema.
+
+    Accepts frames in the old merged layout too (``Row_x``/``Column_x``/
+    ``Row_y``/``Column_y`` duplicates, object keys, no ``Well_Index``), e.g.
+    a ``Merged_qPCR_Data.csv`` written by earlier versions. A frame that is
+    already canonical is returned as is.
+    """
+    optional = [column for column in OPTIONAL_DTYPES if column in df.columns]
+    dtypes = {**CANONICAL_DTYPES, **{column: OPTIONAL_DTYPES[column] for column in optional}}
+    if list(df.columns) == CANONICAL_COLUMNS + optional and all(
+        str(df[column].dtype) == str(dtype) for column, dtype in dtypes.items()
+    ):
+        return df
+
+    columns = {column: df[column] for column in CANONICAL_COLUMNS + optional if column in df.columns}
+    if "Well_Index" not in columns:
+        wells = df["Well"].astype(object)
+        columns["Well_Index"] = well_index(wells, _infer_n_wells(wells))
+    for column in ["Plate", "Group"]:
+        columns.setdefault(column, pd.Series(np.nan, index=df.index, dtype=object))
+
+    return pd.DataFrame(columns, index=df.index)[CANONICAL_COLUMNS + optional].astype(dtypes)
+
+
+def empty_frame() -> pd.DataFrame:
+    """A canonical frame with no wells (the right columns and dtypes)."""
+    return pd.DataFrame({column: pd.Series(dtype=CANONICAL_DTYPES[column]) for column in CANONICAL_COLUMNS})
+
+
+def concat_frames(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate canonical frames, unioning their categories so keys stay categorical.
+
+    ``pd.concat`` falls back to object dtype when categories differ between
+    frames, which would undo the compact encoding for multi-plate data. No
+    frames give an empty canonical frame.
+    """
+    frames = list(frames)
+    if not frames:
+        return empty_frame()
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True)
+
+    dtypes = {
+        column: pd.CategoricalDtype(
+            union_categoricals([frame[column] for frame in frames], sort_categories=True).categories
+        )
+        for column in CATEGORY_COLUMNS
+        if column in frames[0].columns
+    }
+    combined = pd.concat([frame.astype(dtypes) for frame in frames], ignore_index=True)
+
+    # Plates without standards have no SQ column; the gap is NaN, still float32
+    optional = {column: dtype for column, dtype in OPTIONAL_DTYPES.items() if column in combined.columns}
+    return combined.astype(optional) if optional else combined
+
+
+def memory_per_million_wells(df: pd.DataFrame) -> float:
+    """Deep memory footprint of ``df`` scaled to one million rows, in MB."""
+    return df.memory_usage(index=True, deep=True).sum() / max(len(df), 1) * 1e6 / 1024 ** 2
@@ -0,0 +1,125 @@
+"""Amplification efficiency from standard curves and Pfaffl efficiency-corrected ratios.
+
+Standard-curve wells carry a starting quantity (``SQ``). For every curve,
+e.g. every (Plate, Gene), Cq is regressed on log10(SQ) by least squares; the
+per-curve sums are accumulated with ``np.bincount`` so all curves are fitted
+at once, with no loop over genes. A slope of -3.32 means an amplification
+factor of 2 (100% efficiency).
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from qpcr.matrix import SampleGeneMatrix, reference_ct
+
+DEFAULT_AMPLIFICATION = 2.0
+
+
+def fit_standard_curves(df: pd.DataFrame, by: list[str] | None = None) -> pd.DataFrame:
+    """Fit ``Cq = slope · log10(SQ) + intercept`` for every ``by`` group (default Plate, Gene).
+
+    Only wells with a positive ``SQ`` and a finite Cq are used; curves need
+    at least two distinct quantities. Returns one row per curve with
+    ``n_Points``, ``Slope``, ``Intercept``, ``R2``, ``Amplification``
+    (10^(-1/slope)) and ``Efficiency`` (% of perfect doubling).
+    """
+    by = ["Plate", "Gene"] if by is None else list(by)
+    if "SQ" not in df.columns:
+        curves = pd.DataFrame(columns=by + ["Slope", "Intercept", "R2", "Amplification", "Efficiency"], dtype=float)
+        curves.insert(len(by), "n_Points", pd.Series(dtype=int))
+        return curves
+
+    sq = df["SQ"].to_numpy(dtype=float)
+    cq = df["Cq"].to_numpy(dtype=float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        usable = (sq > 0) & np.isfinite(cq)
+    standards = df[usable]
+    x = np.log10(sq[usable])
+    y = cq[usable]
+
+    grouped = standards.groupby(by, sort=True, observed=True)
+    codes = grouped.ngroup().to_numpy()
+    n_curves = grouped.ngroups
+
+    # Per-curve sums for closed-form least squares
+    def total(values):
+        return np.bincount(codes, weights=values, minlength=n_curves)
+
+    n = np.bincount(codes, minlength=n_curves).astype(float)
+    sx, sy, sxx, sxy, syy = total(x), total(y), total(x * x), total(x * y), total(y * y)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sxx_c = sxx - sx * sx / n
+        sxy_c = sxy - sx * sy / n
+        syy_c = syy - sy * sy / n
+        slope = np.where(sxx_c > 1e-12, sxy_c / sxx_c, np.nan)
+        intercept = (sy - slope * sx) / n
+        r2 = np.where(syy_c > 0, sxy_c * sxy_c / (sxx_c * syy_c), np.nan)
+        amplification = 10 ** (-1 / slope)
+
+    curves = grouped.size().reset_index()[by]
+    curves["n_Points"] = n.astype(int)
+    curves["Slope"] = slope
+    curves["Intercept"] = intercept
+    curves["R2"] = r2
+    curves["Amplification"] = amplification
+    curves["Efficiency"] = (amplification - 1) * 100
+    return curves
+
+
+def gene_amplification(curves: pd.DataFrame, min_r2: float = 0.98) -> pd.Series:
+    """Mean amplification factor per gene over curves with ``R2 >= min_r2``."""
+    good = curves[(curves["R2"] >= min_r2) & np.isfinite(curves["Amplification"])]
+    return good.groupby("Gene", observed=True)["Amplification"].mean()
+
+
+def pfaffl_ratio(
+    mean_cq_df: pd.DataFrame,
+    housekeeping_genes: list[str],
+    control_group: str,
+    amplification: pd.Series | None = None,
+    selected_groups: list[str] | None = None,
+    default_amplification: float = DEFAULT_AMPLIFICATION,
+) -> pd.DataFrame:
+    """Efficiency-corrected expression ratios (Pfaffl) relative to ``control_group``.
+
+    For sample ``s`` and gene ``g`` with amplification factor ``A_g``, the
+    ratio is ``A_g ** (Cq_control,g - Cq_s,g)`` divided by the geometric mean
+    of the same term over the housekeeping genes, where ``Cq_control,g`` is
+    the control group's mean Cq. Genes missing from ``amplification`` use
+    ``default_amplification``; with every factor at 2 the ratio equals the
+    ΔΔCt fold change. Group selection works as in ``delta_delta_ct``.
+    """
+    df = mean_cq_df
+    if selected_groups is not None:
+        selected_groups = list(selected_groups)
+        if control_group not in selected_groups:
+            selected_groups.append(control_group)
+        df = df[df["Group"].isin(selected_groups)]
+    df = df.reset_index(drop=True)
+
+    matrix = SampleGeneMatrix(df, "Mean_Cq")
+    factors = np.full(len(matrix.genes), default_amplification)
+    if amplification is not None:
+        known = pd.Series(amplification, dtype=float).reindex(matrix.genes).to_numpy()
+        factors = np.where(np.isfinite(known), known, default_amplification)
+    log_factors = np.log(factors)
+
+    # log of A_g ** ΔCq for every Sample × Gene at once
+    control_cq = reference_ct(matrix.values, matrix.mask((df["Group"] == control_group).to_numpy(dtype=bool)))
+    log_terms = (control_cq[None, :] - matrix.values) * log_factors[None, :]
+    hk_columns = matrix.gene_columns(list(housekeeping_genes))
+    hk_valid = ~np.isnan(log_terms[:, hk_columns])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        log_reference = np.where(hk_valid, log_terms[:, hk_columns], 0).sum(axis=1) / hk_valid.sum(axis=1)
+
+    log_target = matrix.gather(log_terms)
+    log_reference = matrix.gather_samples(np.where(hk_valid.any(axis=1), log_reference, np.nan))
+    return df.assign(
+        Amplification=matrix.gather_genes(factors),
+        Control_Mean_Cq=matrix.gather_genes(control_cq),
+        Target_Ratio=np.exp(log_target),
+        Reference_Ratio=np.exp(log_reference),
+        Pfaffl_Ratio=np.exp(log_target - log_reference),
+    )
@@ -0,0 +1,132 @@
+"""Bulk export of every figure and result table into one ZIP, written incrementally.
+
+Entries are added one at a time and streamed to a file on disk, so at most one
+figure is in memory however many genes there are. PNGs come from the plot
+cache or the render pool and are copied in from disk; SVGs are drawn straight
+into their ZIP entry; a multi-page PDF per plot type is built page by page
+with ``PdfPages`` and each page's figure is cleared once saved. Tables are
+written as CSV entries chunk by chunk.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import zipfile
+
+import pandas as pd
+
+from qpcr.plot_cache import PlotCache
+from qpcr.workspace import atomic_path
+from qpcr.plotting import (
+    DEFAULT_DPI,
+    DEFAULT_PALETTE,
+    PLOT_KINDS,
+    gene_figure,
+    group_order,
+    group_palette,
+    iter_render_genes,
+    plot_filename,
+    split_genes,
+)
+
+EXPORT_FORMATS = ["png", "svg", "pdf"]
+
+# Rows per CSV chunk written into the archive
+_CSV_CHUNK_ROWS = 100_000
+
+
+def _write_table(archive: zipfile.ZipFile, name: str, df: pd.DataFrame) -> None:
+    with archive.open(f"tables/{name}.csv", "w", force_zip64=True) as entry:
+        text = io.TextIOWrapper(entry, encoding="utf-8", newline="")
+        for start in range(0, max(len(df), 1), _CSV_CHUNK_ROWS):
+            df.iloc[start:start + _CSV_CHUNK_ROWS].to_csv(text, index=False, header=start == 0)
+        text.flush()
+        text.detach()
+
+
+def _iter_figures(kind: str, plot_df: pd.DataFrame, palette: str):
+    """``(gene, figure)`` one at a time; the caller clears each figure before the next is drawn."""
+    order = group_order(plot_df)
+    colors = group_palette(order, palette)
+    for gene, frames in split_genes(kind, plot_df).items():
+        yield gene, gene_figure(kind, gene, frames, order, colors)
+
+
+def write_pdf(path_or_file, kind: str, plot_df: pd.DataFrame, palette: str = DEFAULT_PALETTE,
+              progress=None) -> None:
+    """Every gene's figure of ``kind`` as one page of a multi-page PDF."""
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    with PdfPages(path_or_file) as pdf:
+        for gene, fig in _iter_figures(kind, plot_df, palette):
+            pdf.savefig(fig, bbox_inches="tight")
+            fig.clear()
+            if progress is not None:
+                progress(gene)
+
+
+def export_bundle(
+    path: str,
+    plots: dict[str, pd.DataFrame],
+    tables: dict[str, pd.DataFrame] | None = None,
+    image_format: str = "png",
+    dpi: int = DEFAULT_DPI,
+    palette: str = DEFAULT_PALETTE,
+    workers: int | None = None,
+    cache: PlotCache | None = None,
+    progress=None,
+) -> str:
+    """Write ``plots`` (``{kind: plot_df}``) and ``tables`` (``{name: df}``) into a ZIP at ``path``.
+
+    ``image_format`` is ``"png"`` (one file per gene, rendered through
+    ``iter_render_genes`` and the ``cache``), ``"svg"`` (one vector file per
+    gene) or ``"pdf"`` (one multi-page PDF per plot kind). Figures go under
+    their ``PLOT_KINDS`` folder and tables under ``tables/``. The archive is
+    written to a temporary file and renamed, so ``path`` is never partial.
+    ``progress`` is called as ``progress(done, total)`` after each entry.
+    Raises ``ValueError`` for an unknown format.
+    """
+    if image_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{image_format}', expected one of {', '.join(EXPORT_FORMATS)}")
+    tables = tables or {}
+    total = len(tables) + sum(plot_df["Gene"].nunique() if image_format != "pdf" else 1 for plot_df in plots.values())
+    done = 0
+
+    def advance(*_):
+        nonlocal done
+        done += 1
+        if progress is not None:
+            progress(done, total)
+
+    with atomic_path(path) as tmp_path, zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for kind, plot_df in plots.items():
+            folder = PLOT_KINDS[kind][0]
+            if image_format == "png":
+                # PNGs are already compressed; copy the rendered files in without recompressing
+                for gene, image_path in iter_render_genes(kind, plot_df, dpi=dpi, palette=palette,
+                                                          workers=workers, cache=cache):
+                    archive.write(image_path, f"{folder}/{plot_filename(kind, gene)}",
+                                  compress_type=zipfile.ZIP_STORED)
+                    advance()
+            elif image_format == "svg":
+                for gene, fig in _iter_figures(kind, plot_df, palette):
+                    name = os.path.splitext(plot_filename(kind, gene))[0]
+                    with archive.open(f"{folder}/{name}.svg", "w", force_zip64=True) as entry:
+                        fig.savefig(entry, format="svg", bbox_inches="tight")
+                    fig.clear()
+                    advance()
+            else:
+                # PdfPages needs a seekable file, so each PDF is built on disk and then added
+                pdf_path = f"{tmp_path}.{folder}.pdf"
+                try:
+                    write_pdf(pdf_path, kind, plot_df, palette)
+                    archive.write(pdf_path, f"{folder}_plots.pdf")
+                finally:
+                    if os.path.exists(pdf_path):
+                        os.remove(pdf_path)
+                advance()
+        for name, df in tables.items():
+            _write_table(archive, name, df)
+            advance()
+    return path
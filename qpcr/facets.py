@@ -0,0 +1,175 @@
+"""A whole gene panel as one faceted figure.
+
+Instead of one figure per gene, N genes are drawn as a grid of axes in a
+single ``Figure`` that shares the group order and palette, with each facet
+scaled to its own data. Box-plot statistics and fold-change mean/SD are
+computed for all genes with one groupby each, and the facets are drawn with
+plain matplotlib calls (``bxp``, ``bar``, ``scatter``) rather than a seaborn
+call per gene. The figure lives on an Agg canvas and is cleared as soon as
+it is rendered, so memory does not grow with the number of panels drawn.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from qpcr.cache import content_hash
+from qpcr.plot_cache import PlotCache
+from qpcr.plotting import (
+    DEFAULT_DPI,
+    DEFAULT_PALETTE,
+    PLOT_COLUMNS,
+    PLOT_STYLE_VERSION,
+    agg_figure,
+    fold_change_summary,
+    group_order,
+    group_palette,
+    render_png,
+    write_bytes,
+)
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+DEFAULT_FACET_COLUMNS = 4
+
+# Facet height and figure margins, in inches
+_FACET_HEIGHT = 3.0
+_MARGIN_LEFT, _MARGIN_TOP, _MARGIN_BOTTOM = 0.9, 0.35, 1.3
+
+# Value column plotted for each kind
+_VALUES = {"delta_ct": "Neg_Delta_Ct", "fold_change": "Fold_Change"}
+
+
+def box_summary(plot_df: pd.DataFrame, value: str = "Neg_Delta_Ct") -> pd.DataFrame:
+    """Box-plot statistics per (Gene, Group): quartiles and 1.5·IQR whiskers clipped to the data."""
+    grouped = plot_df.groupby(["Gene", "Group"], observed=True)[value]
+    summary = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+    summary.columns = ["Q1", "Median", "Q3"]
+    iqr = summary["Q3"] - summary["Q1"]
+    bounds = pd.DataFrame({"Low": summary["Q1"] - 1.5 * iqr, "High": summary["Q3"] + 1.5 * iqr})
+
+    # Whiskers reach the most extreme values inside the bounds
+    rows = plot_df[["Gene", "Group", value]].join(bounds, on=["Gene", "Group"])
+    inside = rows[(rows[value] >= rows["Low"]) & (rows[value] <= rows["High"])]
+    whiskers = inside.groupby(["Gene", "Group"], observed=True)[value].agg(Whisker_Low="min", Whisker_High="max")
+    return summary.join(whiskers).reset_index()
+
+
+def facet_summaries(kind: str, plot_df: pd.DataFrame) -> dict:
+    """``{gene: summary rows}`` for every gene, from one groupby over the whole panel."""
+    summary = box_summary(plot_df) if kind == "delta_ct" else fold_change_summary(plot_df)
+    return dict(tuple(summary.groupby("Gene", observed=True, sort=False)))
+
+
+def _draw_facet(ax, kind: str, gene: str, gene_df: pd.DataFrame, summary: pd.DataFrame, order: pd.Index,
+                colors: list, jitter: np.random.Generator) -> None:
+    positions = order.get_indexer(summary["Group"])
+    values = gene_df[_VALUES[kind]].to_numpy(dtype=float)
+    points = order.get_indexer(gene_df["Group"]) + jitter.uniform(-0.15, 0.15, len(values))
+
+    if kind == "delta_ct":
+        stats = [{"med": row.Median, "q1": row.Q1, "q3": row.Q3, "whislo": row.Whisker_Low,
+                  "whishi": row.Whisker_High, "fliers": []} for row in summary.itertuples()]
+        boxes = ax.bxp(stats, positions=positions, widths=min(0.18 * len(order), 0.8), patch_artist=True,
+                       boxprops={"edgecolor": "black", "linewidth": 1.5}, medianprops={"color": "black"},
+                       manage_ticks=False)
+        for box, position in zip(boxes["boxes"], positions):
+            box.set_facecolor(colors[position])
+    else:
+        ax.bar(positions, summary["Fold_Change_Mean"], color=[colors[p] for p in positions], edgecolor="black",
+               linewidth=1.5, width=0.8)
+        ax.errorbar(positions, summary["Fold_Change_Mean"], yerr=summary["Fold_Change_SD"], fmt="none",
+                    ecolor="red", capsize=4, elinewidth=1.2)
+        ax.axhline(y=1, color="gray", linestyle="--")
+
+    ax.scatter(points, values, color="black", alpha=0.9, s=16, zorder=3)
+    ax.set_title(gene, fontsize=12, fontweight="bold", fontstyle="italic")
+    ax.spines["top"].set_visible(False)
+    ax.spines["right"].set_visible(False)
+    ax.spines["bottom"].set_linewidth(1.5)
+    ax.spines["left"].set_linewidth(1.5)
+
+
+def facet_figure(
+    kind: str,
+    plot_df: pd.DataFrame,
+    genes: list | None = None,
+    n_columns: int = DEFAULT_FACET_COLUMNS,
+    palette: str = DEFAULT_PALETTE,
+) -> Figure:
+    """``genes`` (default: all, in order of appearance) of ``plot_df`` as one grid of facets.
+
+    Facets share the x axis (group order and colors) and have their own y
+    scale. The figure is on an Agg canvas, not registered with ``pyplot``.
+    """
+    plot_df = plot_df[plot_df["Gene"].isin(genes)] if genes is not None else plot_df
+    by_gene = dict(tuple(plot_df.groupby("Gene", observed=True, sort=False)))
+    genes = [gene for gene in (genes if genes is not None else by_gene) if gene in by_gene]
+    summaries = facet_summaries(kind, plot_df)
+    order = pd.Index(group_order(plot_df))
+    colors = list(group_palette(order.tolist(), palette).values())
+
+    n_columns = max(1, min(n_columns, len(genes) or 1))
+    n_rows = max(1, math.ceil(len(genes) / n_columns))
+    facet_width = max(3.0, 0.6 * len(order) + 1.2)
+    width, height = facet_width * n_columns, _FACET_HEIGHT * n_rows + _MARGIN_TOP + _MARGIN_BOTTOM
+    fig = agg_figure((width, height))
+    # Fixed margins in inches instead of tight_layout, which re-measures every facet's text
+    fig.subplots_adjust(left=_MARGIN_LEFT / width, right=1 - 0.1 / width, bottom=_MARGIN_BOTTOM / height,
+                        top=1 - _MARGIN_TOP / height, wspace=0.35, hspace=0.35)
+    axes = fig.subplots(n_rows, n_columns, sharex=True, squeeze=False).ravel()
+
+    jitter = np.random.default_rng(0)
+    for ax, gene in zip(axes, genes):
+        _draw_facet(ax, kind, gene, by_gene[gene], summaries[gene], order, colors, jitter)
+    for ax in axes[len(genes):]:
+        ax.set_visible(False)
+
+    # Group labels once, under the lowest drawn facet of each column
+    axes[0].set_xticks(np.arange(len(order)))
+    axes[0].set_xlim(-0.6, len(order) - 0.4)
+    for column in range(min(n_columns, len(genes))):
+        ax = axes[column + (len(genes) - 1 - column) // n_columns * n_columns]
+        ax.tick_params(axis="x", labelbottom=True, labelrotation=45)
+        ax.set_xticklabels([str(group) for group in order], ha="right")
+    fig.supylabel("-ΔCt (expression)" if kind == "delta_ct" else "Fold change", fontsize=14,
+                  x=0.15 / width)
+    return fig
+
+
+def facet_key(kind: str, plot_df: pd.DataFrame, genes: list, n_columns: int, palette: str, dpi: int) -> str:
+    """Cache key of a faceted panel: the panel's plotted data plus the layout and style."""
+    panel = plot_df.loc[plot_df["Gene"].isin(genes), ["Gene"] + PLOT_COLUMNS[kind]].reset_index(drop=True)
+    return content_hash(PLOT_STYLE_VERSION, "facets", kind, [str(gene) for gene in genes], panel,
+                        [str(group) for group in group_order(panel)], int(n_columns), palette, int(dpi))
+
+
+def render_facets(
+    kind: str,
+    plot_df: pd.DataFrame,
+    genes: list | None = None,
+    n_columns: int = DEFAULT_FACET_COLUMNS,
+    dpi: int = DEFAULT_DPI,
+    palette: str = DEFAULT_PALETTE,
+    cache: PlotCache | None = None,
+) -> bytes | str:
+    """PNG of the faceted panel: a path in ``cache`` when given, else the PNG bytes.
+
+    The figure is cleared right after rendering.
+    """
+    genes = plot_df["Gene"].unique().tolist() if genes is None else list(genes)
+    if cache is None:
+        return render_png(facet_figure(kind, plot_df, genes, n_columns, palette), dpi, tight=False)
+    key = facet_key(kind, plot_df, genes, n_columns, palette, dpi)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    fig = facet_figure(kind, plot_df, genes, n_columns, palette)
+    path = write_bytes(render_png(fig, dpi, tight=False), cache.path(key))
+    cache.evict(keep={key})
+    return path
@@ -0,0 +1,245 @@
+"""Incremental pipeline: add, replace or remove single plates without a full rerun.
+
+Each plate contributes per Sample-Gene partial sums (Cq sum, Cq count, wells).
+When a plate changes, only its pairs are re-aggregated into mean Cq, only the
+samples whose housekeeping pairs changed get a new housekeeping mean, and only
+the genes whose control-group ΔCt changed get a new reference ΔCt. The tables
+match ``mean_cq`` → ``delta_ct`` → ``delta_delta_ct`` on the merged plates, up
+to float rounding in the running sums.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from qpcr.dataset import concat_frames
+from qpcr.plates import merge_plate
+from qpcr.replicates import GROUP_KEYS, apply_decisions
+
+_SUM_COLUMNS = ["Cq_sum", "Cq_count", "n_Wells"]
+_TABLE_COLUMNS = ["Group"] + _SUM_COLUMNS + [
+    "Mean_Cq", "Housekeeping_Mean_Cq", "Normalized_Cq", "Reference_Ct", "Delta_Delta_Ct", "Fold_Change",
+]
+
+
+def _partials(merged_df: pd.DataFrame) -> pd.DataFrame:
+    """Per Sample-Gene Cq sum / count / well count of one plate (plain string keys)."""
+    partial = merged_df.assign(Cq=merged_df["Cq"].astype(float)).groupby(GROUP_KEYS, sort=True, observed=True).agg(
+        Group=("Group", "first"),
+        Cq_sum=("Cq", "sum"),
+        Cq_count=("Cq", "count"),
+        n_Wells=("Cq", "size"),
+    )
+    # Plates have different categories; the running table is keyed by plain strings
+    partial.index = pd.MultiIndex.from_arrays(
+        [partial.index.get_level_values(key).astype(object) for key in GROUP_KEYS], names=GROUP_KEYS
+    )
+    partial["Group"] = partial["Group"].astype(object)
+    return partial
+
+
+def _categorical_keys(df: pd.DataFrame) -> pd.DataFrame:
+    """Result tables use categorical keys, like the full pipeline's."""
+    return df.astype({"Sample": "category", "Gene": "category", "Group": "category"})
+
+
+class IncrementalPipeline:
+    """Mean Cq, ΔCt and ΔΔCt tables kept up to date as plates change.
+
+    ``housekeeping_genes`` and ``control_group`` may be set later with
+    ``configure``; until then only mean Cq is maintained. ``user_decisions``
+    (the review page's removals) are applied to every plate as it is added.
+    """
+
+    def __init__(
+        self,
+        groups_df: pd.DataFrame,
+        housekeeping_genes: list[str] | None = None,
+        control_group: str | None = None,
+        user_decisions: dict | None = None,
+    ):
+        self.groups_df = groups_df
+        self.housekeeping_genes = list(housekeeping_genes or [])
+        self.control_group = control_group
+        self.user_decisions = dict(user_decisions or {})
+
+        self.raw_plates: dict[str, pd.DataFrame] = {}
+        self.plates: dict[str, pd.DataFrame] = {}
+        self.summary: dict[str, dict] = {}
+        self._partials: dict[str, pd.DataFrame] = {}
+        self._table = pd.DataFrame(
+            columns=_TABLE_COLUMNS,
+            index=pd.MultiIndex.from_arrays([[], []], names=GROUP_KEYS),
+        ).astype({column: float for column in _TABLE_COLUMNS if column != "Group"})
+        self._hk_mean = pd.Series(dtype=float)
+        self._reference = pd.Series(dtype=float)
+        self.last_update: dict = {}
+
+    # Plate changes
+
+    def set_plate(self, plate: str, cq_df: pd.DataFrame, genes_df: pd.DataFrame, samples_df: pd.DataFrame) -> dict:
+        """Merge and add (or replace) one plate; returns what was recomputed."""
+        merged_df, summary = merge_plate(cq_df, genes_df, samples_df, self.groups_df, plate)
+        return self.set_merged_plate(plate, merged_df, summary)
+
+    def set_merged_plate(self, plate: str, merged_df: pd.DataFrame, summary: dict | None = None) -> dict:
+        """Add (or replace) one already merged plate; returns what was recomputed."""
+        old = self._partials.pop(plate, None)
+        filtered_df = apply_decisions(merged_df, self.user_decisions)
+        new = _partials(filtered_df)
+
+        self.raw_plates[plate] = merged_df
+        self.plates[plate] = filtered_df
+        self._partials[plate] = new
+        if summary is not None:
+            self.summary[plate] = summary
+
+        if old is not None:
+            self._accumulate(old, -1)
+        self._accumulate(new, 1)
+        affected = new.index if old is None else old.index.union(new.index)
+        return self._refresh(affected)
+
+    def remove_plate(self, plate: str) -> dict:
+        """Drop a plate; returns what was recomputed."""
+        old = self._partials.pop(plate)
+        del self.raw_plates[plate], self.plates[plate]
+        self.summary.pop(plate, None)
+        self._accumulate(old, -1)
+        return self._refresh(old.index)
+
+    def set_user_decisions(self, user_decisions: dict) -> dict:
+        """Re-apply replicate removals; only plates whose kept wells change are updated."""
+        self.user_decisions = dict(user_decisions)
+        affected = pd.MultiIndex.from_arrays([[], []], names=GROUP_KEYS)
+        for plate, merged_df in self.raw_plates.items():
+            filtered_df = apply_decisions(merged_df, self.user_decisions)
+            if len(filtered_df) == len(self.plates[plate]) and filtered_df.index.equals(self.plates[plate].index):
+                continue
+            old, new = self._partials[plate], _partials(filtered_df)
+            self.plates[plate], self._partials[plate] = filtered_df, new
+            self._accumulate(old, -1)
+            self._accumulate(new, 1)
+            affected = affected.union(old.index.union(new.index))
+        return self._refresh(affected)
+
+    def configure(self, housekeeping_genes: list[str] | None = None, control_group: str | None = None) -> dict:
+        """Change housekeeping genes and/or control group; refreshes ΔCt / ΔΔCt only if they changed."""
+        hk_changed = housekeeping_genes is not None and list(housekeeping_genes) != self.housekeeping_genes
+        control_changed = control_group is not None and control_group != self.control_group
+        if hk_changed:
+            self.housekeeping_genes = list(housekeeping_genes)
+        if control_changed:
+            self.control_group = control_group
+        if not (hk_changed or control_changed):
+            return {"pairs": 0, "samples": 0, "genes": 0}
+
+        table = self._table
+        samples = table.index.get_level_values("Sample").unique() if hk_changed else pd.Index([])
+        genes = table.index.get_level_values("Gene").unique()
+        return self._refresh_downstream(np.zeros(len(table), dtype=bool), samples, extra_genes=genes)
+
+    # Internals
+
+    def _accumulate(self, partial: pd.DataFrame, sign: int) -> None:
+        table = self._table
+        new_pairs = partial.index.difference(table.index)
+        if sign > 0 and len(new_pairs):
+            added = pd.DataFrame(np.nan, index=new_pairs, columns=_TABLE_COLUMNS)
+            added[_SUM_COLUMNS] = 0.0
+            added["Group"] = partial.loc[new_pairs, "Group"].to_numpy(dtype=object)
+            table = pd.concat([table, added.astype(table.dtypes.to_dict())]).sort_index()
+        table.loc[partial.index, _SUM_COLUMNS] += sign * partial[_SUM_COLUMNS].to_numpy(dtype=float)
+        self._table = table
+
+    def _refresh(self, affected: pd.MultiIndex) -> dict:
+        table = self._table
+
+        # Pairs no longer on any plate
+        gone = table["n_Wells"].to_numpy() <= 0
+        gone_pairs = table.index[gone]
+        gone_control_genes = gone_pairs.get_level_values("Gene")[
+            (table["Group"].to_numpy()[gone] == self.control_group)
+        ] if self.control_group is not None else pd.Index([])
+        if gone.any():
+            table = table[~gone]
+            self._table = table
+
+        # Mean Cq for affected pairs only
+        changed = table.index.isin(affected)
+        counts = table["Cq_count"].to_numpy()[changed]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            table.loc[changed, "Mean_Cq"] = np.where(counts > 0, table["Cq_sum"].to_numpy()[changed] / counts, np.nan)
+
+        hk_pairs = affected[affected.get_level_values("Gene").isin(self.housekeeping_genes)]
+        hk_samples = hk_pairs.get_level_values("Sample").unique()
+        return self._refresh_downstream(changed, hk_samples, extra_genes=gone_control_genes)
+
+    def _refresh_downstream(self, changed: np.ndarray, hk_samples: pd.Index, extra_genes: pd.Index) -> dict:
+        table = self._table
+        samples = table.index.get_level_values("Sample")
+        genes = table.index.get_level_values("Gene")
+
+        if not self.housekeeping_genes or self.control_group is None:
+            self.last_update = {"pairs": int(changed.sum()), "samples": 0, "genes": 0}
+            return self.last_update
+
+        # Housekeeping mean for samples whose housekeeping pairs changed
+        if len(hk_samples):
+            hk_rows = table[genes.isin(self.housekeeping_genes) & samples.isin(hk_samples)]
+            hk_mean = hk_rows.groupby(level="Sample")["Mean_Cq"].mean().reindex(hk_samples)
+            self._hk_mean = pd.concat([self._hk_mean.drop(hk_samples, errors="ignore"), hk_mean])
+            changed = changed | samples.isin(hk_samples)
+
+        table.loc[changed, "Housekeeping_Mean_Cq"] = self._hk_mean.reindex(samples[changed]).to_numpy()
+        normalized = (table["Mean_Cq"].to_numpy()[changed] - table["Housekeeping_Mean_Cq"].to_numpy()[changed])
+        table.loc[changed, "Normalized_Cq"] = np.where(np.isinf(normalized), np.nan, normalized)
+
+        # Reference ΔCt for genes whose control-group ΔCt changed
+        control = table["Group"].to_numpy() == self.control_group
+        ref_genes = genes[changed & control].unique().union(pd.Index(extra_genes).unique())
+        if len(ref_genes):
+            ref_rows = control & genes.isin(ref_genes)
+            reference = table.loc[ref_rows, "Normalized_Cq"].groupby(level="Gene").mean().reindex(ref_genes)
+            self._reference = pd.concat([self._reference.drop(ref_genes, errors="ignore"), reference])
+            changed = changed | genes.isin(ref_genes)
+
+        table.loc[changed, "Reference_Ct"] = self._reference.reindex(genes[changed]).to_numpy()
+
+        delta_delta = table["Normalized_Cq"].to_numpy()[changed] - table["Reference_Ct"].to_numpy()[changed]
+        table.loc[changed, "Delta_Delta_Ct"] = delta_delta
+        table.loc[changed, "Fold_Change"] = 2 ** (-delta_delta)
+
+        self.last_update = {"pairs": int(changed.sum()), "samples": len(hk_samples), "genes": len(ref_genes)}
+        return self.last_update
+
+    # Results, in the same layout as the full pipeline
+
+    @property
+    def merged_data(self) -> pd.DataFrame:
+        return concat_frames(self.raw_plates.values())
+
+    @property
+    def filtered_merged_data(self) -> pd.DataFrame:
+        return concat_frames(self.plates.values())
+
+    @property
+    def mean_cq_df(self) -> pd.DataFrame:
+        return _categorical_keys(self._table[["Mean_Cq", "Group"]].reset_index())
+
+    @property
+    def normalized_df(self) -> pd.DataFrame:
+        return _categorical_keys(
+            self._table[["Mean_Cq", "Group", "Housekeeping_Mean_Cq", "Normalized_Cq"]].reset_index()
+        )
+
+    def fold_change_df(self, selected_groups: list[str] | None = None) -> pd.DataFrame:
+        """ΔΔCt table, optionally limited to ``selected_groups`` (control always kept)."""
+        columns = ["Mean_Cq", "Group", "Housekeeping_Mean_Cq", "Normalized_Cq",
+                   "Reference_Ct", "Delta_Delta_Ct", "Fold_Change"]
+        fold_change = _categorical_keys(self._table[columns].reset_index())
+        if selected_groups is not None:
+            fold_change = fold_change[fold_change["Group"].isin(list(selected_groups) + [self.control_group])]
+            fold_change = fold_change.reset_index(drop=True)
+        return fold_change
@@ -0,0 +1,105 @@
+"""Parallel plate ingestion: parse and merge plates across a process pool."""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from qpcr.dataset import concat_frames
+from qpcr.io import read_plate
+from qpcr.plates import merge_plate
+
+# Set once per worker by the pool initializer so groups are pickled per worker, not per plate
+_worker_groups: pd.DataFrame | None = None
+
+
+def _init_worker(groups_df: pd.DataFrame) -> None:
+    global _worker_groups
+    _worker_groups = groups_df
+
+
+def _ingest_one(plate: str, files: dict[str, str]) -> tuple[str, pd.DataFrame, dict]:
+    plate_frames = read_plate(files)
+    merged_df, summary = merge_plate(
+        plate_frames["Cq"], plate_frames["genes"], plate_frames["samples"], _worker_groups, plate
+    )
+    return plate, merged_df, summary
+
+
+def default_workers() -> int:
+    """Number of usable CPUs for this process."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def pool_context():
+    """Start method for worker pools: forkserver (spawn where unavailable), never fork.
+
+    Pools are created from the threaded app server, and forking a threaded
+    process can deadlock. Workers receive their data through pool
+    initializers, so nothing relies on fork's copy of the parent.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def iter_ingest_plates(
+    plate_files: dict[str, dict[str, str]],
+    groups_df: pd.DataFrame,
+    workers: int | None = None,
+):
+    """Yield ``(plate, merged_df, summary)`` for each plate as soon as it is merged.
+
+    Plates are read and merged in ``workers`` processes (all CPUs when ``None``);
+    with ``workers=1`` everything runs in the calling process. Results arrive in
+    completion order, not ``plate_files`` order.
+    """
+    workers = workers or default_workers()
+
+    if workers <= 1 or len(plate_files) <= 1:
+        _init_worker(groups_df)
+        for plate, files in plate_files.items():
+            yield _ingest_one(plate, files)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(plate_files)),
+        mp_context=pool_context(),
+        initializer=_init_worker,
+        initargs=(groups_df,),
+    ) as executor:
+        futures = [executor.submit(_ingest_one, plate, files) for plate, files in plate_files.items()]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def ingest_plates(
+    plate_files: dict[str, dict[str, str]],
+    groups_df: pd.DataFrame,
+    workers: int | None = None,
+    progress=None,
+) -> tuple[pd.DataFrame, dict[str, dict]]:
+    """Read and merge every plate in ``plate_files`` in parallel.
+
+    Same result as ``merge_plates`` on the loaded frames: one combined frame in
+    ``plate_files`` order plus a ``{plate: summary}`` dict. ``progress`` is
+    called as ``progress(done, total)`` after each plate.
+    """
+    merged = {}
+    summaries = {}
+
+    for done, (plate, merged_df, summary) in enumerate(
+        iter_ingest_plates(plate_files, groups_df, workers), start=1
+    ):
+        merged[plate] = merged_df
+        summaries[plate] = summary
+        if progress is not None:
+            progress(done, len(plate_files))
+
+    final_data = concat_frames([merged[plate] for plate in plate_files])
+    return final_data, {plate: summaries[plate] for plate in plate_files}
@@ -0,0 +1,82 @@
+"""Locate and load plate CSV files for batch runs."""
+
+from __future__ import annotations
+
+import io
+import os
+import re
+
+import pandas as pd
+
+# Plate file suffixes, matched case-insensitively: ``<plate>_Cq.csv`` etc.
+PLATE_FILE_KINDS = {"cq": "Cq", "genes": "genes", "samples": "samples"}
+_PLATE_FILE_RE = re.compile(r"^(?P<plate>.+?)[_\-\s]?(?P<kind>cq|genes|samples)\.csv$", re.IGNORECASE)
+
+
+def _natural_key(name: str) -> list:
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r"(\d+)", name)]
+
+
+def discover_plates(directory: str) -> dict[str, dict[str, str]]:
+    """Find ``<plate>_Cq.csv`` / ``_Genes.csv`` / ``_Samples.csv`` triples in ``directory``.
+
+    Returns ``{plate: {"Cq": path, "genes": path, "samples": path}}`` in natural
+    plate order. Raises ``ValueError`` if a plate is missing one of its files.
+    """
+    plates: dict[str, dict[str, str]] = {}
+    for filename in os.listdir(directory):
+        match = _PLATE_FILE_RE.match(filename)
+        if not match:
+            continue
+        kind = PLATE_FILE_KINDS[match.group("kind").lower()]
+        plates.setdefault(match.group("plate"), {})[kind] = os.path.join(directory, filename)
+
+    incomplete = [plate for plate, files in plates.items() if len(files) != len(PLATE_FILE_KINDS)]
+    if incomplete:
+        raise ValueError(f"Plates missing Cq/Genes/Samples files: {', '.join(sorted(incomplete))}")
+
+    return {plate: plates[plate] for plate in sorted(plates, key=_natural_key)}
+
+
+def read_manifest(path: str) -> dict[str, dict[str, str]]:
+    """Read a manifest CSV with ``Plate, Cq, Genes, Samples`` columns.
+
+    Relative file paths are resolved against the manifest's directory.
+    """
+    manifest = pd.read_csv(path, dtype=str)
+    missing = {"Plate", "Cq", "Genes", "Samples"} - set(manifest.columns)
+    if missing:
+        raise ValueError(f"Manifest is missing columns: {', '.join(sorted(missing))}")
+
+    base = os.path.dirname(os.path.abspath(path))
+    return {
+        row.Plate: {
+            "Cq": os.path.join(base, row.Cq),
+            "genes": os.path.join(base, row.Genes),
+            "samples": os.path.join(base, row.Samples),
+        }
+        for row in manifest.itertuples(index=False)
+    }
+
+
+def read_groups(path: str) -> pd.DataFrame:
+    """Read a groups CSV mapping ``Sample`` to ``Group``; raises ``ValueError`` if either column is missing."""
+    groups_df = pd.read_csv(path)
+    missing = {"Sample", "Group"} - set(groups_df.columns)
+    if missing:
+        raise ValueError(f"Groups file is missing columns: {', '.join(sorted(missing))}")
+    return groups_df
+
+
+def read_csv_bytes(data: bytes, **kwargs) -> pd.DataFrame:
+    """``pd.read_csv`` on an in-memory file (e.g. a Streamlit upload's ``getvalue()``)."""
+    return pd.read_csv(io.BytesIO(data), **kwargs)
+
+
+def read_plate(files: dict[str, str]) -> dict[str, pd.DataFrame]:
+    """Load one plate's CSV files the same way the upload page does."""
+    return {
+        "Cq": pd.read_csv(files["Cq"]),
+        "genes": pd.read_csv(files["genes"], index_col=0),
+        "samples": pd.read_csv(files["samples"], index_col=0),
+    }
@@ -0,0 +1,277 @@
+"""Background jobs: long stages run in a process pool, tracked in a persistent SQLite job table.
+
+A page submits a function with its arguments and gets a job id back
+immediately; the work runs in a worker process, so the script thread (and
+the UI) is free. The worker records its status and progress in the job
+table and pickles its result to a file. Any later rerun can show progress,
+cancel the job or load the result, including a new browser session of the
+same user after a refresh or reconnect, since nothing lives in session state
+except the job id. Jobs found running or queued by a server that is no
+longer alive are marked as interrupted.
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+
+import pandas as pd
+
+from qpcr.ingest import default_workers, pool_context
+from qpcr.workspace import atomic_path
+
+DEFAULT_JOBS_PATH = "./results/qpcr_jobs.sqlite"
+DEFAULT_JOB_HOURS = 24
+
+# Statuses; the last three are final
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+FINAL_STATUSES = (DONE, FAILED, CANCELLED)
+
+# Seconds between progress writes from a worker
+_PROGRESS_INTERVAL = 0.5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    label TEXT NOT NULL,
+    status TEXT NOT NULL,
+    done INTEGER NOT NULL DEFAULT 0,
+    total INTEGER NOT NULL DEFAULT 0,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    result_path TEXT NOT NULL,
+    server_pid INTEGER NOT NULL,
+    created REAL NOT NULL,
+    started REAL,
+    finished REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_owner_kind ON jobs (owner, kind, created);
+"""
+
+
+class JobCancelled(Exception):
+    """Raised inside a job's ``progress`` callback once the job has been cancelled."""
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    return sqlite3.connect(db_path, timeout=30)
+
+
+def _update(db_path: str, job_id: str, **values) -> None:
+    assignments = ", ".join(f"{column} = ?" for column in values)
+    with closing(_connect(db_path)) as conn, conn:
+        conn.execute(f"UPDATE jobs SET {assignments} WHERE job_id = ?", (*values.values(), job_id))
+
+
+class _Progress:
+    """``progress(done, total)`` for a job: throttled writes to the job table and cancellation checks."""
+
+    def __init__(self, db_path: str, job_id: str):
+        self.db_path = db_path
+        self.job_id = job_id
+        self.last = 0.0
+
+    def __call__(self, done: int, total: int) -> None:
+        now = time.monotonic()
+        if done < total and now - self.last < _PROGRESS_INTERVAL:
+            return
+        self.last = now
+        with closing(_connect(self.db_path)) as conn, conn:
+            conn.execute("UPDATE jobs SET done = ?, total = ? WHERE job_id = ?", (int(done), int(total), self.job_id))
+            cancelled = conn.execute("SELECT cancel_requested FROM jobs WHERE job_id = ?", (self.job_id,)).fetchone()
+        if cancelled and cancelled[0]:
+            raise JobCancelled(self.job_id)
+
+
+def _run_job(db_path: str, job_id: str, result_path: str, func, args: tuple, kwargs: dict) -> None:
+    """Worker side of a job: run ``func`` and record its outcome in the job table."""
+    with closing(_connect(db_path)) as conn, conn:
+        started = conn.execute(
+            "UPDATE jobs SET status = ?, started = ? WHERE job_id = ? AND status = ? AND cancel_requested = 0",
+            (RUNNING, time.time(), job_id, QUEUED),
+        ).rowcount
+    if not started:
+        _update(db_path, job_id, status=CANCELLED, finished=time.time())
+        return
+    try:
+        result = func(*args, progress=_Progress(db_path, job_id), **kwargs)
+        with atomic_path(result_path) as tmp_path, open(tmp_path, "wb") as file:
+            pickle.dump(result, file, protocol=pickle.HIGHEST_PROTOCOL)
+    except JobCancelled:
+        _update(db_path, job_id, status=CANCELLED, finished=time.time())
+    except Exception:
+        _update(db_path, job_id, status=FAILED, error=traceback.format_exc(limit=5), finished=time.time())
+    else:
+        _update(db_path, job_id, status=DONE, finished=time.time())
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobQueue:
+    """Jobs in the SQLite table at ``db_path``, run by up to ``workers`` processes (all CPUs when ``None``).
+
+    Results are pickled next to the database, under ``jobs/``.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_JOBS_PATH, workers: int | None = None):
+        self.db_path = db_path
+        self.workers = workers or default_workers()
+        self.results_dir = os.path.join(os.path.dirname(os.path.abspath(db_path)), "jobs")
+        os.makedirs(self.results_dir, exist_ok=True)
+        self._executor: ProcessPoolExecutor | None = None
+        self._futures = {}
+        self._lock = threading.Lock()
+        with closing(_connect(db_path)) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+        self._mark_interrupted()
+
+    def _mark_interrupted(self) -> None:
+        with closing(_connect(self.db_path)) as conn, conn:
+            rows = conn.execute("SELECT job_id, server_pid FROM jobs WHERE status IN (?, ?)",
+                                (QUEUED, RUNNING)).fetchall()
+            lost = [job_id for job_id, pid in rows if pid != os.getpid() and not _alive(pid)]
+            conn.executemany("UPDATE jobs SET status = ?, error = ?, finished = ? WHERE job_id = ?",
+                             [(FAILED, "Interrupted: the server was restarted", time.time(), job_id)
+                              for job_id in lost])
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=pool_context())
+        return self._executor
+
+    def submit(self, kind: str, func, *args, owner: str = "", label: str = "", **kwargs) -> str:
+        """Queue ``func(*args, progress=..., **kwargs)`` and return the job id.
+
+        ``func`` must be importable by the workers (a module-level function)
+        and accept a ``progress`` keyword, called as ``progress(done, total)``
+        like the ``progress`` arguments of ``ingest_plates`` or
+        ``export_bundle``; it raises ``JobCancelled`` once the job is
+        cancelled. ``kind`` and ``owner`` let pages find their jobs again.
+        """
+        job_id = uuid.uuid4().hex
+        result_path = os.path.join(self.results_dir, f"{job_id}.pkl")
+        with closing(_connect(self.db_path)) as conn, conn:
+            conn.execute(
+                "INSERT INTO jobs (job_id, owner, kind, label, status, result_path, server_pid, created)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, owner, kind, label or kind, QUEUED, result_path, os.getpid(), time.time()),
+            )
+        with self._lock:
+            future = self._pool().submit(_run_job, self.db_path, job_id, result_path, func, args, kwargs)
+            self._futures[job_id] = future
+        future.add_done_callback(lambda future: self._finish(job_id, future))
+        return job_id
+
+    def _finish(self, job_id: str, future) -> None:
+        # The worker records its own outcome; this only catches jobs whose worker died or never ran
+        with self._lock:
+            self._futures.pop(job_id, None)
+        if future.cancelled():
+            _update(self.db_path, job_id, status=CANCELLED, finished=time.time())
+        elif future.exception() is not None:
+            with closing(_connect(self.db_path)) as conn, conn:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, finished = ? WHERE job_id = ? AND status IN (?, ?)",
+                    (FAILED, repr(future.exception()), time.time(), job_id, QUEUED, RUNNING),
+                )
+
+    def job(self, job_id: str) -> dict | None:
+        """The job's row (``status``, ``done``/``total``, ``error``, timestamps, ...), or ``None``."""
+        with closing(_connect(self.db_path)) as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def latest(self, owner: str, kind: str) -> dict | None:
+        """The most recently submitted job of ``kind`` for ``owner``, or ``None``."""
+        with closing(_connect(self.db_path)) as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute("SELECT * FROM jobs WHERE owner = ? AND kind = ? ORDER BY created DESC LIMIT 1",
+                               (owner, kind)).fetchone()
+        return dict(row) if row is not None else None
+
+    def jobs(self, owner: str | None = None, limit: int = 50) -> pd.DataFrame:
+        """Recent jobs (of ``owner``, if given), newest first."""
+        where, params = ("WHERE owner = ?", (owner,)) if owner is not None else ("", ())
+        with closing(_connect(self.db_path)) as conn:
+            df = pd.read_sql_query(
+                "SELECT job_id, owner, kind, label, status, done, total, error, created, started, finished"
+                f" FROM jobs {where} ORDER BY created DESC LIMIT ?",
+                conn, params=(*params, limit),
+            )
+        for column in ("created", "started", "finished"):
+            df[column] = pd.to_datetime(df[column], unit="s")
+        return df
+
+    def cancel(self, job_id: str) -> None:
+        """Cancel a job: a queued job never starts, a running one stops at its next progress report."""
+        _update(self.db_path, job_id, cancel_requested=1)
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None:
+            future.cancel()
+
+    def result(self, job_id: str):
+        """The result of a finished job. Raises ``RuntimeError`` if it did not finish successfully."""
+        job = self.job(job_id)
+        if job is None or job["status"] != DONE:
+            raise RuntimeError(f"Job {job_id} has no result (status: {job['status'] if job else 'unknown'})")
+        with open(job["result_path"], "rb") as file:
+            return pickle.load(file)
+
+    def purge(self, max_age: float = DEFAULT_JOB_HOURS * 3600) -> int:
+        """Forget finished jobs older than ``max_age`` seconds and delete their results; returns how many."""
+        cutoff = time.time() - max_age
+        with closing(_connect(self.db_path)) as conn, conn:
+            rows = conn.execute(
+                f"SELECT job_id, result_path FROM jobs WHERE status IN ({', '.join('?' * len(FINAL_STATUSES))})"
+                " AND finished < ?", (*FINAL_STATUSES, cutoff),
+            ).fetchall()
+            conn.executemany("DELETE FROM jobs WHERE job_id = ?", [(job_id,) for job_id, _ in rows])
+        for _, result_path in rows:
+            if os.path.exists(result_path):
+                os.remove(result_path)
+        return len(rows)
+
+    def shutdown(self) -> None:
+        """Stop the worker pool after the running jobs finish."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+_default_job_queue: JobQueue | None = None
+_default_lock = threading.Lock()
+
+
+def default_job_queue() -> JobQueue:
+    """Process-wide job queue shared by the pages (``QPCR_JOBS_DB`` / ``QPCR_JOB_WORKERS`` override the defaults).
+
+    Finished jobs older than a day are purged when it is created.
+    """
+    global _default_job_queue
+    with _default_lock:
+        if _default_job_queue is None:
+            workers = os.environ.get("QPCR_JOB_WORKERS")
+            _default_job_queue = JobQueue(os.environ.get("QPCR_JOBS_DB", DEFAULT_JOBS_PATH),
+                                          int(workers) if workers else None)
+            _default_job_queue.purge()
+        return _default_job_queue
@@ -0,0 +1,113 @@
+"""96/384-well plate layouts: precomputed well index tables and vectorized decoders.
+
+A well index is ``row * n_cols + (col - 1)``, so ``A1`` is 0 and, on a
+384-well plate, ``P24`` is 383. Plate maps and Cq exports are decoded into
+well-indexed arrays and joined by array lookup instead of string merges.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+# n_wells → (n_rows, n_cols)
+PLATE_FORMATS = {96: (8, 12), 384: (16, 24)}
+ROW_LETTERS = "ABCDEFGHIJKLMNOP"
+
+
+def _build_tables(n_wells: int) -> tuple[np.ndarray, np.ndarray, np.ndarray, pd.Index, np.ndarray]:
+    n_rows, n_cols = PLATE_FORMATS[n_wells]
+    rows = np.repeat(np.array(list(ROW_LETTERS[:n_rows]), dtype=object), n_cols)
+    cols = np.tile(np.arange(1, n_cols + 1), n_rows)
+    labels = rows + cols.astype(str).astype(object)
+    padded = rows + np.char.zfill(cols.astype(str), 2).astype(object)
+
+    # "A1" and "A01" both resolve to the same index
+    short = padded != labels
+    lookup = pd.Index(np.concatenate([labels, padded[short]]))
+    lookup_index = np.concatenate([np.arange(n_wells), np.flatnonzero(short)])
+    return rows, cols, labels, lookup, lookup_index
+
+
+_TABLES = {n_wells: _build_tables(n_wells) for n_wells in PLATE_FORMATS}
+
+
+def well_rows(n_wells: int = 384) -> np.ndarray:
+    """Row letter of every well, indexed by well index."""
+    return _TABLES[n_wells][0]
+
+
+def well_columns(n_wells: int = 384) -> np.ndarray:
+    """1-based column number of every well, indexed by well index."""
+    return _TABLES[n_wells][1]
+
+
+def well_labels(n_wells: int = 384) -> np.ndarray:
+    """Canonical ``A1``-style label of every well, indexed by well index."""
+    return _TABLES[n_wells][2]
+
+
+def well_index(wells, n_wells: int = 384) -> np.ndarray:
+    """Map ``A01``/``A1`` labels to well indexes in one vectorized lookup.
+
+    Labels that are not on the plate (including NaN) map to -1.
+    """
+    lookup, lookup_index = _TABLES[n_wells][3:]
+    positions = lookup.get_indexer(pd.Index(wells, dtype=object).str.strip().str.upper())
+    return np.where(positions >= 0, lookup_index[positions], -1)
+
+
+def row_col_index(rows, cols, n_wells: int = 384) -> np.ndarray:
+    """Map row letters and 1-based column numbers to well indexes (-1 if off the plate)."""
+    n_rows, n_cols = PLATE_FORMATS[n_wells]
+    row_codes = pd.Index(rows).astype(str).str.strip().str.upper()
+    row_idx = pd.Index(list(ROW_LETTERS[:n_rows])).get_indexer(row_codes)
+    col_idx = pd.to_numeric(pd.Index(cols), errors="coerce").to_numpy(dtype=float) - 1
+    valid = (row_idx >= 0) & (col_idx >= 0) & (col_idx < n_cols)
+    return np.where(valid, row_idx * n_cols + np.nan_to_num(col_idx).astype(int), -1)
+
+
+def infer_plate_format(grid: pd.DataFrame) -> int:
+    """Smallest plate format whose rows/columns cover a plate map's labels."""
+    n_rows = len(grid.index)
+    max_col = pd.to_numeric(pd.Index(grid.columns), errors="coerce").max()
+    last_row = pd.Index(grid.index).astype(str).str.strip().str.upper().max()
+
+    for n_wells, (rows, cols) in sorted(PLATE_FORMATS.items()):
+        if n_rows <= rows and max_col <= cols and last_row <= ROW_LETTERS[rows - 1]:
+            return n_wells
+    raise ValueError(f"Plate map with {n_rows} rows and {max_col} columns does not fit a 384-well plate")
+
+
+def grid_index(grid: pd.DataFrame, n_wells: int = 384) -> np.ndarray:
+    """Well index of every cell of a row × column plate map, in ``melt`` order.
+
+    ``melt`` walks the map column by column, so cell ``k`` is
+    ``grid.iloc[k % n_rows, k // n_rows]``. Raises ``ValueError`` for
+    row/column labels that are not on the plate.
+    """
+    n_rows, n_cols = len(grid.index), len(grid.columns)
+    rows = np.tile(np.asarray(grid.index, dtype=object), n_cols)
+    cols = np.repeat(np.asarray(grid.columns, dtype=object), n_rows)
+    index = row_col_index(rows, cols, n_wells)
+    if (index < 0).any():
+        raise ValueError(f"Plate map has row/column labels outside a {n_wells}-well plate")
+    return index
+
+
+def grid_values(grid: pd.DataFrame) -> np.ndarray:
+    """Cell values of a plate map in ``melt`` order (see ``grid_index``)."""
+    return grid.to_numpy(dtype=object).ravel(order="F")
+
+
+def scatter_to_wells(index: np.ndarray, values, n_wells: int = 384, fill=np.nan) -> np.ndarray:
+    """Array of length ``n_wells`` holding ``values`` at their well ``index``.
+
+    Entries with a negative index are ignored; unset wells hold ``fill``.
+    """
+    values = np.asarray(values)
+    dtype = float if values.dtype.kind in "iuf" else object
+    by_well = np.full(n_wells, fill, dtype=dtype)
+    valid = index >= 0
+    by_well[index[valid]] = values[valid]
+    return by_well
@@ -0,0 +1,106 @@
+"""Dense Sample × Gene matrix engine for ΔCt and ΔΔCt.
+
+Mean Cq is scattered once into a ``(n_samples, n_genes)`` float64 array;
+housekeeping means, reference ΔCt and fold change are then row/column
+reductions and broadcasts over that array. Long format is produced only when
+results are gathered back onto the input rows.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+def key_codes(values: pd.Series) -> tuple[np.ndarray, pd.Index]:
+    """Integer codes and labels of a key column (categories are reused as is)."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), values.cat.categories
+    codes, labels = pd.factorize(values)
+    return codes, pd.Index(labels)
+
+
+class SampleGeneMatrix:
+    """One value per Sample-Gene pair of a long-format frame, as a dense array.
+
+    ``values[i, j]`` is the value for ``samples[i]`` and ``genes[j]`` (NaN where
+    the pair is missing). ``gather`` maps any such array back onto the rows of
+    the frame it was built from.
+    """
+
+    def __init__(self, df: pd.DataFrame, value: str):
+        self.sample_codes, self.samples = key_codes(df["Sample"])
+        self.gene_codes, self.genes = key_codes(df["Gene"])
+        self.values = np.full((len(self.samples), len(self.genes)), np.nan)
+        present = (self.sample_codes >= 0) & (self.gene_codes >= 0)
+        self._present = None if present.all() else present
+        values = df[value].to_numpy(dtype=float)
+        if self._present is None:
+            self.values[self.sample_codes, self.gene_codes] = values
+        else:
+            self.values[self.sample_codes[present], self.gene_codes[present]] = values[present]
+
+    def mask(self, rows: np.ndarray) -> np.ndarray:
+        """Boolean matrix that is True at the pairs of the selected input ``rows``."""
+        mask = np.zeros(self.values.shape, dtype=bool)
+        if self._present is not None:
+            rows = rows & self._present
+        mask[self.sample_codes[rows], self.gene_codes[rows]] = True
+        return mask
+
+    def gene_columns(self, genes: list[str]) -> np.ndarray:
+        """Column positions of ``genes`` (genes not in the matrix are skipped)."""
+        positions = self.genes.get_indexer(genes)
+        return positions[positions >= 0]
+
+    def gather(self, matrix: np.ndarray) -> np.ndarray:
+        """Per-row values of a ``(n_samples, n_genes)`` array, in input row order."""
+        if self._present is None:
+            return matrix[self.sample_codes, self.gene_codes]
+        out = np.full(len(self.sample_codes), np.nan)
+        out[self._present] = matrix[self.sample_codes[self._present], self.gene_codes[self._present]]
+        return out
+
+    def gather_samples(self, vector: np.ndarray) -> np.ndarray:
+        """Per-row values of a per-sample vector."""
+        return _take(vector, self.sample_codes)
+
+    def gather_genes(self, vector: np.ndarray) -> np.ndarray:
+        """Per-row values of a per-gene vector."""
+        return _take(vector, self.gene_codes)
+
+
+def _take(vector: np.ndarray, codes: np.ndarray) -> np.ndarray:
+    """``vector[codes]`` with NaN where the code is -1 (missing key)."""
+    out = vector[codes]
+    if (codes < 0).any():
+        out = np.where(codes >= 0, out, np.nan)
+    return out
+
+
+def _nanmean(values: np.ndarray, axis: int) -> np.ndarray:
+    """``np.nanmean`` without the all-NaN warning (all-NaN slices give NaN)."""
+    valid = ~np.isnan(values)
+    count = valid.sum(axis=axis)
+    total = np.where(valid, values, 0.0).sum(axis=axis)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, total / count, np.nan)
+
+
+def housekeeping_mean(cq: np.ndarray, hk_columns: np.ndarray) -> np.ndarray:
+    """Per-sample mean Cq of the housekeeping columns, ignoring missing pairs.
+
+    Cq is already on a log2 scale, so this arithmetic mean is the geometric
+    mean of the reference genes' relative quantities (geNorm).
+    """
+    return _nanmean(cq[:, hk_columns], axis=1)
+
+
+def reference_ct(delta: np.ndarray, control: np.ndarray) -> np.ndarray:
+    """Per-gene mean ΔCt over the pairs selected by the boolean ``control`` matrix."""
+    return _nanmean(np.where(control & np.isfinite(delta), delta, np.nan), axis=0)
+
+
+def fold_change(delta: np.ndarray, reference: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """``(ΔΔCt, 2^-ΔΔCt)`` for a ΔCt matrix and a per-gene reference ΔCt."""
+    delta_delta = delta - reference[None, :]
+    return delta_delta, 2 ** (-delta_delta)
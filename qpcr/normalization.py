@@ -0,0 +1,91 @@
+"""Mean Cq, ΔCt normalization and ΔΔCt / fold change."""
+
+from __future__ import annotations
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from qpcr.matrix import SampleGeneMatrix, housekeeping_mean, reference_ct
+
+
+def mean_cq(df: pd.DataFrame) -> pd.DataFrame:
+    """Mean Cq per Sample-Gene pair (ignoring Plate), with Group attached."""
+    keys = [df["Sample"], df["Gene"]]
+
+    # Well-level Cq is stored as float32; averages are taken in float64
+    mean_cq_df = df["Cq"].astype(float).groupby(keys, observed=True).mean().rename("Mean_Cq").reset_index()
+    mean_cq_df["Group"] = df["Group"].groupby(keys, observed=True).first().reset_index(drop=True)
+    return mean_cq_df
+
+
+def check_housekeeping_genes(
+    mean_cq_df: pd.DataFrame,
+    housekeeping_genes: list[str],
+) -> tuple[list[str], list[str]]:
+    """Split ``housekeeping_genes`` into ``(found, missing)`` for ``mean_cq_df``."""
+    available = set(mean_cq_df["Gene"].unique())
+    requested = list(dict.fromkeys(housekeeping_genes))
+    missing_genes = [gene for gene in requested if gene not in available]
+    found_genes = [gene for gene in requested if gene in available]
+    return found_genes, missing_genes
+
+
+def delta_ct(mean_cq_df: pd.DataFrame, housekeeping_genes: list[str]) -> pd.DataFrame:
+    """Normalize Mean Cq against the per-sample mean of the housekeeping genes.
+
+    Adds ``Housekeeping_Mean_Cq`` and ``Normalized_Cq`` (ΔCt) columns.
+    """
+    matrix = SampleGeneMatrix(mean_cq_df, "Mean_Cq")
+    hk_mean = matrix.gather_samples(
+        housekeeping_mean(matrix.values, matrix.gene_columns(list(housekeeping_genes)))
+    )
+    return mean_cq_df.assign(
+        Housekeeping_Mean_Cq=hk_mean,
+        Normalized_Cq=mean_cq_df["Mean_Cq"].to_numpy(dtype=float) - hk_mean,
+    )
+
+
+def delta_delta_ct(
+    normalized_df: pd.DataFrame,
+    control_group: str,
+    selected_groups: list[str] | None = None,
+) -> pd.DataFrame:
+    """ΔΔCt and fold change relative to the mean ΔCt of ``control_group``.
+
+    Only ``selected_groups`` are kept (all groups when ``None``); the control
+    group is always included.
+    """
+    df_filtered = normalized_df
+    if selected_groups is not None:
+        selected_groups = list(selected_groups)
+        if control_group not in selected_groups:
+            selected_groups.append(control_group)
+        df_filtered = df_filtered[df_filtered["Group"].isin(selected_groups)]
+
+    df_filtered = replace_infinite(df_filtered).reset_index(drop=True)
+
+    # Mean ΔCt of the control group per gene, then ΔΔCt for every pair at once
+    matrix = SampleGeneMatrix(df_filtered, "Normalized_Cq")
+    control = matrix.mask((df_filtered["Group"] == control_group).to_numpy(dtype=bool))
+    reference = matrix.gather_genes(reference_ct(matrix.values, control))
+    delta_delta = df_filtered["Normalized_Cq"].to_numpy(dtype=float) - reference
+
+    return df_filtered.assign(Reference_Ct=reference, Delta_Delta_Ct=delta_delta, Fold_Change=2 ** (-delta_delta))
+
+
+def replace_infinite(df: pd.DataFrame) -> pd.DataFrame:
+    """``df`` with ±inf in float columns replaced by NaN (only those columns are rewritten)."""
+    infinite = [
+        column for column in df.columns
+        if df[column].dtype.kind == "f" and np.isinf(df[column].to_numpy()).any()
+    ]
+    if not infinite:
+        return df
+    return df.assign(**{column: df[column].replace([np.inf, -np.inf], np.nan) for column in infinite})
+
+
+def safe_group_name(group: str) -> str:
+    """Make a group name safe to use in a filename."""
+    return re.sub(r"[^\w\-_]", "_", group)
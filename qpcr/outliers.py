@@ -0,0 +1,176 @@
+"""Automatic outlier detection for technical replicates.
+
+Every Sample-Gene pair is tested at once: rows are sorted by (pair, Cq) a
+single time and each pair's extremes, mean, SD and median are read from that
+ordering, so there is no Python loop over pairs. A pair is resolved only when
+one well is clearly the offender and dropping it brings the spread back under
+the threshold; everything else is left for a human.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from qpcr.replicates import GROUP_KEYS, decision_key, replicate_stats
+
+METHODS = ["median", "grubbs", "dixon"]
+
+# Two-sided Grubbs critical values, α = 0.05, by number of replicates
+GRUBBS_CRITICAL = {3: 1.1543, 4: 1.4812, 5: 1.7150, 6: 1.8871, 7: 2.0200, 8: 2.1266, 9: 2.2150, 10: 2.2900}
+
+# Dixon Q (r10) critical values, 95% confidence, by number of replicates
+DIXON_CRITICAL = {3: 0.970, 4: 0.829, 5: 0.710, 6: 0.625, 7: 0.568, 8: 0.526, 9: 0.493, 10: 0.466}
+
+
+def _critical(table: dict[int, float], n: np.ndarray) -> np.ndarray:
+    lookup = np.full(max(table) + 1, np.nan)
+    for size, value in table.items():
+        lookup[size] = value
+    return np.where(n <= max(table), lookup[np.clip(n, 0, max(table))], np.nan)
+
+
+def detect_outliers(
+    df: pd.DataFrame,
+    threshold: float,
+    method: str = "median",
+    no_amp_cq: float | None = None,
+    stats: pd.DataFrame | None = None,
+) -> pd.DataFrame:
+    """Classify every flagged Sample-Gene pair as resolved or ambiguous.
+
+    Candidates are pairs with ``Cq_diff > threshold`` plus pairs where some but
+    not all wells failed to amplify (NaN Cq, or Cq ≥ ``no_amp_cq``). ``method``
+    picks how the offending amplified well is found:
+
+    - ``"median"``: the well furthest from the median, if dropping it resolves
+      the spread and dropping the opposite extreme would not;
+    - ``"grubbs"``: the Grubbs statistic exceeds its α = 0.05 critical value;
+    - ``"dixon"``: the Dixon Q statistic exceeds its 95% critical value.
+
+Grubbs and Dixon need at least four replicates: at n = 3 their critical
+values (1.1543 of a possible 1.1547, and 0.970 of 1) reject almost nothing,
+so triplicates fall back to the median rule.
+
+    Returns one row per candidate with ``Outlier_Well``, ``Reason`` and a
+    ``Resolved`` flag. Raises ``ValueError`` for an unknown ``method``.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown outlier method '{method}', expected one of {', '.join(METHODS)}")
+    if stats is None:
+        stats = replicate_stats(df)
+
+    codes = df.groupby(GROUP_KEYS, sort=True, observed=True).ngroup().to_numpy()
+    cq = df["Cq"].to_numpy(dtype=float)
+    wells = df["Well"].to_numpy(dtype=object)
+    n_groups = len(stats)
+
+    in_group = codes >= 0
+    amplified = in_group & ~np.isnan(cq)
+    if no_amp_cq is not None:
+        amplified &= cq < no_amp_cq
+    failed = in_group & ~amplified
+
+    # Wells that failed to amplify, per pair
+    n_failed = np.bincount(codes[failed], minlength=n_groups)
+    failed_well = np.full(n_groups, None, dtype=object)
+    failed_well[codes[failed]] = wells[failed]
+
+    # Amplified wells sorted by (pair, Cq); pair k occupies sorted[start[k]:start[k] + n[k]]
+    rows = np.flatnonzero(amplified)
+    rows = rows[np.lexsort((cq[rows], codes[rows]))]
+    n = np.bincount(codes[rows], minlength=n_groups)
+    start = np.concatenate([[0], np.cumsum(n)[:-1]]).astype(int)
+    x = cq[rows]
+    sorted_wells = wells[rows]
+
+    def pick(values: np.ndarray, offset: np.ndarray, fill=np.nan) -> np.ndarray:
+        """``values`` at position ``offset`` within each pair's sorted run."""
+        valid = (offset >= 0) & (offset < n)
+        if not len(values):
+            return np.full(n_groups, fill, dtype=values.dtype)
+        return np.where(valid, values[np.clip(start + offset, 0, len(values) - 1)], fill)
+
+    first, last = np.zeros_like(n), n - 1
+    low, low2 = pick(x, first), pick(x, first + 1)
+    high, high2 = pick(x, last), pick(x, last - 1)
+    spread = high - low
+    sums = np.bincount(codes[rows], weights=x, minlength=n_groups)
+    squares = np.bincount(codes[rows], weights=x ** 2, minlength=n_groups)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = sums / n
+        sd = np.sqrt(np.maximum(squares - n * mean ** 2, 0) / (n - 1))
+        median = (pick(x, (n - 1) // 2) + pick(x, n // 2)) / 2
+
+        # Spread left after dropping the low or the high extreme
+        without_low = high - low2
+        without_high = high2 - low
+
+        # Candidate offender: the extreme furthest from the centre
+        if method == "median":
+            low_dist, high_dist = median - low, high - median
+        elif method == "grubbs":
+            low_dist, high_dist = mean - low, high - mean
+        else:
+            low_dist, high_dist = low2 - low, high - high2
+        pick_high = high_dist > low_dist
+        remaining = np.where(pick_high, without_high, without_low)
+
+        # Median rule; at n = 3 every method picks the same extreme, so it also backs up Grubbs and Dixon there
+        other_remaining = np.where(pick_high, without_low, without_high)
+        clear_extreme = (high_dist != low_dist) & ~(other_remaining <= threshold)
+        if method == "median":
+            significant = clear_extreme
+        elif method == "grubbs":
+            significant = np.maximum(low_dist, high_dist) / sd > _critical(GRUBBS_CRITICAL, n)
+        else:
+            significant = np.maximum(low_dist, high_dist) / spread > _critical(DIXON_CRITICAL, n)
+        triplicate = n == 3
+        significant = np.where(triplicate, clear_extreme, significant)
+
+    outlier_well = np.where(pick_high, pick(sorted_wells, last, None), pick(sorted_wells, first, None))
+
+    flagged = stats["Cq_diff"].to_numpy() > threshold
+    partial_failure = (n_failed > 0) & (n > 0)
+    candidates = flagged | partial_failure
+
+    # A single failed well among agreeing amplified wells is the offender
+    failed_resolves = (n_failed == 1) & (n >= 2) & (spread <= threshold)
+    outlier_resolves = (n_failed == 0) & (n >= 3) & significant & (remaining <= threshold)
+
+    reason = np.select(
+        [failed_resolves, outlier_resolves, partial_failure, n < 3, ~significant],
+        ["no amplification", np.where(triplicate, "median outlier", f"{method} outlier"), "mixed amplification",
+         "too few replicates", "no clear outlier"],
+        default="spread remains after removal",
+    )
+
+    result = stats[GROUP_KEYS + ["n_Replicates", "Cq_diff"]].copy()
+    result["Outlier_Well"] = np.where(failed_resolves, failed_well, np.where(outlier_resolves, outlier_well, None))
+    result["Resolved"] = failed_resolves | outlier_resolves
+    result["Reason"] = reason
+    return result[candidates].reset_index(drop=True)
+
+
+def auto_curate(
+    df: pd.DataFrame,
+    threshold: float,
+    method: str = "median",
+    no_amp_cq: float | None = None,
+    stats: pd.DataFrame | None = None,
+) -> tuple[dict, pd.DataFrame]:
+    """Removal decisions for every pair ``detect_outliers`` can resolve.
+
+    Returns ``(user_decisions, ambiguous)``: decisions in the review page's
+    ``{key: {"action", "well"}}`` format, and the candidate pairs left for
+    manual review.
+    """
+    outliers = detect_outliers(df, threshold, method, no_amp_cq, stats)
+    resolved = outliers[outliers["Resolved"]]
+
+    user_decisions = {
+        decision_key(sample, gene): {"action": "Remove Specific", "well": well}
+        for sample, gene, well in zip(resolved["Sample"], resolved["Gene"], resolved["Outlier_Well"])
+    }
+    ambiguous = outliers[~outliers["Resolved"]].drop(columns=["Outlier_Well", "Resolved"]).reset_index(drop=True)
+    return user_decisions, ambiguous
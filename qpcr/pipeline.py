@@ -0,0 +1,79 @@
+"""End-to-end analysis: merge → replicate filtering → mean Cq → ΔCt → ΔΔCt."""
+
+from __future__ import annotations
+
+import pandas as pd
+
+from qpcr.normalization import check_housekeeping_genes, delta_ct, delta_delta_ct, mean_cq
+from qpcr.outliers import auto_curate
+from qpcr.plates import merge_plates
+from qpcr.replicates import apply_decisions, decision_key, flag_replicates
+
+
+def run_pipeline(
+    plate_data: dict[str, dict[str, pd.DataFrame]],
+    groups_df: pd.DataFrame,
+    housekeeping_genes: list[str],
+    control_group: str,
+    threshold: float | None = None,
+    selected_groups: list[str] | None = None,
+    outlier_method: str | None = None,
+    no_amp_cq: float | None = None,
+) -> dict:
+    """Run every analysis stage and return the results keyed like the app's session state.
+
+    When ``threshold`` is given, Sample-Gene pairs whose Cq spread exceeds it are
+    removed ("Remove All") before mean Cq is computed. With ``outlier_method``
+    (see ``qpcr.outliers``) the offending well is removed instead wherever it
+    can be identified, and only the ambiguous pairs are removed whole.
+    Raises ``ValueError`` if none of ``housekeeping_genes`` are present.
+    """
+    merged_data, summary = merge_plates(plate_data, groups_df)
+    return analyze(
+        merged_data, summary, housekeeping_genes, control_group, threshold, selected_groups, outlier_method, no_amp_cq,
+    )
+
+
+def analyze(
+    merged_data: pd.DataFrame,
+    summary: dict[str, dict],
+    housekeeping_genes: list[str],
+    control_group: str,
+    threshold: float | None = None,
+    selected_groups: list[str] | None = None,
+    outlier_method: str | None = None,
+    no_amp_cq: float | None = None,
+) -> dict:
+    """Run the stages after the merge; see ``run_pipeline``."""
+    user_decisions = {}
+    if threshold is not None:
+        if outlier_method is not None:
+            user_decisions, flagged = auto_curate(merged_data, threshold, outlier_method, no_amp_cq)
+        else:
+            flagged = flag_replicates(merged_data, threshold)
+        user_decisions.update({
+            decision_key(sample, gene): {"action": "Remove All", "well": None}
+            for sample, gene in zip(flagged["Sample"], flagged["Gene"])
+        })
+    filtered_merged_data = apply_decisions(merged_data, user_decisions)
+
+    mean_cq_df = mean_cq(filtered_merged_data)
+
+    found_genes, missing_genes = check_housekeeping_genes(mean_cq_df, housekeeping_genes)
+    if not found_genes:
+        raise ValueError(f"No valid housekeeping genes found: {', '.join(housekeeping_genes)}")
+
+    normalized_df = delta_ct(mean_cq_df, found_genes)
+    fold_change_df = delta_delta_ct(normalized_df, control_group, selected_groups)
+
+    return {
+        "merged_data": merged_data,
+        "summary": summary,
+        "user_decisions": user_decisions,
+        "filtered_merged_data": filtered_merged_data,
+        "mean_cq_df": mean_cq_df,
+        "found_genes": found_genes,
+        "missing_genes": missing_genes,
+        "normalized_qPCR_df": normalized_df,
+        "fold_change_qPCR_df": fold_change_df,
+    }
@@ -0,0 +1,118 @@
+"""Plate ingestion: reshape plate maps and merge them with Cq values."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from qpcr.dataset import CANONICAL_DTYPES, OPTIONAL_DTYPES, SQ_COLUMNS, concat_frames
+from qpcr.layout import (
+    grid_index,
+    grid_values,
+    infer_plate_format,
+    scatter_to_wells,
+    well_index,
+    well_labels,
+)
+
+
+def plate_format(genes_df: pd.DataFrame, samples_df: pd.DataFrame) -> int:
+    """Number of wells of the plate described by a gene map and a sample map."""
+    return max(infer_plate_format(genes_df), infer_plate_format(samples_df))
+
+
+def merge_plate(
+    cq_df: pd.DataFrame,
+    genes_df: pd.DataFrame,
+    samples_df: pd.DataFrame,
+    groups_df: pd.DataFrame,
+    plate: str,
+) -> tuple[pd.DataFrame, dict]:
+    """Merge one plate's Cq export with its gene/sample maps and group info.
+
+    Returns the merged wells (empty wells dropped) in the canonical schema of
+    ``qpcr.dataset`` and a per-plate summary.
+    """
+    n_wells = plate_format(genes_df, samples_df)
+    wells = well_index(cq_df["Well"], n_wells)
+    cq_by_well = scatter_to_wells(wells, cq_df["Cq"].to_numpy(dtype=float), n_wells)
+
+    # Standard-curve wells: carry the starting quantity when the export has one
+    sq_by_well = None
+    sq_column = next((column for column in SQ_COLUMNS if column in cq_df.columns), None)
+    if sq_column is not None:
+        sq = pd.to_numeric(cq_df[sq_column], errors="coerce").to_numpy(dtype=float)
+        if not np.isnan(sq).all():
+            sq_by_well = scatter_to_wells(wells, sq, n_wells)
+
+    return merge_wells(cq_by_well, sq_by_well, genes_df, samples_df, groups_df, plate)
+
+
+def merge_wells(
+    cq_by_well: np.ndarray,
+    sq_by_well: np.ndarray | None,
+    genes_df: pd.DataFrame,
+    samples_df: pd.DataFrame,
+    groups_df: pd.DataFrame,
+    plate: str,
+) -> tuple[pd.DataFrame, dict]:
+    """``merge_plate`` on Cq (and optional SQ) values already indexed by well.
+
+    ``cq_by_well`` has one entry per well of the plate (see ``plate_format``).
+    """
+    n_wells = len(cq_by_well)
+
+    # Decode the plate maps into arrays indexed by integer well index
+    index = grid_index(genes_df, n_wells)
+    genes = grid_values(genes_df)
+    sample_by_well = scatter_to_wells(grid_index(samples_df, n_wells), grid_values(samples_df), n_wells)
+    samples = sample_by_well[index]
+
+    # Remove empty wells, keeping the order of the gene map
+    missing_sample, missing_gene = pd.isna(samples), pd.isna(genes)
+    empty_wells = missing_sample.sum() + missing_gene.sum()
+    keep = ~(missing_sample | missing_gene)
+    index, genes, samples = index[keep], genes[keep], samples[keep]
+
+    # Join genes, samples, Cq and groups by array lookup
+    group_by_sample = groups_df.drop_duplicates("Sample").set_index("Sample")["Group"]
+    filtered_df = pd.DataFrame({
+        "Plate": plate,
+        "Well_Index": index,
+        "Well": well_labels(n_wells)[index],
+        "Sample": samples,
+        "Gene": genes,
+        "Group": group_by_sample.reindex(samples).to_numpy(),
+        "Cq": cq_by_well[index],
+    }).astype(CANONICAL_DTYPES)
+    if sq_by_well is not None:
+        filtered_df["SQ"] = sq_by_well[index].astype(OPTIONAL_DTYPES["SQ"])
+
+    summary = {
+        "Total Wells": len(keep),
+        "Empty Wells": empty_wells,
+        "Unique Samples": filtered_df["Sample"].nunique(),
+        "Unique Genes": filtered_df["Gene"].nunique(),
+    }
+    return filtered_df, summary
+
+
+def merge_plates(
+    plate_data: dict[str, dict[str, pd.DataFrame]],
+    groups_df: pd.DataFrame,
+) -> tuple[pd.DataFrame, dict[str, dict]]:
+    """Merge every plate in ``plate_data`` into a single long-format frame.
+
+    ``plate_data`` maps a plate name to ``{"Cq": ..., "genes": ..., "samples": ...}``.
+    Returns the combined frame and a ``{plate: summary}`` dict.
+    """
+    all_data = []
+    plate_summaries = {}
+
+    for plate, files in plate_data.items():
+        merged_df, summary = merge_plate(files["Cq"], files["genes"], files["samples"], groups_df, plate)
+        all_data.append(merged_df)
+        plate_summaries[plate] = summary
+
+    final_data = concat_frames(all_data)
+    return final_data, plate_summaries
@@ -0,0 +1,126 @@
+"""Content-addressed on-disk cache of rendered figures with size and age eviction.
+
+A figure's key is a hash of exactly what it shows (the gene's plotted
+columns and summaries) plus how it is drawn (group order, palette, DPI and
+the plot style version), so a rerun with unchanged data serves the stored
+image instead of redrawing it, and any change to a gene's data or the
+style yields a new key. Files are named ``<key>.png``; their modification
+time is refreshed on every hit, so eviction by age or total size drops the
+least recently used images first.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+
+DEFAULT_PLOT_CACHE_MB = 512
+DEFAULT_PLOT_CACHE_DAYS = 30
+
+# Entries used this recently are never evicted: the cache is shared by every session of the process,
+# and another session may be about to display a path it was just given
+DEFAULT_PLOT_CACHE_GRACE = 600
+
+
+class PlotCache:
+    """Rendered images under ``cache_dir``, bounded by ``max_bytes`` and ``max_age`` (seconds).
+
+    Entries used within the last ``grace`` seconds are kept even over the bounds.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = "./plots/cache",
+        max_bytes: int = DEFAULT_PLOT_CACHE_MB * 1024 ** 2,
+        max_age: float = DEFAULT_PLOT_CACHE_DAYS * 86400,
+        suffix: str = ".png",
+        grace: float = DEFAULT_PLOT_CACHE_GRACE,
+    ):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.suffix = suffix
+        self.grace = grace
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, key: str) -> str:
+        """Where the image for ``key`` is (or will be) stored."""
+        return os.path.join(self.cache_dir, f"{key}{self.suffix}")
+
+    def get(self, key: str) -> str | None:
+        """Path of the stored image for ``key``, or ``None``; a hit marks the entry as recently used."""
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def _entries(self) -> list[tuple[float, int, str]]:
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.is_file() and entry.name.endswith(self.suffix):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def evict(self, keep: set[str] | frozenset[str] = frozenset()) -> int:
+        """Remove entries older than ``max_age``, then the least recently used until under ``max_bytes``.
+
+        Entries whose key is in ``keep`` (e.g. the images on screen) or that
+        were used within ``grace`` seconds (possibly by another session) are
+        never removed. Returns the number of files removed.
+        """
+        keep_paths = {self.path(key) for key in keep}
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        now = time.time()
+        cutoff, recent = now - self.max_age, now - self.grace
+        removed = 0
+        for mtime, size, path in entries:
+            if path in keep_paths or mtime >= recent or (mtime >= cutoff and total <= self.max_bytes):
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> None:
+        """Remove every stored image."""
+        for _, _, path in self._entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def info(self) -> dict:
+        entries = self._entries()
+        return {"entries": len(entries), "bytes": sum(size for _, size, _ in entries), "max_bytes": self.max_bytes,
+                "hits": self.hits, "misses": self.misses}
+
+
+_default_plot_cache: PlotCache | None = None
+_default_lock = threading.Lock()
+
+
+def default_plot_cache() -> PlotCache:
+    """Process-wide plot cache shared by the pages (``QPCR_PLOT_CACHE_MB`` / ``QPCR_PLOT_CACHE_DAYS`` set the bounds)."""
+    global _default_plot_cache
+    with _default_lock:
+        if _default_plot_cache is None:
+            _default_plot_cache = PlotCache(
+                max_bytes=int(float(os.environ.get("QPCR_PLOT_CACHE_MB", DEFAULT_PLOT_CACHE_MB)) * 1024 ** 2),
+                max_age=float(os.environ.get("QPCR_PLOT_CACHE_DAYS", DEFAULT_PLOT_CACHE_DAYS)) * 86400,
+            )
+        return _default_plot_cache
@@ -0,0 +1,270 @@
+"""Per-gene -ΔCt and fold-change figures, rendered across a process pool.
+
+Figures are built as ``matplotlib.figure.Figure`` objects on the
+non-interactive Agg canvas, never through ``pyplot``, so nothing is registered
+globally and a figure is freed as soon as it is rendered. Plot data are split
+by gene once; each worker process receives the per-gene slices through the
+pool initializer and writes its PNGs itself, so rendering and file writes
+happen concurrently while finished images are handed back as they complete.
+With a ``PlotCache``, genes whose plotted data and style are unchanged are
+served from disk and only the others are redrawn.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from qpcr.cache import content_hash
+from qpcr.ingest import default_workers, pool_context
+from qpcr.plot_cache import PlotCache
+from qpcr.workspace import atomic_path
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+DEFAULT_DPI = 300
+DEFAULT_PALETTE = "husl"
+
+# Part of every plot cache key: bump when the drawing code changes so stored images are redrawn
+PLOT_STYLE_VERSION = 1
+
+# kind -> (plots subdirectory, file name pattern)
+PLOT_KINDS = {
+    "delta_ct": ("deltaCT", "{gene}_deltaCT_expression.png"),
+    "fold_change": ("foldchange", "{gene}_FoldChange_plot.png"),
+}
+
+# Columns a figure shows; only these enter its cache key
+PLOT_COLUMNS = {
+    "delta_ct": ["Group", "Neg_Delta_Ct"],
+    "fold_change": ["Group", "Fold_Change"],
+}
+
+# Set once per worker by the pool initializer so gene data are pickled per worker, not per gene
+_worker_genes: dict | None = None
+
+
+def delta_ct_plot_data(normalized_df: pd.DataFrame) -> pd.DataFrame:
+    """Rows with a finite -ΔCt (``Neg_Delta_Ct``) and a group."""
+    df = normalized_df.assign(Neg_Delta_Ct=-normalized_df["Normalized_Cq"])
+    return df.replace([np.inf, -np.inf], np.nan).dropna(subset=["Group", "Neg_Delta_Ct"])
+
+
+def fold_change_plot_data(fold_change_df: pd.DataFrame) -> pd.DataFrame:
+    """Rows with a finite fold change and a group."""
+    return fold_change_df.replace([np.inf, -np.inf], np.nan).dropna(subset=["Group", "Fold_Change"])
+
+
+def fold_change_summary(plot_df: pd.DataFrame) -> pd.DataFrame:
+    """Mean and SD of the fold change per (Gene, Group)."""
+    return (
+        plot_df.groupby(["Gene", "Group"], observed=True)
+        .agg(Fold_Change_Mean=("Fold_Change", "mean"), Fold_Change_SD=("Fold_Change", "std"))
+        .reset_index()
+    )
+
+
+def group_order(plot_df: pd.DataFrame) -> list:
+    """Groups in order of first appearance, as the plots lay them out."""
+    return plot_df["Group"].unique().tolist()
+
+
+def group_palette(groups: list, palette: str = DEFAULT_PALETTE) -> dict:
+    """One color per group from a seaborn palette."""
+    import seaborn as sns
+
+    return dict(zip(groups, sns.color_palette(palette, n_colors=len(groups))))
+
+
+def split_genes(kind: str, plot_df: pd.DataFrame) -> dict:
+    """``{gene: (rows, summary)}`` with the data each gene's figure needs (summary is None for ΔCt)."""
+    rows = {gene: gene_df for gene, gene_df in plot_df.groupby("Gene", observed=True, sort=False)}
+    if kind == "delta_ct":
+        return {gene: (gene_df, None) for gene, gene_df in rows.items()}
+    summaries = dict(tuple(fold_change_summary(plot_df).groupby("Gene", observed=True, sort=False)))
+    return {gene: (gene_df, summaries[gene]) for gene, gene_df in rows.items()}
+
+
+def _style_axes(ax, gene: str, ylabel: str) -> None:
+    import seaborn as sns
+
+    ax.tick_params(axis="x", labelrotation=45, labelsize=14, colors="black")
+    ax.tick_params(axis="y", labelsize=14, colors="black")
+    ax.set_xlabel("")
+    ax.set_ylabel(f"{ylabel} of $\\it{{{gene}}}$", fontsize=16, color="black")
+    ax.set_title(gene, fontsize=18, fontweight="bold", fontstyle="italic", color="black")
+    ax.grid(False)
+    sns.despine(ax=ax, top=True, right=True)
+    ax.spines["bottom"].set_linewidth(2)
+    ax.spines["left"].set_linewidth(2)
+
+
+def draw_delta_ct(ax, gene: str, gene_df: pd.DataFrame, order: list, palette: dict) -> None:
+    """Box plot of -ΔCt per group with the samples overlaid."""
+    import seaborn as sns
+
+    sns.boxplot(x="Group", y="Neg_Delta_Ct", hue="Group", data=gene_df, palette=palette, legend=False,
+                width=0.18 * len(order), showcaps=True, boxprops={"edgecolor": "black", "linewidth": 1.5},
+                order=order, hue_order=order, ax=ax)
+    sns.stripplot(x="Group", y="Neg_Delta_Ct", data=gene_df, color="black", alpha=0.9, size=9, jitter=True,
+                  order=order, ax=ax)
+    _style_axes(ax, gene, "Expression")
+
+
+def draw_fold_change(ax, gene: str, gene_df: pd.DataFrame, summary: pd.DataFrame, order: list,
+                     palette: dict) -> None:
+    """Bars of mean fold change per group with SD error bars and the samples overlaid."""
+    import seaborn as sns
+
+    sns.barplot(x="Group", y="Fold_Change_Mean", hue="Group", data=summary, palette=palette, legend=False,
+                edgecolor="black", linewidth=1.5, order=order, hue_order=order, errorbar=None, ax=ax)
+    sns.stripplot(x="Group", y="Fold_Change", data=gene_df, color="black", alpha=0.9, size=9, jitter=True,
+                  order=order, ax=ax)
+    positions = pd.Index(order).get_indexer(summary["Group"])
+    ax.errorbar(x=positions, y=summary["Fold_Change_Mean"], yerr=summary["Fold_Change_SD"], fmt="none",
+                ecolor="red", capsize=5, elinewidth=1.5)
+    ax.axhline(y=1, color="gray", linestyle="--")
+    _style_axes(ax, gene, "Fold Change")
+
+
+def agg_figure(figsize: tuple[float, float]) -> Figure:
+    """An empty figure on the Agg canvas, not registered with ``pyplot``.
+
+    matplotlib (and seaborn, in the drawing functions) is imported on first
+    use, so importing this module for its data helpers stays cheap.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def gene_figure(kind: str, gene: str, frames: tuple, order: list, palette: dict) -> Figure:
+    """One gene's figure on an Agg canvas (not registered with ``pyplot``)."""
+    fig = agg_figure((1.3 * len(order), 5))
+    ax = fig.add_subplot()
+    gene_df, summary = frames
+    if kind == "delta_ct":
+        draw_delta_ct(ax, gene, gene_df, order, palette)
+    else:
+        draw_fold_change(ax, gene, gene_df, summary, order, palette)
+    return fig
+
+
+def render_png(fig: Figure, dpi: int = DEFAULT_DPI, tight: bool = True) -> bytes:
+    """PNG bytes of ``fig``; the figure is cleared afterwards so its memory is released.
+
+    ``tight=False`` keeps the figure's own layout, which saves a second draw.
+    """
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=dpi, bbox_inches="tight" if tight else None)
+    fig.clear()
+    return buffer.getvalue()
+
+
+def plot_filename(kind: str, gene: str) -> str:
+    """File name of a gene's figure, e.g. ``<gene>_deltaCT_expression.png``."""
+    return PLOT_KINDS[kind][1].format(gene=gene)
+
+
+def plot_path(kind: str, gene: str, plots_dir: str = "./plots") -> str:
+    """Where a gene's figure is written, e.g. ``./plots/deltaCT/<gene>_deltaCT_expression.png``."""
+    return os.path.join(plots_dir, PLOT_KINDS[kind][0], plot_filename(kind, gene))
+
+
+def plot_key(kind: str, gene: str, frames: tuple, order: list, palette: dict, dpi: int) -> str:
+    """Cache key of a gene's figure: its plotted data (not their row positions) plus the style."""
+    gene_df, summary = frames
+    gene_df = gene_df[PLOT_COLUMNS[kind]].reset_index(drop=True)
+    if summary is not None:
+        summary = summary.reset_index(drop=True)
+    return content_hash(PLOT_STYLE_VERSION, kind, str(gene), gene_df, summary, [str(group) for group in order],
+                        {str(group): tuple(color) for group, color in palette.items()}, int(dpi))
+
+
+def write_bytes(data: bytes, path: str) -> str:
+    """Write ``data`` atomically (temporary file + rename) and return ``path``."""
+    with atomic_path(path) as tmp_path, open(tmp_path, "wb") as file:
+        file.write(data)
+    return path
+
+
+def _init_worker(genes: dict) -> None:
+    global _worker_genes
+    _worker_genes = genes
+
+
+def _render_one(kind: str, gene: str, order: list, palette: dict, dpi: int, path: str) -> tuple[str, str]:
+    fig = gene_figure(kind, gene, _worker_genes[gene], order, palette)
+    return gene, write_bytes(render_png(fig, dpi), path)
+
+
+def iter_render_genes(
+    kind: str,
+    plot_df: pd.DataFrame,
+    genes: list | None = None,
+    plots_dir: str = "./plots",
+    dpi: int = DEFAULT_DPI,
+    palette: str = DEFAULT_PALETTE,
+    workers: int | None = None,
+    cache: PlotCache | None = None,
+):
+    """Render and write each gene's figure, yielding ``(gene, path)`` as soon as it is written.
+
+    ``plot_df`` comes from ``delta_ct_plot_data`` or ``fold_change_plot_data``;
+    ``genes`` defaults to every gene in it. Figures are rendered in
+    ``workers`` processes (all CPUs when ``None``); with ``workers=1``
+    everything runs in the calling process. Results arrive in completion
+    order, not ``genes`` order. With a ``cache``, figures are stored under
+    their ``plot_key`` instead of ``plots_dir``; cached genes are yielded
+    first without redrawing, and the cache is evicted afterwards (never the
+    images just yielded).
+    """
+    by_gene = split_genes(kind, plot_df)
+    genes = list(by_gene) if genes is None else [gene for gene in genes if gene in by_gene]
+    order = group_order(plot_df)
+    colors = group_palette(order, palette)
+
+    tasks = []
+    keys = set()
+    for gene in genes:
+        if cache is None:
+            tasks.append((kind, gene, order, colors, dpi, plot_path(kind, gene, plots_dir)))
+            continue
+        key = plot_key(kind, gene, by_gene[gene], order, colors, dpi)
+        keys.add(key)
+        cached = cache.get(key)
+        if cached is not None:
+            yield gene, cached
+        else:
+            tasks.append((kind, gene, order, colors, dpi, cache.path(key)))
+
+    yield from _render_tasks(tasks, {task[1]: by_gene[task[1]] for task in tasks}, workers or default_workers())
+    if cache is not None:
+        cache.evict(keep=keys)
+
+
+def _render_tasks(tasks: list[tuple], by_gene: dict, workers: int):
+    if workers <= 1 or len(tasks) <= 1:
+        _init_worker(by_gene)
+        for task in tasks:
+            yield _render_one(*task)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(tasks)),
+        mp_context=pool_context(),
+        initializer=_init_worker,
+        initargs=(by_gene,),
+    ) as executor:
+        futures = [executor.submit(_render_one, *task) for task in tasks]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,417 @@
+"""Persistent project store: studies, their merged wells and saved results in one SQLite file.
+
+Every well of every saved plate is a row of an indexed ``wells`` table, so a
+gene, sample, group or plate can be looked up across all studies without
+loading or re-merging anything. Each study also keeps:
+- its plate summaries and content hashes
+- its analysis results (as compressed Parquet blobs)
+- its session settings (replicate decisions, housekeeping genes, control group, ...)
+
+A study can therefore be reopened exactly as it was saved. The database is
+opened per call in WAL mode, so several app sessions and batch runs can read
+while one writes.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from qpcr.dataset import CANONICAL_COLUMNS, CANONICAL_DTYPES, OPTIONAL_DTYPES
+
+DEFAULT_PROJECT_PATH = "./results/qpcr_project.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS studies (
+    study_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS plates (
+    study_id INTEGER NOT NULL REFERENCES studies(study_id) ON DELETE CASCADE,
+    plate TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    content_hash TEXT,
+    summary TEXT NOT NULL,
+    PRIMARY KEY (study_id, plate)
+);
+CREATE TABLE IF NOT EXISTS wells (
+    study_id INTEGER NOT NULL REFERENCES studies(study_id) ON DELETE CASCADE,
+    plate TEXT NOT NULL,
+    well_index INTEGER NOT NULL,
+    well TEXT NOT NULL,
+    sample TEXT,
+    gene TEXT,
+    group_name TEXT,
+    cq REAL,
+    sq REAL
+);
+CREATE INDEX IF NOT EXISTS wells_study_plate ON wells (study_id, plate);
+CREATE INDEX IF NOT EXISTS wells_gene ON wells (gene, study_id);
+CREATE INDEX IF NOT EXISTS wells_sample ON wells (sample, study_id);
+CREATE INDEX IF NOT EXISTS wells_group ON wells (group_name, study_id);
+CREATE TABLE IF NOT EXISTS results (
+    study_id INTEGER NOT NULL REFERENCES studies(study_id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (study_id, name)
+);
+CREATE TABLE IF NOT EXISTS settings (
+    study_id INTEGER NOT NULL REFERENCES studies(study_id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (study_id, name)
+);
+"""
+
+# Well columns in the database → canonical merged columns
+_WELL_COLUMNS = {"plate": "Plate", "well_index": "Well_Index", "well": "Well", "sample": "Sample", "gene": "Gene",
+                 "group_name": "Group", "cq": "Cq", "sq": "SQ"}
+# Session-state keys (also ``qpcr.pipeline.analyze`` result keys) saved with a study
+RESULT_KEYS = ["filtered_merged_data", "mean_cq_df", "normalized_qPCR_df", "fold_change_qPCR_df", "contrast_qPCR_df",
+               "pfaffl_qPCR_df", "statistics_qPCR_df", "anova_qPCR_df"]
+SETTING_KEYS = ["user_decisions", "found_genes", "control_group", "selected_groups", "contrasts"]
+_FILTERS = {"studies": "s.name", "plates": "w.plate", "samples": "w.sample", "genes": "w.gene",
+            "groups": "w.group_name"}
+
+
+def _plain(value):
+    """JSON-safe copy of ``value`` (numpy scalars become Python numbers, tuples become lists)."""
+    if isinstance(value, dict):
+        return {str(key): _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _column(df: pd.DataFrame, column: str) -> list:
+    values = df[column].astype(object)
+    return values.where(values.notna(), None).tolist()
+
+
+class ProjectStore:
+    """Studies saved in the SQLite database at ``path`` (created on first use)."""
+
+    def __init__(self, path: str = DEFAULT_PROJECT_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    def _study_id(self, conn: sqlite3.Connection, study: str, create: bool = False) -> int:
+        row = conn.execute("SELECT study_id FROM studies WHERE name = ?", (study,)).fetchone()
+        if row is not None:
+            if create:
+                conn.execute("UPDATE studies SET updated = ? WHERE study_id = ?", (time.time(), row[0]))
+            return row[0]
+        if not create:
+            raise KeyError(f"Unknown study '{study}'")
+        now = time.time()
+        return conn.execute("INSERT INTO studies (name, created, updated) VALUES (?, ?, ?)",
+                            (study, now, now)).lastrowid
+
+    # Studies
+
+    def studies(self) -> pd.DataFrame:
+        """One row per study: ``Study``, ``Plates``, ``Wells`` and ``Updated`` (most recent first)."""
+        with closing(self._connect()) as conn:
+            df = pd.read_sql_query(
+                "SELECT s.name AS Study,"
+                " (SELECT COUNT(*) FROM plates p WHERE p.study_id = s.study_id) AS Plates,"
+                " (SELECT COUNT(*) FROM wells w WHERE w.study_id = s.study_id) AS Wells,"
+                " s.updated AS Updated"
+                " FROM studies s ORDER BY s.updated DESC",
+                conn,
+            )
+        df["Updated"] = pd.to_datetime(df["Updated"], unit="s")
+        return df
+
+    def delete_study(self, study: str) -> None:
+        """Remove a study with its wells, results and settings."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM studies WHERE study_id = ?", (self._study_id(conn, study),))
+
+    # Plates and wells
+
+    def save_plates(
+        self,
+        study: str,
+        merged_df: pd.DataFrame,
+        summaries: dict[str, dict],
+        hashes: dict[str, str] | None = None,
+    ) -> None:
+        """Add (or replace) the plates of ``merged_df`` in ``study``, creating the study if needed.
+
+        ``summaries`` are the per-plate summaries from the merge and ``hashes``
+        the plates' content hashes, if known. Plates of the study that are not
+        in ``merged_df`` are kept.
+        """
+        with closing(self._connect()) as conn, conn:
+            self._save_plates(conn, self._study_id(conn, study, create=True), merged_df, summaries, hashes)
+
+    @staticmethod
+    def _save_plates(conn: sqlite3.Connection, study_id: int, merged_df: pd.DataFrame, summaries: dict[str, dict],
+                     hashes: dict[str, str] | None) -> None:
+        hashes = hashes or {}
+        plates = [str(plate) for plate in summaries]
+        conn.executemany("DELETE FROM wells WHERE study_id = ? AND plate = ?",
+                         [(study_id, plate) for plate in plates])
+        first = conn.execute("SELECT COALESCE(MAX(position) + 1, 0) FROM plates WHERE study_id = ?",
+                             (study_id,)).fetchone()[0]
+        conn.executemany(
+            "INSERT INTO plates (study_id, plate, position, content_hash, summary) VALUES (?, ?, ?, ?, ?)"
+            " ON CONFLICT (study_id, plate) DO UPDATE SET content_hash = excluded.content_hash,"
+            " summary = excluded.summary",
+            [(study_id, plate, first + position, hashes.get(plate), json.dumps(_plain(summaries[plate])))
+             for position, plate in enumerate(plates)],
+        )
+        sq = _column(merged_df, "SQ") if "SQ" in merged_df.columns else [None] * len(merged_df)
+        conn.executemany(
+            "INSERT INTO wells (study_id, plate, well_index, well, sample, gene, group_name, cq, sq)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            zip([study_id] * len(merged_df), _column(merged_df, "Plate"),
+                merged_df["Well_Index"].astype(int).tolist(), _column(merged_df, "Well"),
+                _column(merged_df, "Sample"), _column(merged_df, "Gene"), _column(merged_df, "Group"),
+                _column(merged_df, "Cq"), sq),
+        )
+
+    def remove_plates(self, study: str, plates: list[str]) -> None:
+        """Drop ``plates`` and their wells from ``study``."""
+        with closing(self._connect()) as conn, conn:
+            self._remove_plates(conn, self._study_id(conn, study), plates)
+
+    @staticmethod
+    def _remove_plates(conn: sqlite3.Connection, study_id: int, plates: list[str]) -> None:
+        for table in ("wells", "plates"):
+            conn.executemany(f"DELETE FROM {table} WHERE study_id = ? AND plate = ?",
+                             [(study_id, str(plate)) for plate in plates])
+
+    def plates(self, study: str) -> list[str]:
+        """Plates of ``study`` in saved order."""
+        with closing(self._connect()) as conn:
+            return self._plates(conn, self._study_id(conn, study))
+
+    @staticmethod
+    def _plates(conn: sqlite3.Connection, study_id: int) -> list[str]:
+        rows = conn.execute("SELECT plate FROM plates WHERE study_id = ? ORDER BY position", (study_id,))
+        return [row[0] for row in rows]
+
+    def plate_hashes(self, study: str) -> dict[str, str]:
+        """``{plate: content hash}`` of the plates saved with a hash."""
+        with closing(self._connect()) as conn:
+            return self._plate_hashes(conn, self._study_id(conn, study))
+
+    @staticmethod
+    def _plate_hashes(conn: sqlite3.Connection, study_id: int) -> dict[str, str]:
+        rows = conn.execute(
+            "SELECT plate, content_hash FROM plates WHERE study_id = ? AND content_hash IS NOT NULL"
+            " ORDER BY position",
+            (study_id,),
+        ).fetchall()
+        return dict(rows)
+
+    def load_study(self, study: str) -> tuple[pd.DataFrame, dict[str, dict]]:
+        """The study's merged wells in the canonical schema (plates in saved order) and plate summaries.
+
+        Raises ``KeyError`` for an unknown study.
+        """
+        with closing(self._connect()) as conn:
+            return self._load_study(conn, self._study_id(conn, study))
+
+    def _load_study(self, conn: sqlite3.Connection, study_id: int) -> tuple[pd.DataFrame, dict[str, dict]]:
+        summaries = {plate: json.loads(summary) for plate, summary in conn.execute(
+            "SELECT plate, summary FROM plates WHERE study_id = ? ORDER BY position", (study_id,)
+        )}
+        df = pd.read_sql_query(
+            "SELECT w.plate, w.well_index, w.well, w.sample, w.gene, w.group_name, w.cq, w.sq"
+            " FROM wells w JOIN plates p ON p.study_id = w.study_id AND p.plate = w.plate"
+            " WHERE w.study_id = ? ORDER BY p.position, w.rowid",
+            conn, params=(study_id,),
+        )
+        return self._canonical(df), summaries
+
+    def distinct(self, column: str) -> list[str]:
+        """Sorted distinct values of ``Plate``, ``Sample``, ``Gene`` or ``Group`` over all studies."""
+        name = {value: key for key, value in _WELL_COLUMNS.items()}[column]
+        with closing(self._connect()) as conn:
+            rows = conn.execute(f"SELECT DISTINCT {name} FROM wells WHERE {name} IS NOT NULL ORDER BY {name}")
+            return [row[0] for row in rows]
+
+    def query_wells(
+        self,
+        genes: list[str] | None = None,
+        samples: list[str] | None = None,
+        groups: list[str] | None = None,
+        plates: list[str] | None = None,
+        studies: list[str] | None = None,
+    ) -> pd.DataFrame:
+        """Wells of every study matching all given filters, with a ``Study`` column first.
+
+        Each filter keeps rows whose value is in the list; the lookup uses the
+        ``wells`` indexes, so one gene across many studies reads only its rows.
+        """
+        values = {"studies": studies, "plates": plates, "samples": samples, "genes": genes, "groups": groups}
+        clauses, params = [], []
+        for name, keep in values.items():
+            if keep is not None:
+                keep = [str(value) for value in keep]
+                clauses.append(f"{_FILTERS[name]} IN ({', '.join('?' * len(keep))})" if keep else "0")
+                params.extend(keep)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with closing(self._connect()) as conn:
+            df = pd.read_sql_query(
+                "SELECT s.name AS study, w.plate, w.well_index, w.well, w.sample, w.gene, w.group_name, w.cq, w.sq"
+                " FROM wells w JOIN studies s ON s.study_id = w.study_id"
+                f"{where} ORDER BY s.name, w.plate, w.rowid",
+                conn, params=params,
+            )
+        study_column = df.pop("study").astype("category")
+        df = self._canonical(df)
+        df.insert(0, "Study", study_column)
+        return df
+
+    @staticmethod
+    def _canonical(df: pd.DataFrame) -> pd.DataFrame:
+        df = df.rename(columns=_WELL_COLUMNS)
+        # Only studies with standard-curve wells carry SQ, as after a merge
+        columns = CANONICAL_COLUMNS + (["SQ"] if df["SQ"].notna().any() else [])
+        dtypes = {**CANONICAL_DTYPES, **OPTIONAL_DTYPES}
+        return df[columns].astype({column: dtypes[column] for column in columns})
+
+    # Results and settings
+
+    def save_results(self, study: str, tables: dict[str, pd.DataFrame], replace: bool = False) -> None:
+        """Store (or replace) result tables of ``study`` by name; ``replace`` drops its other tables."""
+        blobs = self._result_blobs(tables)
+        with closing(self._connect()) as conn, conn:
+            self._save_results(conn, self._study_id(conn, study, create=True), blobs, replace)
+
+    @staticmethod
+    def _result_blobs(tables: dict[str, pd.DataFrame]) -> list[tuple[str, bytes]]:
+        blobs = []
+        for name, df in tables.items():
+            buffer = io.BytesIO()
+            pq.write_table(pa.Table.from_pandas(df), buffer, compression="zstd")
+            blobs.append((name, buffer.getvalue()))
+        return blobs
+
+    @staticmethod
+    def _save_results(conn: sqlite3.Connection, study_id: int, blobs: list[tuple[str, bytes]], replace: bool) -> None:
+        if replace:
+            conn.execute("DELETE FROM results WHERE study_id = ?", (study_id,))
+        conn.executemany("INSERT OR REPLACE INTO results (study_id, name, data) VALUES (?, ?, ?)",
+                         [(study_id, name, blob) for name, blob in blobs])
+
+    def load_results(self, study: str, names: list[str] | None = None) -> dict[str, pd.DataFrame]:
+        """``{name: table}`` of the study's saved results (all, or only ``names``)."""
+        with closing(self._connect()) as conn:
+            return self._load_results(conn, self._study_id(conn, study), names)
+
+    @staticmethod
+    def _load_results(conn: sqlite3.Connection, study_id: int, names: list[str] | None = None) -> dict:
+        rows = conn.execute("SELECT name, data FROM results WHERE study_id = ?", (study_id,)).fetchall()
+        return {name: pq.read_table(pa.BufferReader(data)).to_pandas() for name, data in rows
+                if names is None or name in names}
+
+    def save_settings(self, study: str, settings: dict, replace: bool = False) -> None:
+        """Store (or replace) JSON-serializable settings of ``study`` by name; ``replace`` drops its others.
+
+        Tuples come back as lists.
+        """
+        with closing(self._connect()) as conn, conn:
+            self._save_settings(conn, self._study_id(conn, study, create=True), settings, replace)
+
+    @staticmethod
+    def _save_settings(conn: sqlite3.Connection, study_id: int, settings: dict, replace: bool) -> None:
+        if replace:
+            conn.execute("DELETE FROM settings WHERE study_id = ?", (study_id,))
+        conn.executemany("INSERT OR REPLACE INTO settings (study_id, name, value) VALUES (?, ?, ?)",
+                         [(study_id, name, json.dumps(_plain(value))) for name, value in settings.items()])
+
+    def load_settings(self, study: str) -> dict:
+        """``{name: value}`` of the study's saved settings."""
+        with closing(self._connect()) as conn:
+            return self._load_settings(conn, self._study_id(conn, study))
+
+    @staticmethod
+    def _load_settings(conn: sqlite3.Connection, study_id: int) -> dict:
+        rows = conn.execute("SELECT name, value FROM settings WHERE study_id = ?", (study_id,)).fetchall()
+        return {name: json.loads(value) for name, value in rows}
+
+    # Whole analyses
+
+    def save_analysis(
+        self,
+        study: str,
+        analysis: dict,
+        hashes: dict[str, str] | None = None,
+        groups_df: pd.DataFrame | None = None,
+    ) -> None:
+        """Save an analysis keyed like the app's session state as ``study``.
+
+        ``analysis`` needs ``merged_data`` and ``summary``. Its plates, its
+        ``RESULT_KEYS`` tables and its ``SETTING_KEYS`` values replace the
+        study's saved ones. ``groups_df`` is kept so plates can be re-merged
+        incrementally. Everything is written in one transaction, so readers
+        see either the old study or the new one, never a mix.
+        """
+        tables = {key: analysis[key] for key in RESULT_KEYS if analysis.get(key) is not None}
+        if groups_df is not None:
+            tables["groups"] = groups_df
+        blobs = self._result_blobs(tables)
+        settings = {key: analysis[key] for key in SETTING_KEYS if analysis.get(key) is not None}
+        with closing(self._connect()) as conn, conn:
+            study_id = self._study_id(conn, study, create=True)
+            self._save_plates(conn, study_id, analysis["merged_data"], analysis["summary"], hashes)
+            removed = [plate for plate in self._plates(conn, study_id) if plate not in analysis["summary"]]
+            self._remove_plates(conn, study_id, removed)
+            self._save_results(conn, study_id, blobs, replace=True)
+            self._save_settings(conn, study_id, settings, replace=True)
+
+    def load_analysis(self, study: str) -> dict:
+        """A saved study keyed like the app's session state (``None`` for results it does not have).
+
+        Also returns ``groups_df`` and ``plate_hashes``. Raises ``KeyError``
+        for an unknown study. Everything is read from one snapshot of the database.
+        """
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN")
+            study_id = self._study_id(conn, study)
+            merged_df, summaries = self._load_study(conn, study_id)
+            tables = self._load_results(conn, study_id)
+            settings = self._load_settings(conn, study_id)
+            plate_hashes = self._plate_hashes(conn, study_id)
+            conn.rollback()
+        if settings.get("contrasts") is not None:
+            settings["contrasts"] = [tuple(pair) for pair in settings["contrasts"]]
+        return {
+            "merged_data": merged_df,
+            "summary": summaries,
+            **{key: tables.get(key) for key in RESULT_KEYS},
+            **{key: settings.get(key) for key in SETTING_KEYS},
+            "groups_df": tables.get("groups"),
+            "plate_hashes": plate_hashes,
+        }
+
+
+def default_project_store() -> ProjectStore:
+    """The app's project store (``QPCR_PROJECT_DB`` overrides its path)."""
+    return ProjectStore(os.environ.get("QPCR_PROJECT_DB", DEFAULT_PROJECT_PATH))
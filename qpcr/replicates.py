@@ -0,0 +1,157 @@
+"""Technical replicate review: flag high-variation pairs and apply removals."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+ACTIONS = ["Keep All", "Remove Specific", "Remove All"]
+GROUP_KEYS = ["Sample", "Gene"]
+
+
+def decision_key(sample: str, gene: str) -> str:
+    """Key used for a Sample-Gene pair in the ``user_decisions`` dict."""
+    return f"{sample}__{gene}"
+
+
+def parse_decision_key(key: str) -> tuple[str, str]:
+    """Split a ``user_decisions`` key back into ``(sample, gene)``."""
+    sample, gene = key.split("__")
+    return sample, gene
+
+
+def invalid_decision_keys(user_decisions: dict) -> list[str]:
+    """Keys of ``user_decisions`` that do not split into a Sample-Gene pair."""
+    return [key for key in user_decisions if key.count("__") != 1]
+
+
+def replicate_stats(df: pd.DataFrame) -> pd.DataFrame:
+    """Replicate QC statistics for every Sample-Gene pair in one grouped pass.
+
+    Columns: ``n_Replicates``, ``min_Cq``, ``max_Cq``, ``Cq_diff`` (spread),
+    ``Cq_Mean``, ``Cq_SD``, ``Cq_CV`` (%), ``Cq_Median`` and the well furthest
+    from the median (``Outlier_Well`` / ``Outlier_Cq``).
+    """
+    grouped = df.groupby(GROUP_KEYS, sort=True, observed=True)
+    stats = grouped["Cq"].agg(["count", "min", "max", "mean", "std", "median"])
+    stats.columns = ["n_Replicates", "min_Cq", "max_Cq", "Cq_Mean", "Cq_SD", "Cq_Median"]
+    stats.insert(3, "Cq_diff", stats["max_Cq"] - stats["min_Cq"])
+    stats["Cq_CV"] = stats["Cq_SD"] / stats["Cq_Mean"] * 100
+
+    # Outlier: the row furthest from its group's median, picked by one sort over all rows
+    codes = grouped.ngroup().to_numpy()
+    cq = df["Cq"].to_numpy(dtype=float)
+    in_group = codes >= 0
+    deviation = np.abs(cq - stats["Cq_Median"].to_numpy()[np.where(in_group, codes, 0)])
+    deviation = np.where(in_group & ~np.isnan(deviation), deviation, -1.0)
+    order = np.lexsort((-deviation, codes))
+    order = order[in_group[order]]
+    first = order[np.r_[True, codes[order][1:] != codes[order][:-1]]] if len(order) else order
+
+    has_outlier = deviation[first] >= 0
+    stats["Outlier_Well"] = np.where(has_outlier, df["Well"].to_numpy(dtype=object)[first], None)
+    stats["Outlier_Cq"] = np.where(has_outlier, cq[first], np.nan)
+    return stats.reset_index()
+
+
+def index_replicates(df: pd.DataFrame) -> dict[tuple, np.ndarray]:
+    """Positional row indexes of every Sample-Gene pair, for ``df.iloc`` lookups."""
+    return df.groupby(GROUP_KEYS, sort=False, observed=True).indices
+
+
+def flag_replicates(
+    df: pd.DataFrame,
+    threshold: float,
+    user_decisions: dict | None = None,
+    stats: pd.DataFrame | None = None,
+) -> pd.DataFrame:
+    """Sample-Gene pairs whose Cq spread exceeds ``threshold``.
+
+    Pairs that already have an entry in ``user_decisions`` are left out. Pass
+    precomputed ``replicate_stats`` as ``stats`` to skip the grouped pass.
+    """
+    if stats is None:
+        stats = replicate_stats(df)
+    flagged = stats[stats["Cq_diff"] > threshold]
+
+    if user_decisions:
+        keys = flagged["Sample"].astype(str) + "__" + flagged["Gene"].astype(str)
+        flagged = flagged[~keys.isin(user_decisions)]
+
+    return flagged
+
+
+def review_queue(
+    stats: pd.DataFrame,
+    threshold: float,
+    user_decisions: dict,
+    sort_by: str = "Cq_diff",
+    ascending: bool = False,
+    unreviewed_only: bool = False,
+) -> pd.DataFrame:
+    """Flagged pairs in review order, with a ``Reviewed`` column.
+
+    ``stats`` comes from ``replicate_stats``. Sorting is stable, so ties keep
+    Sample-Gene order.
+    """
+    queue = stats[stats["Cq_diff"] > threshold]
+    keys = queue["Sample"].astype(str) + "__" + queue["Gene"].astype(str)
+    queue = queue.assign(Reviewed=keys.isin(user_decisions).to_numpy())
+    if unreviewed_only:
+        queue = queue[~queue["Reviewed"]]
+    return queue.sort_values(sort_by, ascending=ascending, kind="stable").reset_index(drop=True)
+
+
+def page_count(n_items: int, page_size: int) -> int:
+    """Number of pages needed for ``n_items`` (at least 1)."""
+    return max(1, -(-n_items // page_size))
+
+
+def paginate(queue: pd.DataFrame, page: int, page_size: int) -> pd.DataFrame:
+    """Rows of ``queue`` on 1-based ``page``."""
+    start = (page - 1) * page_size
+    return queue.iloc[start:start + page_size]
+
+
+def next_unreviewed_page(queue: pd.DataFrame, page_size: int, current_page: int = 0) -> int | None:
+    """First page after ``current_page`` holding an unreviewed pair, wrapping around.
+
+    Returns ``None`` when every pair in ``queue`` has been reviewed.
+    """
+    positions = np.flatnonzero(~queue["Reviewed"].to_numpy())
+    if not len(positions):
+        return None
+    pages = positions // page_size + 1
+    later = pages[pages > current_page]
+    return int(later[0] if len(later) else pages[0])
+
+
+def apply_decisions(df: pd.DataFrame, user_decisions: dict) -> pd.DataFrame:
+    """Drop the wells selected for removal in ``user_decisions``.
+
+    All decisions are applied as a single anti-join on Sample-Gene(-Well).
+    Keys that cannot be parsed (see ``invalid_decision_keys``) are skipped.
+    """
+    remove_pairs = []
+    remove_wells = []
+
+    for key, decision in user_decisions.items():
+        try:
+            sample, gene = parse_decision_key(key)
+        except ValueError:
+            continue
+        action = decision["action"]
+        well_to_remove = decision.get("well", None)
+
+        if action == "Remove Specific" and well_to_remove:
+            remove_wells.append((sample, gene, well_to_remove))
+        elif action == "Remove All":
+            remove_pairs.append((sample, gene))
+
+    removed = np.zeros(len(df), dtype=bool)
+    if remove_pairs:
+        removed |= pd.MultiIndex.from_arrays([df["Sample"], df["Gene"]]).isin(remove_pairs)
+    if remove_wells:
+        removed |= pd.MultiIndex.from_arrays([df["Sample"], df["Gene"], df["Well"]]).isin(remove_wells)
+
+    return df[~removed] if removed.any() else df
@@ -0,0 +1,311 @@
+"""Per-gene hypothesis tests and bootstrap confidence intervals on ΔCt, batched across genes.
+
+Welch t-tests and one-way ANOVA only need the count, mean and sum of squared
+deviations of every (Group, Gene) cell, which are accumulated with
+``np.bincount`` for all genes at once. Bootstrap intervals resample samples
+(not wells) within each group: every resample is a row of multinomial counts,
+so the resampled means of all genes are one matrix product
+``counts @ ΔCt`` per group. Each group draws from its own seeded stream, so
+results do not depend on which contrasts are asked for, the gene chunking or
+the number of workers.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from qpcr.contrasts import all_contrasts, contrast_name
+from qpcr.ingest import pool_context
+from qpcr.matrix import SampleGeneMatrix, key_codes
+from qpcr.normalization import replace_infinite
+
+DEFAULT_RESAMPLES = 10_000
+
+# Resampled means held in memory at once (float64 values) when bootstrapping
+_BOOTSTRAP_BUDGET = 1 << 24
+
+# Set once per worker by the pool initializer so resampling counts are pickled per worker, not per chunk
+_worker_counts: dict[int, np.ndarray] | None = None
+
+
+def benjamini_hochberg(p_values: np.ndarray) -> np.ndarray:
+    """Benjamini–Hochberg adjusted p-values (q-values) along the last axis.
+
+    NaN p-values are ignored and stay NaN; each row of a 2-D array is
+    adjusted on its own (e.g. one row per contrast, one column per gene).
+    """
+    p = np.asarray(p_values, dtype=float)
+    rows = np.atleast_2d(p)
+    order = np.argsort(rows, axis=-1)  # NaN sorts last
+    ranked = np.take_along_axis(rows, order, axis=-1)
+    m = (~np.isnan(rows)).sum(axis=-1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        scaled = ranked * m / np.arange(1, rows.shape[-1] + 1)
+    # Running minimum from the largest p-value down; NaNs (at the end) must not poison it
+    scaled = np.where(np.isnan(scaled), np.inf, scaled)
+    adjusted = np.minimum.accumulate(scaled[..., ::-1], axis=-1)[..., ::-1]
+    adjusted = np.where(np.isnan(ranked), np.nan, np.minimum(adjusted, 1.0))
+    q = np.empty_like(rows)
+    np.put_along_axis(q, order, adjusted, axis=-1)
+    return q.reshape(p.shape)
+
+
+def group_moments(normalized_df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray, np.ndarray, pd.Index, pd.Index]:
+    """Count, mean and sum of squared deviations of finite ΔCt per (Group, Gene).
+
+    Returns ``(n, mean, ss, groups, genes)`` with ``(n_groups, n_genes)`` arrays;
+    cells without values have ``n == 0`` and NaN mean.
+    """
+    group_codes, groups = key_codes(normalized_df["Group"])
+    gene_codes, genes = key_codes(normalized_df["Gene"])
+    delta = normalized_df["Normalized_Cq"].to_numpy(dtype=float)
+
+    valid = (group_codes >= 0) & (gene_codes >= 0) & np.isfinite(delta)
+    cells = group_codes[valid] * len(genes) + gene_codes[valid]
+    delta = delta[valid]
+    size = len(groups) * len(genes)
+    n = np.bincount(cells, minlength=size)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(n > 0, np.bincount(cells, weights=delta, minlength=size) / n, np.nan)
+    # Two passes (deviations from the cell mean) rather than Σx² - n·mean², which cancels badly at Cq scale
+    ss = np.bincount(cells, weights=(delta - mean[cells]) ** 2, minlength=size)
+    shape = (len(groups), len(genes))
+    return n.reshape(shape), mean.reshape(shape), ss.reshape(shape), groups, genes
+
+
+def _contrast_codes(groups: pd.Index, contrasts: list[tuple[str, str]]) -> tuple[np.ndarray, np.ndarray]:
+    unknown = [name for pair in contrasts for name in pair if name not in groups]
+    if unknown:
+        raise ValueError(f"Unknown groups in contrasts: {', '.join(map(str, dict.fromkeys(unknown)))}")
+    return (groups.get_indexer([treatment for treatment, _ in contrasts]),
+            groups.get_indexer([control for _, control in contrasts]))
+
+
+def _present_contrasts(normalized_df: pd.DataFrame, contrasts: list[tuple[str, str]] | None) -> list[tuple[str, str]]:
+    if contrasts is None:
+        return all_contrasts(normalized_df["Group"].dropna().unique().tolist())
+    return list(dict.fromkeys((treatment, control) for treatment, control in contrasts))
+
+
+def _long_table(contrasts: list[tuple[str, str]], groups: pd.Index, genes: pd.Index,
+                columns: dict[str, np.ndarray]) -> pd.DataFrame:
+    """One row per (contrast, gene) from ``(n_contrasts, n_genes)`` arrays."""
+    treatment_codes, control_codes = _contrast_codes(groups, contrasts)
+    contrast_ids = np.repeat(np.arange(len(contrasts)), len(genes))
+    table = pd.DataFrame({
+        "Contrast": pd.Categorical.from_codes(contrast_ids, [contrast_name(t, c) for t, c in contrasts]),
+        "Treatment": pd.Categorical.from_codes(treatment_codes[contrast_ids], groups),
+        "Control": pd.Categorical.from_codes(control_codes[contrast_ids], groups),
+        "Gene": pd.Categorical.from_codes(np.tile(np.arange(len(genes)), len(contrasts)), genes),
+    })
+    for name, values in columns.items():
+        table[name] = values.ravel()
+    return table
+
+
+def welch_tests(normalized_df: pd.DataFrame, contrasts: list[tuple[str, str]] | None = None) -> pd.DataFrame:
+    """Welch two-sample t-test on ΔCt for every ``(treatment, control)`` contrast and gene.
+
+    ``Delta_Delta_Ct`` is the difference of the groups' mean ΔCt and
+    ``Fold_Change`` its ``2^-ΔΔCt``. ``q_value`` is the Benjamini–Hochberg
+    adjustment over the genes of each contrast. Genes with fewer than two
+    values in either group get NaN statistics. ``contrasts`` defaults to
+    every ordered pair of groups; raises ``ValueError`` for unknown groups.
+    """
+    from scipy import stats as distributions  # imported on first use; it is slow to import
+
+    contrasts = _present_contrasts(normalized_df, contrasts)
+    n, mean, ss, groups, genes = group_moments(normalized_df)
+    treatment, control = _contrast_codes(groups, contrasts)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var = np.where(n > 1, ss / (n - 1), np.nan)
+        se_t, se_c = var[treatment] / n[treatment], var[control] / n[control]
+        se2 = se_t + se_c
+        diff = mean[treatment] - mean[control]
+        t = diff / np.sqrt(se2)
+        df = se2 ** 2 / (se_t ** 2 / (n[treatment] - 1) + se_c ** 2 / (n[control] - 1))
+        p = 2 * distributions.t.sf(np.abs(t), df)
+
+    return _long_table(contrasts, groups, genes, {
+        "n_Treatment": n[treatment],
+        "n_Control": n[control],
+        "Delta_Delta_Ct": diff,
+        "Fold_Change": 2 ** (-diff),
+        "t": t,
+        "df": df,
+        "p_value": p,
+        "q_value": benjamini_hochberg(p),
+    })
+
+
+def anova(normalized_df: pd.DataFrame, groups: list[str] | None = None) -> pd.DataFrame:
+    """One-way ANOVA of ΔCt across ``groups`` (default: all) for every gene.
+
+    Groups without values for a gene are left out of that gene's test.
+    ``q_value`` is the Benjamini–Hochberg adjustment over genes.
+    """
+    from scipy import stats as distributions
+
+    if groups is not None:
+        normalized_df = normalized_df[normalized_df["Group"].isin(list(groups))]
+    n, mean, ss, _, genes = group_moments(normalized_df)
+
+    total = n.sum(axis=0)
+    k = (n > 0).sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        grand = np.where(n > 0, n * mean, 0).sum(axis=0) / total
+        ss_between = np.where(n > 0, n * (mean - grand) ** 2, 0).sum(axis=0)
+        ss_within = ss.sum(axis=0)
+        df_between, df_within = k - 1, total - k
+        usable = (df_between > 0) & (df_within > 0)
+        f = np.where(usable, (ss_between / df_between) / (ss_within / df_within), np.nan)
+        p = np.where(usable, distributions.f.sf(f, df_between, df_within), np.nan)
+
+    return pd.DataFrame({
+        "Gene": pd.Categorical(genes, categories=genes),
+        "n_Groups": k,
+        "n": total,
+        "df_Between": df_between,
+        "df_Within": df_within,
+        "F": f,
+        "p_value": p,
+        "q_value": benjamini_hochberg(p),
+    })
+
+
+def _init_worker(counts: dict[int, np.ndarray]) -> None:
+    global _worker_counts
+    _worker_counts = counts
+
+
+def _bootstrap_chunk(
+    values: dict[int, np.ndarray],
+    treatment: np.ndarray,
+    control: np.ndarray,
+    levels: tuple[float, float],
+) -> np.ndarray:
+    """Percentile interval of ΔΔCt for one chunk of genes, shape ``(2, n_contrasts, n_chunk_genes)``."""
+    means = {}
+    for code, delta in values.items():
+        counts = _worker_counts[code]
+        valid = ~np.isnan(delta)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means[code] = (counts @ np.where(valid, delta, 0.0)) / (counts @ valid)
+
+    n_genes = next(iter(values.values())).shape[1]
+    bounds = np.full((2, len(treatment), n_genes), np.nan)
+    for k, (t, c) in enumerate(zip(treatment, control)):
+        resampled = means[t] - means[c]
+        bounds[:, k] = np.quantile(resampled, levels, axis=0)
+        missing = np.isnan(resampled)
+        # Resamples that drew no value for a gene are dropped, not propagated; genes with none at all stay NaN
+        partial = missing.any(axis=0) & ~missing.all(axis=0)
+        if partial.any():
+            bounds[:, k, partial] = np.nanquantile(resampled[:, partial], levels, axis=0)
+    return bounds
+
+
+def bootstrap_fold_change(
+    normalized_df: pd.DataFrame,
+    contrasts: list[tuple[str, str]] | None = None,
+    n_resamples: int = DEFAULT_RESAMPLES,
+    confidence: float = 0.95,
+    seed: int = 0,
+    workers: int = 1,
+    progress=None,
+) -> pd.DataFrame:
+    """Percentile bootstrap confidence intervals for ΔΔCt and fold change.
+
+    Samples are resampled with replacement within the treatment and control
+    groups; the statistic is the difference of the groups' mean ΔCt, as in
+    ``welch_tests``. Returns one row per (contrast, gene), in the same order
+    as ``welch_tests``, with ``Delta_Delta_Ct_CI_Low``/``High`` and
+    ``Fold_Change_CI_Low``/``High``. Genes are processed in chunks, across
+    ``workers`` processes when more than one; the same ``seed`` gives the
+    same intervals for any chunking or worker count. ``progress`` is called as
+    ``progress(done, total)`` after each chunk.
+    """
+    contrasts = _present_contrasts(normalized_df, contrasts)
+    df = replace_infinite(normalized_df).reset_index(drop=True)
+    matrix = SampleGeneMatrix(df, "Normalized_Cq")
+    group_codes, groups = key_codes(df["Group"])
+    treatment, control = _contrast_codes(groups, contrasts)
+
+    # Group of every sample (a sample belongs to one group)
+    sample_group = np.full(len(matrix.samples), -1)
+    present = (matrix.sample_codes >= 0) & (group_codes >= 0)
+    sample_group[matrix.sample_codes[present]] = group_codes[present]
+
+    # Multinomial resampling counts per group, each from its own seeded stream
+    used = np.unique(np.concatenate([treatment, control]))
+    streams = np.random.SeedSequence(seed).spawn(len(groups))
+    members = {code: np.flatnonzero(sample_group == code) for code in used}
+    counts = {}
+    for code in used:
+        size = len(members[code])
+        rng = np.random.default_rng(streams[code])
+        counts[code] = (rng.multinomial(size, np.full(size, 1 / size), size=n_resamples).astype(float)
+                        if size else np.zeros((n_resamples, 0)))
+
+    alpha = (1 - confidence) / 2
+    levels = (alpha, 1 - alpha)
+    n_genes = len(matrix.genes)
+    chunk = max(1, _BOOTSTRAP_BUDGET // (n_resamples * max(len(used), 1)))
+    chunks = [slice(start, min(start + chunk, n_genes)) for start in range(0, n_genes, chunk)]
+    tasks = [({code: matrix.values[members[code], span] for code in used}, treatment, control, levels)
+             for span in chunks]
+
+    executor = None
+    if workers <= 1 or len(tasks) <= 1:
+        _init_worker(counts)
+        chunk_results = (_bootstrap_chunk(*task) for task in tasks)
+    else:
+        executor = ProcessPoolExecutor(max_workers=min(workers, len(tasks)), mp_context=pool_context(),
+                                       initializer=_init_worker, initargs=(counts,))
+        chunk_results = executor.map(_bootstrap_chunk, *zip(*tasks))
+    results = []
+    try:
+        for result in chunk_results:
+            results.append(result)
+            if progress is not None:
+                progress(len(results), len(tasks))
+    finally:
+        # If progress raises (e.g. a cancelled job), chunks not yet started are dropped
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    bounds = np.concatenate(results, axis=2) if results else np.full((2, len(contrasts), 0), np.nan)
+    low, high = bounds
+    return _long_table(contrasts, groups, matrix.genes, {
+        "Delta_Delta_Ct_CI_Low": low,
+        "Delta_Delta_Ct_CI_High": high,
+        "Fold_Change_CI_Low": 2 ** (-high),
+        "Fold_Change_CI_High": 2 ** (-low),
+    })
+
+
+def contrast_statistics(
+    normalized_df: pd.DataFrame,
+    contrasts: list[tuple[str, str]] | None = None,
+    n_resamples: int = DEFAULT_RESAMPLES,
+    confidence: float = 0.95,
+    seed: int = 0,
+    workers: int = 1,
+    progress=None,
+) -> pd.DataFrame:
+    """``welch_tests`` with the bootstrap fold-change intervals as extra columns.
+
+    With ``n_resamples=0`` only the tests are computed. ``progress`` is passed
+    to ``bootstrap_fold_change``.
+    """
+    tests = welch_tests(normalized_df, contrasts)
+    if n_resamples <= 0:
+        return tests
+    intervals = bootstrap_fold_change(normalized_df, contrasts, n_resamples, confidence, seed, workers, progress)
+    for column in intervals.columns[4:]:
+        tests[column] = intervals[column].to_numpy()
+    return tests
@@ -0,0 +1,91 @@
+"""Columnar Parquet storage for merged and result tables; CSV is export-only.
+
+Tables are written with dictionary-encoded (categorical) ``Sample``, ``Gene``,
+``Group`` and ``Plate`` columns and float32 Cq values. Reads can project
+columns and push ``Gene`` / ``Group`` / ``Plate`` / ``Sample`` filters down to
+the Parquet reader, so a study archive is never loaded whole just to look at a
+few genes. A directory of Parquet files (e.g. one per run or per plate) reads
+as one table; files that lack an optional column (e.g. ``SQ``) read it as NaN.
+"""
+
+from __future__ import annotations
+
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from qpcr.workspace import atomic_path
+
+CATEGORICAL_COLUMNS = ["Sample", "Gene", "Group", "Plate"]
+FLOAT32_COLUMNS = ["Cq", "SQ"]
+FILTER_COLUMNS = {"genes": "Gene", "groups": "Group", "plates": "Plate", "samples": "Sample"}
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """``df`` with key columns as categoricals and Cq as float32 (other columns untouched)."""
+    dtypes = {column: "category" for column in CATEGORICAL_COLUMNS if column in df.columns}
+    dtypes.update({column: np.float32 for column in FLOAT32_COLUMNS if column in df.columns})
+    return df.astype(dtypes)
+
+
+def write_table(df: pd.DataFrame, path: str, compression: str = "zstd") -> str:
+    """Write ``df`` to ``path`` as compact Parquet; returns ``path``.
+
+    The file is written next to ``path`` and renamed into place, so readers
+    never see a half-written table.
+    """
+    table = pa.Table.from_pandas(compact_frame(df), preserve_index=False)
+    with atomic_path(path) as tmp_path:
+        pq.write_table(table, tmp_path, compression=compression)
+    return path
+
+
+def _source(path: str) -> tuple:
+    """``pq.read_table`` source and unified schema for a file or a directory of files."""
+    if not os.path.isdir(path):
+        return path, None
+    files = sorted(
+        os.path.join(path, name) for name in os.listdir(path)
+        if name.endswith(".parquet") and not name.startswith((".", "_"))
+    )
+    if not files:
+        raise FileNotFoundError(f"No Parquet files in {path}")
+    return files, pa.unify_schemas([pq.read_schema(file) for file in files], promote_options="permissive")
+
+
+def read_table(
+    path: str,
+    columns: list[str] | None = None,
+    genes: list[str] | None = None,
+    groups: list[str] | None = None,
+    plates: list[str] | None = None,
+    samples: list[str] | None = None,
+) -> pd.DataFrame:
+    """Read a Parquet file (or directory of files), optionally projected and filtered.
+
+    Only ``columns`` are loaded (all when ``None``); ``genes``, ``groups``,
+    ``plates`` and ``samples`` keep rows whose value is in the given list.
+    """
+    values = {"genes": genes, "groups": groups, "plates": plates, "samples": samples}
+    filters = [(FILTER_COLUMNS[name], "in", list(keep)) for name, keep in values.items() if keep is not None]
+
+    source, schema = _source(path)
+    df = pq.read_table(source, columns=columns, filters=filters or None, schema=schema).to_pandas()
+    for column in CATEGORICAL_COLUMNS:
+        if filters and column in df.columns and isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].cat.remove_unused_categories()
+    return df
+
+
+def table_columns(path: str) -> list[str]:
+    """Column names of a stored table, read from the Parquet footer only."""
+    source, schema = _source(path)
+    return (schema or pq.read_schema(source)).names
+
+
+def to_csv_bytes(df: pd.DataFrame) -> bytes:
+    """``df`` as UTF-8 CSV bytes, for download buttons and exports."""
+    return df.to_csv(index=False).encode("utf-8")
@@ -0,0 +1,162 @@
+"""Streaming plate ingestion into an on-disk Parquet store.
+
+A Cq export is read in bounded chunks of rows, and only the columns the merge
+uses (``Well``, ``Cq`` and the starting quantity when present) are parsed,
+with explicit dtypes. Each chunk is scattered into per-well arrays, so the
+export is never held whole. Each merged plate is then written to the store as
+its own Parquet file and dropped from memory. Peak memory is set by the chunk
+size and one plate, not by the size of the study. The store is a directory
+that ``qpcr.storage.read_table`` reads as one table.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from qpcr.dataset import CATEGORY_COLUMNS, SQ_COLUMNS
+from qpcr.layout import well_index
+from qpcr.normalization import safe_group_name
+from qpcr.plates import merge_wells, plate_format
+from qpcr.storage import read_table, write_table
+
+DEFAULT_CHUNK_ROWS = 10_000
+
+# Parsed types of the Cq export columns that are read; all others are skipped
+CQ_DTYPES = {"Well": "category", "Cq": np.float64, **{column: np.float64 for column in SQ_COLUMNS}}
+
+
+def _rewind(source):
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return source
+
+
+def cq_columns(source) -> list[str]:
+    """Columns of a Cq export that ``iter_cq_chunks`` reads, from its header row only.
+
+    Raises ``ValueError`` if the export has no ``Well`` or ``Cq`` column.
+    """
+    header = pd.read_csv(_rewind(source), nrows=0).columns
+    missing = {"Well", "Cq"} - set(header)
+    if missing:
+        raise ValueError(f"Cq export is missing columns: {', '.join(sorted(missing))}")
+    sq_column = next((column for column in SQ_COLUMNS if column in header), None)
+    return ["Well", "Cq"] + ([sq_column] if sq_column is not None else [])
+
+
+def iter_cq_chunks(source, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+    """Yield a Cq export (path or file object) as frames of at most ``chunk_rows`` rows.
+
+    Frames hold ``Well`` (categorical), ``Cq`` and, if the export has one, the
+    starting quantity column.
+    """
+    columns = cq_columns(source)
+    with pd.read_csv(_rewind(source), usecols=columns, dtype={column: CQ_DTYPES[column] for column in columns},
+                     chunksize=chunk_rows) as reader:
+        yield from reader
+
+
+def stream_plate(
+    cq_source,
+    genes_df: pd.DataFrame,
+    samples_df: pd.DataFrame,
+    groups_df: pd.DataFrame,
+    plate: str,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> tuple[pd.DataFrame, dict]:
+    """``merge_plate`` reading the Cq export in chunks; same merged frame and summary."""
+    n_wells = plate_format(genes_df, samples_df)
+    cq_by_well = np.full(n_wells, np.nan)
+    sq_by_well = None
+
+    for chunk in iter_cq_chunks(cq_source, chunk_rows):
+        # Decode each distinct label once, then look wells up by category code
+        codes = chunk["Well"].cat.codes.to_numpy()
+        wells = np.where(codes >= 0, well_index(chunk["Well"].cat.categories, n_wells)[codes], -1)
+        valid = wells >= 0
+        cq_by_well[wells[valid]] = chunk["Cq"].to_numpy()[valid]
+        # usecols keeps the export's column order, so the quantity column is looked up by name
+        sq_column = next((column for column in SQ_COLUMNS if column in chunk.columns), None)
+        if sq_column is not None:
+            sq = chunk[sq_column].to_numpy()
+            if sq_by_well is None and not np.isnan(sq).all():
+                sq_by_well = np.full(n_wells, np.nan)
+            if sq_by_well is not None:
+                sq_by_well[wells[valid]] = sq[valid]
+
+    return merge_wells(cq_by_well, sq_by_well, genes_df, samples_df, groups_df, plate)
+
+
+def plate_part_path(store_path: str, plate: str) -> str:
+    """File of ``plate`` inside the store directory."""
+    return os.path.join(store_path, f"{safe_group_name(str(plate))}.parquet")
+
+
+def write_plate(store_path: str, plate: str, merged_df: pd.DataFrame) -> str:
+    """Add (or replace) one merged plate in the store; returns its file."""
+    return write_table(merged_df, plate_part_path(store_path, plate))
+
+
+def remove_plate(store_path: str, plate: str) -> None:
+    """Drop one plate from the store, if it is there."""
+    path = plate_part_path(store_path, plate)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def stream_ingest(
+    plate_sources: dict[str, dict],
+    groups_df: pd.DataFrame,
+    store_path: str,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    progress=None,
+) -> dict[str, dict]:
+    """Merge every plate in ``plate_sources`` into a fresh store at ``store_path``.
+
+    ``plate_sources`` maps a plate name to ``{"Cq": ..., "genes": ..., "samples": ...}``
+    paths or file objects. One plate is in memory at a time. The store is
+    built next to ``store_path`` and swapped in at the end. Returns the
+    ``{plate: summary}`` dict; ``progress`` is called as ``progress(done, total)``
+    after each plate.
+    """
+    store_path = store_path.rstrip(os.sep)
+    parent = os.path.dirname(os.path.abspath(store_path))
+    os.makedirs(parent, exist_ok=True)
+    tmp_path = tempfile.mkdtemp(dir=parent, prefix=f".{os.path.basename(store_path)}.", suffix=".tmp")
+    summaries = {}
+    try:
+        for done, (plate, sources) in enumerate(plate_sources.items(), start=1):
+            genes_df = pd.read_csv(_rewind(sources["genes"]), index_col=0)
+            samples_df = pd.read_csv(_rewind(sources["samples"]), index_col=0)
+            merged_df, summaries[plate] = stream_plate(sources["Cq"], genes_df, samples_df, groups_df, plate,
+                                                       chunk_rows)
+            write_plate(tmp_path, plate, merged_df)
+            del merged_df
+            if progress is not None:
+                progress(done, len(plate_sources))
+        shutil.rmtree(store_path, ignore_errors=True)
+        os.replace(tmp_path, store_path)
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+    return summaries
+
+
+def read_store(store_path: str, plates: list[str] | None = None, **filters) -> pd.DataFrame:
+    """The store as one merged frame, like ``merge_plates``: rows in ``plates`` order, sorted categories.
+
+    ``plates`` (default: every plate, in file order) also selects plates;
+    other keyword filters are passed to ``read_table``.
+    """
+    df = read_table(store_path, plates=plates, **filters)
+    for column in CATEGORY_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].cat.set_categories(sorted(df[column].cat.categories))
+    if plates is not None:
+        rank = pd.Index(plates).get_indexer(df["Plate"].astype(object))
+        df = df.iloc[np.argsort(rank, kind="stable")].reset_index(drop=True)
+    return df
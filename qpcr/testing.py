@@ -0,0 +1,91 @@
+"""Synthetic 96/384-well plates and the legacy merge, shared by the tests and benchmarks.
+
+``legacy_merge_plate`` is the string-keyed melt/merge chain the well-index
+merge replaced; it is kept as the reference ``merge_plate`` must agree with.
+"""
+
+from __future__ import annotations
+
+import os
+
+import numpy as np
+import pandas as pd
+
+PLATE_SHAPES = {96: (8, 12), 384: (16, 24)}
+
+
+def make_plate(n_wells: int = 384, n_genes: int = 16, replicates: int = 3, seed: int = 0) -> dict[str, pd.DataFrame]:
+    """One plate in the instrument/template layout: Cq export plus gene and sample maps."""
+    rng = np.random.default_rng(seed)
+    n_rows, n_cols = PLATE_SHAPES[n_wells]
+    rows = [chr(ord("A") + r) for r in range(n_rows)]
+    cols = [str(c) for c in range(1, n_cols + 1)]
+
+    genes = np.array([[f"Gene{r % n_genes + 1}" for _ in cols] for r in range(n_rows)], dtype=object)
+    samples = np.array(
+        [[f"S{seed}_{c // replicates}" for c in range(n_cols)] for _ in range(n_rows)], dtype=object
+    )
+
+    wells = [f"{r}{c:0>2}" for r in rows for c in cols]
+    cq = pd.DataFrame({
+        "": "",
+        "Well": wells,
+        "Fluor": "SYBR",
+        "Content": "Unkn",
+        "Cq": np.round(rng.normal(26, 3, len(wells)), 2),
+    })
+    return {
+        "Cq": cq,
+        "genes": pd.DataFrame(genes, index=rows, columns=cols),
+        "samples": pd.DataFrame(samples, index=rows, columns=cols),
+    }
+
+
+def make_groups(plate_data: dict[str, dict[str, pd.DataFrame]], n_groups: int = 4) -> pd.DataFrame:
+    samples = pd.unique(np.concatenate([p["samples"].to_numpy().ravel() for p in plate_data.values()]))
+    return pd.DataFrame({"Sample": samples, "Group": [f"Group{i % n_groups}" for i in range(len(samples))]})
+
+
+def make_plates(n_plates: int, n_wells: int = 384) -> dict[str, dict[str, pd.DataFrame]]:
+    return {f"plate{i}": make_plate(n_wells, seed=i) for i in range(1, n_plates + 1)}
+
+
+def write_plates(directory: str, plate_data: dict[str, dict[str, pd.DataFrame]]) -> dict[str, dict[str, str]]:
+    """Write plates as ``<plate>_Cq.csv`` / ``_Genes.csv`` / ``_Samples.csv`` and return their paths."""
+    os.makedirs(directory, exist_ok=True)
+    plate_files = {}
+    for plate, frames in plate_data.items():
+        paths = {kind: os.path.join(directory, f"{plate}_{name}.csv")
+                 for kind, name in (("Cq", "Cq"), ("genes", "Genes"), ("samples", "Samples"))}
+        frames["Cq"].to_csv(paths["Cq"], index=False)
+        frames["genes"].to_csv(paths["genes"])
+        frames["samples"].to_csv(paths["samples"])
+        plate_files[plate] = paths
+    return plate_files
+
+
+def legacy_parse_wells(cq_df: pd.DataFrame) -> pd.Series:
+    """Well normalization as ``upload_data.app`` did it: two regex extracts and a string concat."""
+    row = cq_df["Well"].str.extract(r"([A-P])")[0]
+    column = cq_df["Well"].str.extract(r"(\d{2})")[0].astype(int)
+    return row + column.astype(str)
+
+
+def legacy_merge_plate(cq_df, genes_df, samples_df, groups_df, plate):
+    """The string-keyed melt/merge chain ``merge_plate`` replaced."""
+    cq_df = cq_df.copy()
+    cq_df["Well"] = legacy_parse_wells(cq_df)
+
+    genes_melted = genes_df.melt(ignore_index=False).reset_index()
+    genes_melted.columns = ["Row", "Column", "Gene"]
+    genes_melted["Well"] = genes_melted["Row"] + genes_melted["Column"].astype(str)
+
+    samples_melted = samples_df.melt(ignore_index=False).reset_index()
+    samples_melted.columns = ["Row", "Column", "Sample"]
+    samples_melted["Well"] = samples_melted["Row"] + samples_melted["Column"].astype(str)
+
+    merged_df = genes_melted.merge(samples_melted, on="Well", how="left")
+    merged_df = merged_df.merge(cq_df[["Well", "Cq"]], on="Well", how="left")
+    merged_df = merged_df.merge(groups_df, on="Sample", how="left")
+    merged_df["Plate"] = plate
+    return merged_df.dropna(subset=["Sample", "Gene"]).reset_index(drop=True)
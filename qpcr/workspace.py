@@ -0,0 +1,114 @@
+"""Per-user, per-session working directories, atomic file writes and cleanup of idle sessions.
+
+Each app session writes its result tables and exports under
+``<root>/<user>/<session>/`` instead of shared fixed paths, so concurrent
+analysts never overwrite each other's files. Files are written to a
+temporary name that is unique per write (not just per process; app sessions
+are threads of one process) and renamed into place, so readers never see a
+partial file. Workspaces idle for longer than ``max_age`` are removed by
+``cleanup_workspaces``.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+
+from qpcr.normalization import safe_group_name
+
+DEFAULT_WORKSPACE_ROOT = "./workspaces"
+DEFAULT_WORKSPACE_HOURS = 24
+
+# File whose modification time marks a workspace's last use
+_HEARTBEAT = ".last_used"
+
+
+@contextmanager
+def atomic_path(path: str):
+    """Yield a unique temporary path next to ``path``, renamed to ``path`` when the block succeeds.
+
+    The temporary file is hidden (leading dot) and removed if the block raises.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class Workspace:
+    """Files of one session of ``user``, under ``<root>/<user>/<session>``.
+
+    ``session`` defaults to a new random id.
+    """
+
+    def __init__(self, user: str, session: str | None = None, root: str = DEFAULT_WORKSPACE_ROOT):
+        self.user = safe_group_name(str(user))
+        self.session = session or uuid.uuid4().hex
+        self.directory = os.path.join(root, self.user, self.session)
+
+    def path(self, *parts: str) -> str:
+        """Path of ``parts`` inside the workspace; parent directories are created."""
+        path = os.path.join(self.directory, *parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return path
+
+    def touch(self) -> None:
+        """Mark the workspace as in use now, so cleanup keeps it."""
+        heartbeat = self.path(_HEARTBEAT)
+        try:
+            os.utime(heartbeat)
+        except FileNotFoundError:
+            open(heartbeat, "a").close()
+
+    def remove(self) -> None:
+        """Delete the workspace and everything in it."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def _last_used(directory: str) -> float:
+    try:
+        return os.stat(os.path.join(directory, _HEARTBEAT)).st_mtime
+    except FileNotFoundError:
+        return os.stat(directory).st_mtime
+
+
+def cleanup_workspaces(root: str = DEFAULT_WORKSPACE_ROOT, max_age: float = DEFAULT_WORKSPACE_HOURS * 3600) -> int:
+    """Remove session workspaces under ``root`` not used for ``max_age`` seconds; returns how many.
+
+    Users left without sessions lose their (empty) folder too.
+    """
+    cutoff = time.time() - max_age
+    removed = 0
+    try:
+        users = [entry.path for entry in os.scandir(root) if entry.is_dir()]
+    except FileNotFoundError:
+        return 0
+    for user_dir in users:
+        for entry in os.scandir(user_dir):
+            try:
+                if entry.is_dir() and _last_used(entry.path) < cutoff:
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                    removed += 1
+            except FileNotFoundError:
+                continue  # removed by another session's cleanup
+        try:
+            os.rmdir(user_dir)
+        except OSError:
+            pass  # still has sessions
+    return removed
+
+
+def default_workspace_settings() -> tuple[str, float]:
+    """Workspace root and idle age in seconds (``QPCR_WORKSPACE_ROOT`` / ``QPCR_WORKSPACE_HOURS``)."""
+    root = os.environ.get("QPCR_WORKSPACE_ROOT", DEFAULT_WORKSPACE_ROOT)
+    return root, float(os.environ.get("QPCR_WORKSPACE_HOURS", DEFAULT_WORKSPACE_HOURS)) * 3600
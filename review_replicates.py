@@ -1,6 +1,39 @@
 import streamlit as st
 import pandas as pd
 
+from qpcr import (
+    ACTIONS,
+    apply_decisions,
+    decision_key,
+    flag_replicates,
+    index_replicates,
+    invalid_decision_keys,
+    next_unreviewed_page,
+    page_count,
+    paginate,
+    replicate_stats,
+    review_queue,
+)
+from qpcr.cache import cached_stage
+from qpcr.outliers import METHODS, auto_curate
+from qpcr.storage import to_csv_bytes
+
+SORT_OPTIONS = {
+    "Largest Cq difference": ("Cq_diff", False),
+    "Smallest Cq difference": ("Cq_diff", True),
+    "Sample": ("Sample", True),
+    "Gene": ("Gene", True),
+}
+
+
+def _replicate_overview(df):
+    return replicate_stats(df), index_replicates(df)
+
+
+def _go_to_page(page):
+    st.session_state["review_page"] = page
+
+
 def app():
     """Review and Filter Technical Replicates"""
     st.title("🔍 Review Technical Replicates")
@@ -12,7 +45,7 @@ def app():
 
     # Initialize session state if not present
     if "filtered_merged_data" not in st.session_state:
-        st.session_state["filtered_merged_data"] = st.session_state["merged_data"].copy()
+        st.session_state["filtered_merged_data"] = st.session_state["merged_data"]
 
     if "user_decisions" not in st.session_state:
         st.session_state["user_decisions"] = {}
@@ -29,18 +62,36 @@ def app():
     )
 
     # **Step 2: Identify High-Variation Technical Replicates**
-    replicate_variation = (
-        filtered_merged_df.groupby(["Sample", "Gene"])
-        .agg(min_Cq=("Cq", "min"), max_Cq=("Cq", "max"))
-        .reset_index()
-    )
-    replicate_variation["Cq_diff"] = replicate_variation["max_Cq"] - replicate_variation["min_Cq"]
-    high_variation_replicates = replicate_variation[replicate_variation["Cq_diff"] > threshold]
-
-    # Remove already reviewed pairs
-    high_variation_replicates = high_variation_replicates[
-        ~high_variation_replicates.apply(lambda row: f"{row['Sample']}__{row['Gene']}" in user_decisions, axis=1)
-    ]
+    # ✅ Spread, SD, CV and outlier well for every Sample-Gene pair in one pass (reused across reruns)
+    stats, replicate_rows = cached_stage("replicate_overview", _replicate_overview, filtered_merged_df)
+
+    # Pairs that already have a decision are left out
+    high_variation_replicates = flag_replicates(filtered_merged_df, threshold, user_decisions, stats=stats)
+
+    # **Optional: Auto-Curate Clear Outliers**
+    st.subheader("🤖 Auto-Curate Technical Replicates")
+    st.write("Automatically remove the offending well where one replicate is clearly the outlier; "
+             "ambiguous pairs are left for manual review below.")
+    method_labels = dict(zip(["Distance from median", "Grubbs test", "Dixon Q test"], METHODS))
+    auto_method = method_labels[st.selectbox("Outlier detection method:", list(method_labels), key="auto_curate_method")]
+    use_no_amp = st.checkbox("Treat high Cq as no amplification", key="auto_curate_use_no_amp")
+    no_amp_cq = None
+    if use_no_amp:
+        no_amp_cq = st.number_input("No-amplification Cq cutoff:", min_value=20.0, max_value=45.0, value=35.0, step=0.5,
+                                    key="auto_curate_no_amp_cq")
+
+    if st.button("🤖 Run Auto-Curation"):
+        auto_decisions, ambiguous = auto_curate(filtered_merged_df, threshold, auto_method, no_amp_cq, stats=stats)
+
+        # ✅ Never overwrite decisions a reviewer already made
+        new_decisions = {key: val for key, val in auto_decisions.items() if key not in user_decisions}
+        user_decisions.update(new_decisions)
+        st.session_state["user_decisions"] = user_decisions
+        high_variation_replicates = flag_replicates(filtered_merged_df, threshold, user_decisions, stats=stats)
+
+        st.success(f"✅ Auto-curated **{len(new_decisions)}** pairs; **{len(ambiguous)}** need manual review.")
+        if not ambiguous.empty:
+            st.dataframe(ambiguous)
 
     st.write(f"📌 Found **{len(high_variation_replicates)}** high-variation replicates for review.")
     st.dataframe(high_variation_replicates)
@@ -48,26 +99,47 @@ def app():
     # **Step 3: Review & Select Replicates for Removal**
     st.subheader("📌 Review & Remove Technical Replicates")
 
-    for index, row in high_variation_replicates.iterrows():
-        sample, gene = row["Sample"], row["Gene"]
-        key_id = f"{sample}__{gene}"
+    # ✅ Only the visible page of pairs gets widgets, so reruns stay fast with hundreds of flagged pairs
+    col1, col2, col3 = st.columns(3)
+    page_size = col1.selectbox("Pairs per page:", [10, 25, 50, 100], key="review_page_size")
+    sort_by, ascending = SORT_OPTIONS[col2.selectbox("Sort by:", list(SORT_OPTIONS), key="review_sort")]
+    unreviewed_only = col3.checkbox("Only show unreviewed pairs", value=True, key="review_unreviewed_only")
+
+    queue = review_queue(stats, threshold, user_decisions, sort_by, ascending, unreviewed_only)
+    n_pages = page_count(len(queue), page_size)
+    if st.session_state.get("review_page", 1) > n_pages:
+        st.session_state["review_page"] = n_pages
 
-        replicates = filtered_merged_df[
-            (filtered_merged_df["Sample"] == sample) & (filtered_merged_df["Gene"] == gene)
-        ]
+    current_page = st.session_state.get("review_page", 1)
+    next_page = next_unreviewed_page(queue, page_size, current_page)
 
-        if replicates.empty:
+    nav1, nav2, nav3 = st.columns(3)
+    nav1.button("⬅️ Previous Page", disabled=current_page <= 1, on_click=_go_to_page, args=(current_page - 1,))
+    nav2.button("➡️ Next Page", disabled=current_page >= n_pages, on_click=_go_to_page, args=(current_page + 1,))
+    nav3.button("⏭ Jump to Next Unreviewed", disabled=next_page is None, on_click=_go_to_page, args=(next_page,))
+
+    page = st.number_input(f"Page (of {n_pages}):", min_value=1, max_value=n_pages, step=1, key="review_page")
+    page_pairs = paginate(queue, page, page_size)
+    st.caption(f"Showing pairs {(page - 1) * page_size + min(1, len(page_pairs))}–"
+               f"{(page - 1) * page_size + len(page_pairs)} of {len(queue)}")
+
+    for sample, gene, reviewed in zip(page_pairs["Sample"], page_pairs["Gene"], page_pairs["Reviewed"]):
+        key_id = decision_key(sample, gene)
+
+        # ✅ Look up the pair's wells from the prebuilt index instead of re-scanning the data
+        if (sample, gene) not in replicate_rows:
             continue
+        replicates = filtered_merged_df.iloc[replicate_rows[(sample, gene)]]
 
-        st.write(f"### Reviewing Sample: `{sample}`, Gene: `{gene}`")
+        st.write(f"### {'✅ ' if reviewed else ''}Reviewing Sample: `{sample}`, Gene: `{gene}`")
         st.dataframe(replicates)
 
         default_action = user_decisions.get(key_id, {}).get("action", "Keep All")
 
         action = st.radio(
             f"Action for `{sample} - {gene}`:",
-            options=["Keep All", "Remove Specific", "Remove All"],
-            index=["Keep All", "Remove Specific", "Remove All"].index(default_action),
+            options=ACTIONS,
+            index=ACTIONS.index(default_action),
             key=f"action_{key_id}"
         )
 
@@ -91,32 +163,14 @@ def app():
 
     # **Step 4: Apply All Changes at Once**
     if st.button("🚀 Apply All Selected Removals"):
-        updated_filtered_df = st.session_state["filtered_merged_data"].copy()
-
-        for key, decision in user_decisions.items():
-            try:
-                sample, gene = key.split("__")
-            except ValueError:
-                st.error(f"⚠️ Error parsing key: `{key}`")
-                continue
-
-            action = decision["action"]
-            well_to_remove = decision.get("well", None)
-
-            if action == "Remove Specific" and well_to_remove:
-                updated_filtered_df = updated_filtered_df[
-                    ~((updated_filtered_df["Sample"] == sample) & 
-                      (updated_filtered_df["Gene"] == gene) & 
-                      (updated_filtered_df["Well"] == well_to_remove))
-                ]
-            elif action == "Remove All":
-                updated_filtered_df = updated_filtered_df[
-                    ~((updated_filtered_df["Sample"] == sample) & (updated_filtered_df["Gene"] == gene))
-                ]
+        for key in invalid_decision_keys(user_decisions):
+            st.error(f"⚠️ Error parsing key: `{key}`")
+
+        updated_filtered_df = apply_decisions(st.session_state["filtered_merged_data"], user_decisions)
 
         st.session_state["filtered_merged_data"] = updated_filtered_df
 
-        reviewed_keys = [f"{row['Sample']}__{row['Gene']}" for index, row in high_variation_replicates.iterrows()]
+        reviewed_keys = set(high_variation_replicates["Sample"].astype(str) + "__" + high_variation_replicates["Gene"].astype(str))
         st.session_state["user_decisions"] = {key: val for key, val in user_decisions.items() if key not in reviewed_keys}
 
         st.success("🎯 All selected replicates have been removed!")
@@ -138,7 +192,7 @@ def app():
         final_filtered_df = st.session_state["filtered_merged_data"]
         st.download_button(
             label="📥 Download Cleaned Data",
-            data=final_filtered_df.to_csv(index=False),
+            data=cached_stage("export_csv", to_csv_bytes, final_filtered_df),
             file_name="Filtered_qPCR_Data.csv",
             mime="text/csv"
         )
@@ -0,0 +1,21 @@
+import streamlit as st
+
+from qpcr.workspace import Workspace, cleanup_workspaces, default_workspace_settings
+
+
+def current_workspace():
+    """This browser session's workspace, under the logged-in user's folder (created on first use)"""
+    workspace = st.session_state.get("workspace")
+    if workspace is None:
+        root, max_age = default_workspace_settings()
+        # ✅ Each new session sweeps away workspaces left idle by sessions that have ended
+        cleanup_workspaces(root, max_age)
+        workspace = Workspace(st.session_state.get("username") or "anonymous", root=root)
+        st.session_state["workspace"] = workspace
+    workspace.touch()
+    return workspace
+
+
+def results_path(name):
+    """Path of a result file in this session's workspace"""
+    return current_workspace().path("results", name)
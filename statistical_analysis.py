@@ -0,0 +1,89 @@
+import streamlit as st
+
+from qpcr.cache import cached_stage
+from qpcr.contrasts import all_contrasts, contrast_name
+from qpcr.ingest import default_workers
+from qpcr.stats import DEFAULT_RESAMPLES, anova, contrast_statistics
+from qpcr.storage import to_csv_bytes, write_table
+from background_jobs import job_panel, submit_job
+from session_workspace import results_path
+
+def app():
+    """Welch t-tests, ANOVA, FDR and bootstrap confidence intervals per gene"""
+    st.title("📐 Statistical Analysis")
+
+    # Ensure Normalized Data Exists
+    if st.session_state.get("normalized_qPCR_df") is None:
+        st.error("❌ No normalized qPCR data available. Please compute ΔCt first.")
+        st.stop()
+
+    df = st.session_state["normalized_qPCR_df"]
+    unique_groups = df["Group"].dropna().unique()
+
+    # ✅ Step 1: Contrasts to Test (defaults to the ones chosen on the Fold Change page)
+    st.subheader("📌 Select Contrasts")
+    all_pairs = all_contrasts(list(unique_groups))
+    contrast_labels = {contrast_name(treatment, control): (treatment, control) for treatment, control in all_pairs}
+    previous = [contrast_name(treatment, control) for treatment, control in st.session_state.get("contrasts") or []]
+    if not previous and st.session_state.get("control_group") in unique_groups:
+        control_group = st.session_state["control_group"]
+        previous = [contrast_name(group, control_group) for group in unique_groups if group != control_group]
+    chosen_labels = st.multiselect(
+        "🔹 Select contrasts (treatment vs control):",
+        list(contrast_labels),
+        default=[label for label in previous if label in contrast_labels],
+        key="stats_contrasts"
+    )
+
+    # ✅ Step 2: Bootstrap Settings
+    st.subheader("⚙️ Bootstrap Settings")
+    n_resamples = st.number_input("Bootstrap resamples (0 = tests only):", min_value=0, max_value=100_000,
+                                  value=DEFAULT_RESAMPLES, step=1000, key="stats_resamples")
+    confidence = st.slider("Confidence level:", min_value=0.80, max_value=0.99, value=0.95, step=0.01,
+                           key="stats_confidence")
+    seed = st.number_input("Random seed:", min_value=0, value=0, step=1, key="stats_seed")
+    workers = st.number_input("Worker processes:", min_value=1, max_value=default_workers(), value=1, step=1,
+                              key="stats_workers")
+
+    # ✅ Step 3: Compute Tests, FDR and Intervals for every Gene at once (bootstrap runs as a background job)
+    if st.button("📐 Compute Statistics", disabled=not chosen_labels):
+        contrasts = [contrast_labels[label] for label in chosen_labels]
+        submit_job("statistics", contrast_statistics, df, contrasts, int(n_resamples), float(confidence), int(seed),
+                   int(workers), label=f"Statistics for {len(contrasts)} contrasts")
+        anova_df = cached_stage("anova", anova, df)
+        st.session_state["anova_qPCR_df"] = anova_df
+        write_table(anova_df, results_path("ANOVA_qPCR.parquet"))
+
+    statistics_df = job_panel("statistics")
+    if statistics_df is not None:
+        st.session_state["statistics_qPCR_df"] = statistics_df
+
+        # ✅ Save as Parquet (CSV is download-only)
+        write_table(statistics_df, results_path("Statistics_qPCR_contrasts.parquet"))
+        st.success(f"✅ Tested **{statistics_df['Gene'].nunique()}** genes across "
+                   f"**{statistics_df['Contrast'].nunique()}** contrasts!")
+
+    # ✅ Step 4: Results Stay Visible
+    if st.session_state.get("statistics_qPCR_df") is not None:
+        statistics_df = st.session_state["statistics_qPCR_df"]
+        significant = int((statistics_df["q_value"] < 0.05).sum())
+        st.subheader("📂 Welch t-tests & Bootstrap Intervals")
+        st.write(f"📌 **{significant}** contrast-gene pairs with FDR q < 0.05.")
+        st.dataframe(statistics_df.sort_values("p_value").head(20))
+        st.download_button(
+            label="📥 Download Statistics CSV",
+            data=cached_stage("export_csv", to_csv_bytes, statistics_df),
+            file_name="Statistics_qPCR_contrasts.csv",
+            mime="text/csv"
+        )
+
+    if st.session_state.get("anova_qPCR_df") is not None:
+        anova_df = st.session_state["anova_qPCR_df"]
+        st.subheader("📂 One-Way ANOVA across Groups")
+        st.dataframe(anova_df.sort_values("p_value").head(20))
+        st.download_button(
+            label="📥 Download ANOVA CSV",
+            data=cached_stage("export_csv", to_csv_bytes, anova_df),
+            file_name="ANOVA_qPCR.csv",
+            mime="text/csv"
+        )
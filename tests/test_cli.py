@@ -0,0 +1,38 @@
+import pytest
+
+from qpcr.cli import main
+from qpcr.testing import make_groups, make_plates, write_plates
+
+
+@pytest.fixture
+def plate_dir(tmp_path):
+    plate_data = make_plates(1, 96)
+    write_plates(str(tmp_path / "plates"), plate_data)
+    make_groups(plate_data).to_csv(tmp_path / "groups.csv", index=False)
+    return tmp_path
+
+
+def _run(plate_dir, groups):
+    return main(["--plates", str(plate_dir / "plates"), "--groups", str(groups), "--housekeeping", "Gene1",
+                 "--control", "Group0", "--output-dir", str(plate_dir / "out")])
+
+
+def test_cli_writes_results(plate_dir):
+    assert _run(plate_dir, plate_dir / "groups.csv") == 0
+    assert (plate_dir / "out" / "DeltaDeltaCt_qPCR_relative_to_Group0.parquet").exists()
+
+
+@pytest.mark.parametrize("content, message", [
+    (None, "No such file"),
+    ("Sample,Treatment\nS1_0,Group0\n", "Groups file is missing columns: Group"),
+    ('"Sample\n', "Error tokenizing data"),
+])
+def test_cli_reports_bad_groups_file(plate_dir, capsys, content, message):
+    groups = plate_dir / "bad_groups.csv"
+    if content is not None:
+        groups.write_text(content)
+
+    assert _run(plate_dir, groups) == 1
+    err = capsys.readouterr().err
+    assert err.startswith("❌ ")
+    assert message in err
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from qpcr.contrasts import all_contrasts, contrast_name, contrast_table
+from qpcr.normalization import delta_delta_ct
+from qpcr.pipeline import run_pipeline
+from qpcr.testing import make_groups, make_plates
+
+
+@pytest.fixture(scope="module")
+def normalized_df():
+    plate_data = make_plates(2, 96)
+    results = run_pipeline(plate_data, make_groups(plate_data), ["Gene1", "Gene2"], "Group0")
+    normalized_df = results["normalized_qPCR_df"]
+    # An infinite ΔCt is treated as missing by both
+    return normalized_df.assign(Normalized_Cq=np.where(np.arange(len(normalized_df)) == 5, np.inf,
+                                                       normalized_df["Normalized_Cq"]))
+
+
+def test_contrast_table_matches_delta_delta_ct(normalized_df):
+    contrasts = [("Group1", "Group0"), ("Group2", "Group0"), ("Group0", "Group3"), ("Group3", "Group1")]
+    table = contrast_table(normalized_df, contrasts)
+
+    assert table["Contrast"].cat.categories.tolist() == [contrast_name(t, c) for t, c in contrasts]
+    for treatment, control in contrasts:
+        rows = table[table["Contrast"] == contrast_name(treatment, control)]
+        expected = delta_delta_ct(normalized_df, control, [treatment])
+        pd.testing.assert_frame_equal(rows[expected.columns].reset_index(drop=True), expected)
+        assert (rows["Treatment"] == treatment).all() and (rows["Control"] == control).all()
+
+
+def test_contrast_table_defaults_to_every_ordered_pair(normalized_df):
+    table = contrast_table(normalized_df)
+    expected = all_contrasts(sorted(normalized_df["Group"].unique()))
+    assert table["Contrast"].cat.categories.tolist() == [contrast_name(t, c) for t, c in expected]
+
+
+def test_contrast_table_rejects_unknown_groups(normalized_df):
+    with pytest.raises(ValueError, match="Unknown groups"):
+        contrast_table(normalized_df, [("Group1", "Missing")])
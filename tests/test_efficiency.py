@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from qpcr.efficiency import fit_standard_curves, gene_amplification, pfaffl_ratio
+from qpcr.normalization import delta_ct, delta_delta_ct
+
+
+def _mean_cq_df():
+    return pd.DataFrame({
+        "Sample": ["C1"] * 3 + ["C2"] * 3 + ["T1"] * 3,
+        "Gene": ["Hprt", "Actb", "Il6"] * 3,
+        "Mean_Cq": [20.0, 22.0, 30.0, 21.0, 23.0, 31.0, 20.5, 22.5, 27.0],
+        "Group": ["Ctrl"] * 6 + ["Treated"] * 3,
+    })
+
+
+def test_fit_standard_curves_recovers_slope_and_efficiency():
+    sq = np.tile([1e1, 1e2, 1e3, 1e4], 2)
+    slopes = np.repeat([-3.3219, -3.6], 4)
+    df = pd.DataFrame({
+        "Plate": "p1",
+        "Gene": np.repeat(["Il6", "Tnf"], 4),
+        "SQ": sq,
+        "Cq": 35 + slopes * np.log10(sq),
+    })
+    curves = fit_standard_curves(df).set_index("Gene")
+
+    assert curves["n_Points"].tolist() == [4, 4]
+    assert curves["Slope"].tolist() == pytest.approx([-3.3219, -3.6])
+    assert curves["Intercept"].tolist() == pytest.approx([35.0, 35.0])
+    assert curves["R2"].tolist() == pytest.approx([1.0, 1.0])
+    assert curves.loc["Il6", "Efficiency"] == pytest.approx(100.0, abs=0.01)
+    assert curves.loc["Tnf", "Amplification"] == pytest.approx(10 ** (1 / 3.6))
+    assert gene_amplification(curves.reset_index()).to_dict() == pytest.approx(curves["Amplification"].to_dict())
+
+
+def test_pfaffl_ratio_against_hand_computed_values():
+    amplification = pd.Series({"Hprt": 2.0, "Actb": 1.9, "Il6": 1.8})
+    ratios = pfaffl_ratio(_mean_cq_df(), ["Hprt", "Actb"], "Ctrl", amplification).set_index(["Sample", "Gene"])
+
+    # Control means: Hprt 20.5, Actb 22.5, Il6 30.5; T1 sits at them for the references
+    assert ratios.loc[("T1", "Il6"), "Control_Mean_Cq"] == pytest.approx(30.5)
+    assert ratios.loc[("T1", "Il6"), "Pfaffl_Ratio"] == pytest.approx(1.8 ** 3.5)
+    # C1: Il6 term 1.8^0.5 over the geometric mean of 2^0.5 and 1.9^0.5
+    expected = 1.8 ** 0.5 / np.sqrt(2.0 ** 0.5 * 1.9 ** 0.5)
+    assert ratios.loc[("C1", "Il6"), "Pfaffl_Ratio"] == pytest.approx(expected)
+    assert ratios.loc[("C1", "Il6"), "Target_Ratio"] == pytest.approx(1.8 ** 0.5)
+
+
+def test_pfaffl_ratio_at_perfect_efficiency_is_the_fold_change():
+    mean_cq_df = _mean_cq_df()
+    ratios = pfaffl_ratio(mean_cq_df, ["Hprt", "Actb"], "Ctrl", pd.Series({"Il6": np.nan}))
+    fold_change = delta_delta_ct(delta_ct(mean_cq_df, ["Hprt", "Actb"]), "Ctrl")
+
+    assert (ratios["Amplification"] == 2.0).all()
+    np.testing.assert_allclose(ratios["Pfaffl_Ratio"], fold_change["Fold_Change"])
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+
+from qpcr.dataset import CANONICAL_COLUMNS, CANONICAL_DTYPES, concat_frames
+from qpcr.incremental import IncrementalPipeline
+from qpcr.pipeline import run_pipeline
+from qpcr.testing import make_groups, make_plates
+
+HOUSEKEEPING = ["Gene1", "Gene2"]
+CONTROL = "Group0"
+
+
+def _pipeline(plate_data):
+    pipeline = IncrementalPipeline(make_groups(plate_data), HOUSEKEEPING, CONTROL)
+    for plate, frames in plate_data.items():
+        pipeline.set_plate(plate, frames["Cq"], frames["genes"], frames["samples"])
+    return pipeline
+
+
+def test_concat_frames_without_frames_is_an_empty_canonical_frame():
+    df = concat_frames([])
+    assert df.empty
+    assert list(df.columns) == CANONICAL_COLUMNS
+    assert {column: str(dtype) for column, dtype in df.dtypes.items()} == {
+        column: str(pd.Series(dtype=dtype).dtype) for column, dtype in CANONICAL_DTYPES.items()
+    }
+
+
+def test_remove_all_plates():
+    plate_data = make_plates(2, 96)
+    pipeline = _pipeline(plate_data)
+    for plate in plate_data:
+        pipeline.remove_plate(plate)
+
+    assert pipeline.merged_data.empty
+    assert pipeline.filtered_merged_data.empty
+    assert list(pipeline.merged_data.columns) == CANONICAL_COLUMNS
+    assert pipeline.mean_cq_df.empty
+    assert pipeline.normalized_df.empty
+    assert pipeline.fold_change_df().empty
+
+
+def _full_fold_change(plate_data, groups_df, threshold=None):
+    return run_pipeline(plate_data, groups_df, HOUSEKEEPING, CONTROL, threshold=threshold)["fold_change_qPCR_df"]
+
+
+def _assert_same_fold_change(incremental, full):
+    def comparable(df):
+        df = df.astype({column: str for column in ["Sample", "Gene", "Group"]})
+        return df[full.columns].sort_values(["Sample", "Gene"]).reset_index(drop=True)
+
+    pd.testing.assert_frame_equal(comparable(incremental), comparable(full), check_exact=False, rtol=1e-6)
+
+
+def _with_cq_shift(frames, shift):
+    return {**frames, "Cq": frames["Cq"].assign(Cq=frames["Cq"]["Cq"] + shift)}
+
+
+def test_incremental_matches_full_recompute_after_each_change():
+    plate_data = make_plates(3, 96)
+    groups_df = make_groups(plate_data)
+    pipeline = _pipeline(plate_data)
+    _assert_same_fold_change(pipeline.fold_change_df(), _full_fold_change(plate_data, groups_df))
+
+    # Replace a plate
+    plate_data["plate2"] = _with_cq_shift(plate_data["plate2"], np.linspace(-1, 1, 96))
+    frames = plate_data["plate2"]
+    pipeline.set_plate("plate2", frames["Cq"], frames["genes"], frames["samples"])
+    _assert_same_fold_change(pipeline.fold_change_df(), _full_fold_change(plate_data, groups_df))
+
+    # Remove a plate
+    del plate_data["plate1"]
+    pipeline.remove_plate("plate1")
+    _assert_same_fold_change(pipeline.fold_change_df(), _full_fold_change(plate_data, groups_df))
+
+
+def test_incremental_matches_full_recompute_with_replicate_removals():
+    plate_data = make_plates(2, 96)
+    groups_df = make_groups(plate_data)
+    full = run_pipeline(plate_data, groups_df, HOUSEKEEPING, CONTROL, threshold=5.0)
+    assert full["user_decisions"]
+
+    pipeline = _pipeline(plate_data)
+    pipeline.set_user_decisions(full["user_decisions"])
+    _assert_same_fold_change(pipeline.fold_change_df(), full["fold_change_qPCR_df"])
+
+    del plate_data["plate2"]
+    pipeline.remove_plate("plate2")
+    _assert_same_fold_change(pipeline.fold_change_df(), _full_fold_change(plate_data, groups_df, threshold=5.0))
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+from qpcr.plates import merge_plate, merge_plates
+from qpcr.testing import legacy_merge_plate, make_groups, make_plate, make_plates
+
+COLUMNS = ["Plate", "Well", "Sample", "Gene", "Group", "Cq"]
+
+
+def _comparable(df):
+    df = df[COLUMNS].astype({column: object for column in COLUMNS if column != "Cq"}).astype({"Cq": float})
+    return df.sort_values("Well").reset_index(drop=True)
+
+
+def _assert_matches_legacy(merged_df, plate, frames, groups_df):
+    legacy = legacy_merge_plate(frames["Cq"], frames["genes"], frames["samples"], groups_df, plate)
+    legacy = legacy.assign(Cq=legacy["Cq"].astype(np.float32))
+    pd.testing.assert_frame_equal(_comparable(merged_df), _comparable(legacy))
+
+
+def test_merge_plate_matches_legacy_merge():
+    for n_wells in (96, 384):
+        frames = make_plate(n_wells, seed=n_wells)
+        groups_df = make_groups({"plate": frames})
+        merged_df, summary = merge_plate(frames["Cq"], frames["genes"], frames["samples"], groups_df, "plate")
+
+        _assert_matches_legacy(merged_df, "plate", frames, groups_df)
+        assert summary["Total Wells"] == n_wells
+        assert summary["Empty Wells"] == 0
+
+
+def test_merge_plate_drops_empty_wells_like_legacy_merge():
+    frames = make_plate(96)
+    frames["genes"].iloc[0, :3] = np.nan
+    frames["samples"].iloc[1, 5] = np.nan
+    groups_df = make_groups({"plate": frames})
+    merged_df, summary = merge_plate(frames["Cq"], frames["genes"], frames["samples"], groups_df, "plate")
+
+    _assert_matches_legacy(merged_df, "plate", frames, groups_df)
+    assert len(merged_df) == 92
+    assert summary["Empty Wells"] == 4
+
+
+def test_merge_plates_matches_legacy_merge_per_plate():
+    plate_data = make_plates(3, 96)
+    groups_df = make_groups(plate_data)
+    merged_data, summaries = merge_plates(plate_data, groups_df)
+
+    assert list(summaries) == list(plate_data)
+    for plate, frames in plate_data.items():
+        _assert_matches_legacy(merged_data[merged_data["Plate"] == plate], plate, frames, groups_df)
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from qpcr.matrix import housekeeping_mean
+from qpcr.normalization import delta_ct
+
+
+def _mean_cq_df():
+    return pd.DataFrame({
+        "Sample": ["S1", "S1", "S1", "S2", "S2", "S2"],
+        "Gene": ["Hprt", "Actb", "Il6", "Hprt", "Actb", "Il6"],
+        "Mean_Cq": [20.0, 22.0, 30.0, 19.0, np.nan, 27.5],
+        "Group": ["A", "A", "A", "B", "B", "B"],
+    })
+
+
+def test_housekeeping_mean_is_geometric_mean_of_relative_quantities():
+    cq = np.array([[20.0, 22.0, 30.0], [19.0, np.nan, 27.5]])
+    hk_mean = housekeeping_mean(cq, np.array([0, 1]))
+
+    # geNorm: geometric mean of 2^-Cq over the reference genes, back on the Cq scale
+    quantities = 2.0 ** -np.array([20.0, 22.0])
+    assert hk_mean[0] == pytest.approx(-np.log2(np.prod(quantities) ** 0.5))
+    assert hk_mean[0] == pytest.approx(21.0)
+    # A missing reference gene is left out
+    assert hk_mean[1] == pytest.approx(19.0)
+
+
+def test_delta_ct_against_hand_computed_values():
+    normalized_df = delta_ct(_mean_cq_df(), ["Hprt", "Actb"])
+
+    assert normalized_df["Housekeeping_Mean_Cq"].tolist() == pytest.approx([21.0] * 3 + [19.0] * 3)
+    expected = [-1.0, 1.0, 9.0, 0.0, np.nan, 8.5]
+    np.testing.assert_allclose(normalized_df["Normalized_Cq"].to_numpy(), expected)
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from qpcr.outliers import METHODS, auto_curate, detect_outliers
+from qpcr.replicates import apply_decisions, decision_key
+
+THRESHOLD = 0.5
+
+
+def _wells():
+    pairs = [
+        ("S1", "Il6", [25.0, 25.1, 25.2, 25.1, 28.0]),  # E5 is clearly off
+        ("S1", "Tnf", [25.0, 26.0, 27.0]),  # spread, but no single offender
+        ("S2", "Il6", [22.0, 22.1, np.nan]),  # one well failed to amplify
+        ("S2", "Tnf", [20.0, 20.1, 20.2]),  # fine
+    ]
+    rows = [
+        (f"{'ABCD'[i]}{j + 1}", sample, gene, cq)
+        for i, (sample, gene, values) in enumerate(pairs) for j, cq in enumerate(values)
+    ]
+    return pd.DataFrame(rows, columns=["Well", "Sample", "Gene", "Cq"])
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_detect_outliers_resolves_only_clear_offenders(method):
+    outliers = detect_outliers(_wells(), THRESHOLD, method).set_index(["Sample", "Gene"])
+
+    assert sorted(outliers.index) == [("S1", "Il6"), ("S1", "Tnf"), ("S2", "Il6")]
+    assert outliers.loc[("S1", "Il6"), "Outlier_Well"] == "A5"
+    assert outliers.loc[("S1", "Il6"), "Reason"] == f"{method} outlier"
+    assert outliers.loc[("S2", "Il6"), "Outlier_Well"] == "C3"
+    assert outliers.loc[("S2", "Il6"), "Reason"] == "no amplification"
+    assert not outliers.loc[("S1", "Tnf"), "Resolved"]
+    assert outliers["Resolved"].tolist() == outliers["Outlier_Well"].notna().tolist()
+
+
+@pytest.mark.parametrize("method", ["grubbs", "dixon"])
+def test_triplicates_fall_back_to_the_median_rule(method):
+    df = pd.DataFrame({
+        "Well": ["A1", "A2", "A3", "B1", "B2", "B3", "B4"],
+        "Sample": ["S1"] * 7,
+        "Gene": ["Il6"] * 3 + ["Tnf"] * 4,
+        "Cq": [25.0, 25.1, 28.0, 25.0, 25.1, 25.2, 28.0],
+    })
+    outliers = detect_outliers(df, THRESHOLD, method).set_index("Gene")
+
+    # G = 1.1542 and Q = 0.967 sit just under their n = 3 critical values; the median rule resolves the pair
+    assert outliers.loc["Il6", "Outlier_Well"] == "A3"
+    assert outliers.loc["Il6", "Reason"] == "median outlier"
+    # From four replicates on the test itself decides
+    assert outliers.loc["Tnf", "Outlier_Well"] == "B4"
+    assert outliers.loc["Tnf", "Reason"] == f"{method} outlier"
+
+
+def test_no_amp_cq_counts_late_wells_as_failed():
+    df = _wells()
+    df.loc[df["Well"] == "C3", "Cq"] = 39.5
+    outliers = detect_outliers(df, THRESHOLD, no_amp_cq=38).set_index(["Sample", "Gene"])
+    assert outliers.loc[("S2", "Il6"), "Outlier_Well"] == "C3"
+    assert outliers.loc[("S2", "Il6"), "Reason"] == "no amplification"
+
+
+def test_detect_outliers_rejects_unknown_method():
+    with pytest.raises(ValueError, match="Unknown outlier method"):
+        detect_outliers(_wells(), THRESHOLD, "mad")
+
+
+def test_auto_curate_removes_resolved_wells_and_returns_the_rest():
+    df = _wells()
+    user_decisions, ambiguous = auto_curate(df, THRESHOLD)
+
+    assert user_decisions == {
+        decision_key("S1", "Il6"): {"action": "Remove Specific", "well": "A5"},
+        decision_key("S2", "Il6"): {"action": "Remove Specific", "well": "C3"},
+    }
+    assert list(zip(ambiguous["Sample"], ambiguous["Gene"])) == [("S1", "Tnf")]
+    assert "Outlier_Well" not in ambiguous.columns
+
+    curated = apply_decisions(df, user_decisions)
+    assert sorted(set(df["Well"]) - set(curated["Well"])) == ["A5", "C3"]
@@ -0,0 +1,36 @@
+import os
+import time
+
+from qpcr.plot_cache import PlotCache
+
+
+def _store(cache, key, age):
+    path = cache.path(key)
+    with open(path, "wb") as file:
+        file.write(b"x" * 100)
+    used = time.time() - age
+    os.utime(path, (used, used))
+    return path
+
+
+def test_evict_spares_entries_another_session_just_used(tmp_path):
+    cache = PlotCache(str(tmp_path), max_bytes=150, grace=60)
+    old = _store(cache, "old", age=3600)
+    served = _store(cache, "served", age=1)  # just handed to another session
+    mine = _store(cache, "mine", age=3600)
+
+    removed = cache.evict(keep={"mine"})
+
+    assert removed == 1
+    assert not os.path.exists(old)
+    assert os.path.exists(served)
+    assert os.path.exists(mine)
+
+
+def test_evict_past_grace_period(tmp_path):
+    cache = PlotCache(str(tmp_path), max_bytes=0, max_age=10, grace=60)
+    for key in ["a", "b"]:
+        _store(cache, key, age=120)
+
+    assert cache.evict() == 2
+    assert cache.get("a") is None
@@ -0,0 +1,47 @@
+import pandas as pd
+import pytest
+
+from qpcr.pipeline import run_pipeline
+from qpcr.project import ProjectStore
+from qpcr.testing import make_groups, make_plates
+
+HOUSEKEEPING = ["Gene1", "Gene2"]
+CONTROL = "Group0"
+
+
+@pytest.fixture
+def analysis():
+    plate_data = make_plates(3, 96)
+    groups_df = make_groups(plate_data)
+    return run_pipeline(plate_data, groups_df, HOUSEKEEPING, CONTROL), groups_df
+
+
+def test_save_and_load_analysis(tmp_path, analysis):
+    results, groups_df = analysis
+    store = ProjectStore(str(tmp_path / "project.sqlite"))
+    store.save_analysis("study", {**results, "control_group": CONTROL}, hashes={"plate1": "abc"}, groups_df=groups_df)
+
+    loaded = store.load_analysis("study")
+    pd.testing.assert_frame_equal(loaded["merged_data"], results["merged_data"])
+    pd.testing.assert_frame_equal(loaded["fold_change_qPCR_df"], results["fold_change_qPCR_df"])
+    assert loaded["summary"] == results["summary"]
+    assert loaded["control_group"] == CONTROL
+    assert loaded["plate_hashes"] == {"plate1": "abc"}
+
+
+def test_failed_save_analysis_leaves_the_study_unchanged(tmp_path, analysis):
+    results, groups_df = analysis
+    store = ProjectStore(str(tmp_path / "project.sqlite"))
+    store.save_analysis("study", {**results, "control_group": CONTROL}, groups_df=groups_df)
+
+    # Fewer plates and a setting that cannot be stored: fails after the plates were written
+    fewer = results["merged_data"][results["merged_data"]["Plate"] != "plate3"]
+    summary = {plate: results["summary"][plate] for plate in ["plate1", "plate2"]}
+    with pytest.raises(TypeError):
+        store.save_analysis("study", {**results, "merged_data": fewer, "summary": summary,
+                                      "control_group": object()}, groups_df=groups_df)
+
+    loaded = store.load_analysis("study")
+    assert store.plates("study") == ["plate1", "plate2", "plate3"]
+    pd.testing.assert_frame_equal(loaded["merged_data"], results["merged_data"])
+    assert loaded["control_group"] == CONTROL
@@ -0,0 +1,47 @@
+import pandas as pd
+
+from qpcr.replicates import apply_decisions, decision_key, flag_replicates
+
+
+def _wells():
+    return pd.DataFrame({
+        "Well": ["A1", "A2", "A3", "B1", "B2", "B3", "C1", "C2", "C3"],
+        "Sample": ["S1"] * 6 + ["S2"] * 3,
+        "Gene": ["Il6"] * 3 + ["Actb"] * 3 + ["Il6"] * 3,
+        "Cq": [25.0, 25.2, 28.0, 18.0, 18.1, 18.2, 24.0, 24.1, 24.3],
+    })
+
+
+def test_apply_decisions_removes_specific_wells_and_whole_pairs():
+    decisions = {
+        decision_key("S1", "Il6"): {"action": "Remove Specific", "well": "A3"},
+        decision_key("S2", "Il6"): {"action": "Remove All", "well": None},
+        decision_key("S1", "Actb"): {"action": "Keep All", "well": None},
+    }
+    filtered = apply_decisions(_wells(), decisions)
+
+    assert filtered["Well"].tolist() == ["A1", "A2", "B1", "B2", "B3"]
+    # An anti-join: the kept rows keep their original index
+    assert filtered.index.tolist() == [0, 1, 3, 4, 5]
+
+
+def test_apply_decisions_only_removes_the_named_pair():
+    # The well of another pair is not removed, even though the well name exists
+    decisions = {decision_key("S1", "Il6"): {"action": "Remove Specific", "well": "B1"}}
+    assert len(apply_decisions(_wells(), decisions)) == 9
+
+
+def test_apply_decisions_skips_invalid_keys_and_keep_all():
+    df = _wells()
+    decisions = {
+        "not a key": {"action": "Remove All", "well": None},
+        decision_key("S1", "Il6"): {"action": "Keep All", "well": "A3"},
+        decision_key("S1", "Actb"): {"action": "Remove Specific", "well": None},
+    }
+    assert apply_decisions(df, decisions) is df
+    assert apply_decisions(df, {}) is df
+
+
+def test_flag_replicates_uses_the_cq_spread():
+    flagged = flag_replicates(_wells(), threshold=0.5)
+    assert list(zip(flagged["Sample"], flagged["Gene"])) == [("S1", "Il6")]
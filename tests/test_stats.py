@@ -0,0 +1,97 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from qpcr.stats import anova, benjamini_hochberg, bootstrap_fold_change, welch_tests
+
+
+@pytest.fixture(scope="module")
+def normalized_df():
+    rng = np.random.default_rng(0)
+    sizes = {"A": 5, "B": 4, "C": 6}
+    rows = [
+        (f"{group}{i}", f"Gene{g}", group, rng.normal(g * 0.5 + (group == "B") * 1.5, 0.3 + 0.2 * g))
+        for group, size in sizes.items() for i in range(size) for g in range(6)
+    ]
+    df = pd.DataFrame(rows, columns=["Sample", "Gene", "Group", "Normalized_Cq"])
+    df.loc[(df["Sample"] == "A0") & (df["Gene"] == "Gene1"), "Normalized_Cq"] = np.inf  # left out, like NaN
+    return df
+
+
+def _values(df, group, gene):
+    values = df.loc[(df["Group"] == group) & (df["Gene"] == gene), "Normalized_Cq"].to_numpy()
+    return values[np.isfinite(values)]
+
+
+def test_welch_tests_match_scipy(normalized_df):
+    contrasts = [("B", "A"), ("C", "A"), ("A", "C")]
+    table = welch_tests(normalized_df, contrasts)
+
+    assert len(table) == len(contrasts) * 6
+    for row in table.itertuples():
+        treatment = _values(normalized_df, row.Treatment, row.Gene)
+        control = _values(normalized_df, row.Control, row.Gene)
+        expected = stats.ttest_ind(treatment, control, equal_var=False)
+        assert (row.n_Treatment, row.n_Control) == (len(treatment), len(control))
+        assert row.t == pytest.approx(expected.statistic)
+        assert row.p_value == pytest.approx(expected.pvalue)
+        assert row.Delta_Delta_Ct == pytest.approx(treatment.mean() - control.mean())
+        assert row.Fold_Change == pytest.approx(2 ** -(treatment.mean() - control.mean()))
+
+    for _, rows in table.groupby("Contrast", observed=True):
+        np.testing.assert_allclose(rows["q_value"], stats.false_discovery_control(rows["p_value"]))
+
+
+def test_anova_matches_scipy(normalized_df):
+    table = anova(normalized_df)
+
+    for row in table.itertuples():
+        samples = [_values(normalized_df, group, row.Gene) for group in ["A", "B", "C"]]
+        expected = stats.f_oneway(*samples)
+        assert row.F == pytest.approx(expected.statistic)
+        assert row.p_value == pytest.approx(expected.pvalue)
+        assert (row.df_Between, row.df_Within) == (2, sum(map(len, samples)) - 3)
+    np.testing.assert_allclose(table["q_value"], stats.false_discovery_control(table["p_value"]))
+
+
+def test_anova_on_a_subset_of_groups_matches_scipy(normalized_df):
+    table = anova(normalized_df, ["A", "C"])
+    for row in table.itertuples():
+        expected = stats.f_oneway(_values(normalized_df, "A", row.Gene), _values(normalized_df, "C", row.Gene))
+        assert row.p_value == pytest.approx(expected.pvalue)
+
+
+def test_benjamini_hochberg_matches_scipy():
+    p = np.random.default_rng(1).uniform(0, 0.2, size=(3, 40))
+    np.testing.assert_allclose(benjamini_hochberg(p), stats.false_discovery_control(p, axis=-1))
+    np.testing.assert_allclose(benjamini_hochberg(p[0]), stats.false_discovery_control(p[0]))
+
+
+def test_benjamini_hochberg_ignores_nan():
+    p = np.array([0.01, np.nan, 0.04, 0.03, np.nan])
+    q = benjamini_hochberg(p)
+    assert np.isnan(q[[1, 4]]).all()
+    np.testing.assert_allclose(q[[0, 2, 3]], stats.false_discovery_control(p[[0, 2, 3]]))
+
+
+def test_too_few_values_give_nan_statistics(normalized_df):
+    df = normalized_df[~((normalized_df["Group"] == "B") & (normalized_df["Sample"] != "B0"))]
+    table = welch_tests(df, [("B", "A")])
+    assert table["p_value"].isna().all()
+    assert table["n_Treatment"].eq(1).all()
+
+
+def test_bootstrap_leaves_genes_without_values_nan_without_warnings(normalized_df):
+    # Gene4 has no values in B; Gene5 only B0's, so many resamples draw none
+    in_b = normalized_df["Group"] == "B"
+    df = normalized_df[~(in_b & ((normalized_df["Gene"] == "Gene4")
+                                 | ((normalized_df["Gene"] == "Gene5") & (normalized_df["Sample"] != "B0"))))]
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        table = bootstrap_fold_change(df, [("B", "A")], n_resamples=500).set_index("Gene")
+
+    assert table.loc["Gene4", ["Delta_Delta_Ct_CI_Low", "Delta_Delta_Ct_CI_High"]].isna().all()
+    assert table.loc["Gene5", ["Delta_Delta_Ct_CI_Low", "Delta_Delta_Ct_CI_High"]].notna().all()
@@ -0,0 +1,37 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+from qpcr.plates import merge_plate
+from qpcr.streaming import stream_plate
+from qpcr.testing import make_groups, make_plate
+
+
+def _csv(df):
+    return io.StringIO(df.to_csv(index=False))
+
+
+def test_stream_plate_matches_merge_plate_for_any_column_order():
+    plate = make_plate(96, seed=1)
+    groups_df = make_groups({"plate1": plate})
+    cq_df = plate["Cq"].assign(SQ=np.where(np.arange(len(plate["Cq"])) % 8 == 0, 10.0 ** (np.arange(96) % 5), np.nan))
+    # Quantity before Cq, Well not first
+    cq_df = cq_df[["Fluor", "SQ", "Cq", "Content", "Well"]]
+    expected, expected_summary = merge_plate(cq_df, plate["genes"], plate["samples"], groups_df, "plate1")
+
+    merged, summary = stream_plate(_csv(cq_df), plate["genes"], plate["samples"], groups_df, "plate1", chunk_rows=10)
+
+    pd.testing.assert_frame_equal(merged, expected)
+    assert summary == expected_summary
+    assert merged["SQ"].notna().sum() == 12
+
+
+def test_stream_plate_without_quantities():
+    plate = make_plate(96, seed=2)
+    groups_df = make_groups({"plate1": plate})
+    expected, _ = merge_plate(plate["Cq"], plate["genes"], plate["samples"], groups_df, "plate1")
+
+    merged, _ = stream_plate(_csv(plate["Cq"]), plate["genes"], plate["samples"], groups_df, "plate1", chunk_rows=7)
+
+    pd.testing.assert_frame_equal(merged, expected)
@@ -1,9 +1,50 @@
 import streamlit as st
 import pandas as pd
-import os
 
-# ✅ Ensure required directories exist
-os.makedirs("./results", exist_ok=True)
+from qpcr.cache import cached_stage, content_hash
+from qpcr.contrasts import contrast_table
+from qpcr.dataset import concat_frames
+from qpcr.incremental import IncrementalPipeline
+from qpcr.io import read_csv_bytes
+from qpcr.storage import to_csv_bytes, write_table
+from qpcr.streaming import remove_plate, stream_plate, write_plate
+from session_workspace import results_path
+
+def _merge_incrementally(plate_data, groups_df, plate_hashes, store_path=None):
+    """Merge only new/changed plates into the session's incremental pipeline.
+
+    With a ``store_path``, Cq exports are uploaded files read in chunks and each
+    merged plate is also written to that Parquet store.
+    Returns the pipeline and the names of plates that were (re)merged or removed.
+    """
+    pipeline = st.session_state.get("incremental_pipeline")
+    if pipeline is None or content_hash(pipeline.groups_df) != content_hash(groups_df):
+        pipeline = IncrementalPipeline(groups_df, user_decisions=st.session_state.get("user_decisions") or {})
+        plate_hashes.clear()
+
+    changed = []
+    for plate in [plate for plate in pipeline.plates if plate not in plate_data]:
+        pipeline.remove_plate(plate)
+        plate_hashes.pop(plate, None)
+        if store_path is not None:
+            remove_plate(store_path, plate)
+        changed.append(plate)
+
+    for plate, files in plate_data.items():
+        digest = content_hash(files if store_path is None else {**files, "Cq": files["Cq"].getvalue()})
+        if plate_hashes.get(plate) != digest:
+            if store_path is None:
+                pipeline.set_plate(plate, files["Cq"], files["genes"], files["samples"])
+            else:
+                merged_df, summary = stream_plate(files["Cq"], files["genes"], files["samples"], groups_df, plate)
+                write_plate(store_path, plate, merged_df)
+                pipeline.set_merged_plate(plate, merged_df, summary)
+            plate_hashes[plate] = digest
+            changed.append(plate)
+
+    st.session_state["incremental_pipeline"] = pipeline
+    return pipeline, changed
+
 
 def app():
     """Upload and Merge qPCR Data"""
@@ -12,13 +53,18 @@ def app():
     # Reset downstream data when merging new data
     if st.button("🔄 Reset Data"):
         for key in ["merged_data", "summary", "filtered_merged_data", "user_decisions", 
-                    "mean_cq_df", "normalized_qPCR_df", "fold_change_qPCR_df"]:
+                    "mean_cq_df", "normalized_qPCR_df", "fold_change_qPCR_df", "contrast_qPCR_df", "pfaffl_qPCR_df",
+                    "statistics_qPCR_df", "anova_qPCR_df",
+                    "incremental_pipeline", "study"]:
             st.session_state[key] = None
         st.success("✅ All previous data cleared. You can start fresh.")
 
     # Step 1: Enter number of plates
     num_plates = st.number_input("🔢 Enter the number of plates:", min_value=1, max_value=20, step=1, value=1)
 
+    # Streaming mode: Cq exports are parsed in chunks (needed columns only) and merged plates go to disk
+    stream_mode = st.checkbox("💾 Streaming mode for very large Cq exports (low memory)", key="stream_mode")
+
     # Store uploaded files
     plate_data = {}
 
@@ -31,10 +77,11 @@ def app():
 
         if cq_file and genes_file and samples_file:
             plate_name = f"plate{i}"
+            # ✅ Parsed once per file content, not on every rerun
             plate_data[plate_name] = {
-                "Cq": pd.read_csv(cq_file),
-                "genes": pd.read_csv(genes_file, index_col=0),
-                "samples": pd.read_csv(samples_file, index_col=0)
+                "Cq": cq_file if stream_mode else cached_stage("read_csv", read_csv_bytes, cq_file.getvalue()),
+                "genes": cached_stage("read_csv", read_csv_bytes, genes_file.getvalue(), index_col=0),
+                "samples": cached_stage("read_csv", read_csv_bytes, samples_file.getvalue(), index_col=0)
             }
             st.success(f"✅ All files for Plate {i} uploaded successfully!")
 
@@ -45,61 +92,42 @@ def app():
     # 🔘 "Merge Data" Button
     if st.button("🚀 Merge Data"):
         if plate_data and groups_file:
-            groups_df = pd.read_csv(groups_file)
+            groups_df = cached_stage("read_csv", read_csv_bytes, groups_file.getvalue())
             st.success("✅ Groups file uploaded successfully!")
 
-            all_data = []
-            plate_summaries = {}
-
-            for plate, files in plate_data.items():
-                cq_df = files["Cq"]
-                genes_df = files["genes"]
-                samples_df = files["samples"]
-
-                # ✅ Standardize Well ID format (A01 → A1)
-                cq_df["Row"] = cq_df["Well"].str.extract(r"([A-P])")  
-                cq_df["Column"] = cq_df["Well"].str.extract(r"(\d{2})").astype(int)  
-                cq_df["Well"] = cq_df["Row"] + cq_df["Column"].astype(str)  
-
-                # ✅ Reshape genes and samples into long format
-                genes_melted = genes_df.melt(ignore_index=False).reset_index()
-                genes_melted.columns = ["Row", "Column", "Gene"]
-                genes_melted["Well"] = genes_melted["Row"] + genes_melted["Column"].astype(str)
-
-                samples_melted = samples_df.melt(ignore_index=False).reset_index()
-                samples_melted.columns = ["Row", "Column", "Sample"]
-                samples_melted["Well"] = samples_melted["Row"] + samples_melted["Column"].astype(str)
-
-                # ✅ Merge gene and sample information
-                merged_df = genes_melted.merge(samples_melted, on="Well", how="left")
-                merged_df = merged_df.merge(cq_df[["Well", "Cq"]], on="Well", how="left")
-
-                # ✅ Merge with **group information**
-                merged_df = merged_df.merge(groups_df, on="Sample", how="left")
-
-                # ✅ Add plate identifier
-                merged_df["Plate"] = plate
-
-                # ✅ Remove empty wells
-                empty_wells = merged_df["Sample"].isna().sum() + merged_df["Gene"].isna().sum()
-                filtered_df = merged_df.dropna(subset=["Sample", "Gene"]).reset_index(drop=True)
-
-                # ✅ Save per-plate summary
-                plate_summaries[plate] = {
-                    "Total Wells": len(merged_df),
-                    "Empty Wells": empty_wells,
-                    "Unique Samples": filtered_df["Sample"].nunique(),
-                    "Unique Genes": filtered_df["Gene"].nunique()
-                }
-
-                # ✅ Append to all_data list
-                all_data.append(filtered_df)
-
-            # ✅ Combine all plates into a single DataFrame
-            final_data = pd.concat(all_data, ignore_index=True)
-
-            # ✅ Save merged data & store in session state
-            final_data.to_csv("./results/Merged_qPCR_Data.csv", index=False)
+            # ✅ Merge only plates that are new or changed since the last merge
+            plate_hashes = st.session_state.setdefault("plate_hashes", {})
+            store_path = results_path("Merged_qPCR_Data") if stream_mode else None
+            if st.session_state.get("merged_store") != store_path:
+                # Switching modes re-merges every plate
+                st.session_state["incremental_pipeline"] = None
+            pipeline, changed_plates = _merge_incrementally(plate_data, groups_df, plate_hashes, store_path)
+            st.session_state["merged_store"] = store_path
+            final_data = concat_frames([pipeline.raw_plates[plate] for plate in plate_data])
+            plate_summaries = {plate: pipeline.summary[plate] for plate in plate_data}
+            st.write(f"♻️ Re-merged **{len(changed_plates)}** of **{len(plate_data)}** plates.")
+
+            # ✅ Refresh downstream results for the affected Sample-Gene pairs instead of starting over
+            if st.session_state.get("mean_cq_df") is not None:
+                pipeline.set_user_decisions(st.session_state.get("user_decisions") or {})
+                pipeline.configure(st.session_state.get("found_genes"), st.session_state.get("control_group"))
+                st.session_state["filtered_merged_data"] = pipeline.filtered_merged_data
+                st.session_state["mean_cq_df"] = pipeline.mean_cq_df
+                if pipeline.housekeeping_genes and st.session_state.get("normalized_qPCR_df") is not None:
+                    st.session_state["normalized_qPCR_df"] = pipeline.normalized_df
+                if pipeline.control_group is not None and st.session_state.get("fold_change_qPCR_df") is not None:
+                    st.session_state["fold_change_qPCR_df"] = pipeline.fold_change_df(
+                        st.session_state.get("selected_groups")
+                    )
+                if pipeline.housekeeping_genes and st.session_state.get("contrast_qPCR_df") is not None:
+                    st.session_state["contrast_qPCR_df"] = contrast_table(
+                        pipeline.normalized_df, st.session_state.get("contrasts")
+                    )
+                st.success("✅ Mean Cq, ΔCt and ΔΔCt updated for the affected samples and genes.")
+
+            # ✅ Save merged data (Parquet; CSV is download-only) & store in session state
+            if not stream_mode:
+                write_table(final_data, results_path("Merged_qPCR_Data.parquet"))
             st.session_state["merged_data"] = final_data
             st.session_state["summary"] = plate_summaries
 
@@ -142,7 +170,7 @@ def app():
         st.subheader("📥 Download Full Data")
         st.download_button(
             label="Download Full Merged Data as CSV",
-            data=final_data.to_csv(index=False),
+            data=cached_stage("export_csv", to_csv_bytes, final_data),
             file_name="Merged_qPCR_Data.csv",
             mime="text/csv"
         )